@@ -5,52 +5,273 @@ This module builds the recruiting workflow as a cyclic graph.
 It dynamically extracts job roles from the recruiter's input.
 """
 
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
+from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk, SystemMessage, BaseMessage, ToolMessage
 from langgraph.graph import StateGraph, START, END
-from typing import TypedDict, Annotated, List, Dict, Any
-import operator
+from langgraph.types import Command, Send, interrupt
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel, Field
+from typing import TypedDict, Annotated, List, Dict, Any, Optional
 from langgraph.prebuilt import ToolNode
-from langgraph.checkpoint.memory import MemorySaver
+from agent.checkpointer import build_checkpointer
+from agent.question_bank import QuestionBank
+from agent.artifacts import outline
+from llm_cache import cache_bypassed
 from agent.tools import write_outreach_email, generate_checklist, google_web_search, generate_offer_letter, edit_content
 from dotenv import load_dotenv
+import asyncio
+import functools
+import logging
 import os
+from lazy import singleton
 from llm_config import llm
 
 # # Configure Gemini with your API key
 load_dotenv()
 GEMINI_KEY = os.getenv("GEMINI_KEY")
 
-memory = MemorySaver()
+logger = logging.getLogger(__name__)
+
+
+# The checkpointer, stores and compiled graphs below are process-wide and built
+# on first use, so importing this module stays cheap. They are also reachable
+# as module attributes (agent.agent.graph, .memory, ...) via __getattr__.
+
+@singleton
+def get_memory():
+    """Persistent checkpointer (SQLite by default); see agent/checkpointer.py."""
+    return build_checkpointer()
+
+
+@singleton
+def get_question_bank():
+    """Clarifying questions of previously seen roles are served without an LLM call."""
+    return QuestionBank(
+        path=os.getenv("QUESTION_BANK_PATH", "question_bank.sqlite"),
+        min_score=float(os.getenv("QUESTION_BANK_MIN_SCORE", "0.8")),
+    )
+
+
+@singleton
+def get_jd_index():
+    """
+    Past job descriptions, searched by role + clarifications. A near-identical
+    request reuses the stored JD; close matches are shown to the LLM as examples.
+    """
+    from agent.jd_index import JDIndex
+
+    return JDIndex(path=os.getenv("JD_INDEX_PATH", "jd_index") or None)
+
+
+# Opt-in: a request with the same role and answers as an earlier one gets its JD back verbatim.
+JD_REUSE = os.getenv("JD_REUSE", "0") == "1"
+JD_EXAMPLE_SCORE = float(os.getenv("JD_EXAMPLE_SCORE", "0.6"))
+JD_EXAMPLES = 2
+JD_ERROR = "Something went wrong generating the job description."
+
+# Upper bound on per-role LLM calls that run at the same time.
+MAX_ROLE_CONCURRENCY = int(os.getenv("MAX_ROLE_CONCURRENCY", "4"))
+
+
+# Checkpointed history is capped at roughly this many tokens (~4 characters each).
+MAX_HISTORY_TOKENS = int(os.getenv("MAX_HISTORY_TOKENS", "8000"))
+HISTORY_SUMMARY = "history_summary"
+FINAL_PLAN = "final_plan"
+
+# A request that already states these details skips the clarification round.
+EXPRESS_MODE = os.getenv("EXPRESS_MODE", "0") == "1"
+EXPRESS_FIELDS = ("skills", "level", "location", "budget")
+# Values the extractor uses for details the recruiter never gave.
+PLACEHOLDERS = {"", "-", "n/a", "na", "none", "null", "unknown", "not specified", "not mentioned", "not provided", "not stated", "unspecified", "tbd", "tbc"}
+
+
+def message_tokens(msg: BaseMessage) -> int:
+    return len(str(msg.content)) // 4 + 1
+
+
+def compact_messages(left: List[BaseMessage], right: List[BaseMessage]) -> List[BaseMessage]:
+    """
+    Reducer for "messages": append new messages, then keep the newest ones
+    that fit in MAX_HISTORY_TOKENS. Older turns are folded into a single
+    summary message holding a one-line excerpt of each dropped turn.
+    """
+    messages = left + right
+    if sum(message_tokens(m) for m in messages) <= MAX_HISTORY_TOKENS:
+        return messages
+
+    # The messages of the current step are always kept; older ones fill the rest.
+    summary_budget = MAX_HISTORY_TOKENS // 10
+    kept, used = [], summary_budget + sum(message_tokens(m) for m in right)
+    for msg in reversed(left):
+        used += message_tokens(msg)
+        if used > MAX_HISTORY_TOKENS:
+            break
+        kept.append(msg)
+    kept.reverse()
+    dropped = left[:len(left) - len(kept)]
+
+    lines = []
+    for msg in dropped:
+        if msg.name == HISTORY_SUMMARY:
+            lines.extend(msg.content.split("\n")[1:])
+        else:
+            lines.append(f"{msg.type}: {' '.join(str(msg.content).split())[:120]}")
+    # Newest excerpts win when the summary itself would exceed its budget.
+    excerpt, size = [], 0
+    for line in reversed(lines):
+        size += len(line) // 4 + 1
+        if size > summary_budget:
+            break
+        excerpt.append(line)
+    summary = SystemMessage(
+        content="Earlier conversation (compacted):\n" + "\n".join(reversed(excerpt)),
+        name=HISTORY_SUMMARY,
+    )
+    return [summary] + kept + list(right)
+
+
+def merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer for the per-role results written by parallel branches."""
+    return {**left, **right}
+
 
 # "recruiter_info" stores details like roles, budget, and timeline.
+# "roles" lists the job roles extracted from the request; per-role questions
+# and job descriptions are collected in "role_questions" / "job_descriptions".
+# "artifacts" maps handles (jd, email, ...) to the full text tools resolve.
 class RecruiterState(TypedDict):
-    messages: Annotated[List[BaseMessage], operator.add]
+    messages: Annotated[List[BaseMessage], compact_messages]
     recruiter_info: Dict[str, Any]
     clarification_questions: List[str]
+    roles: List[str]
+    role_questions: Annotated[Dict[str, List[str]], merge_dicts]
+    job_descriptions: Annotated[Dict[str, str], merge_dicts]
+    artifacts: Dict[str, str]
 
     wants_tool_chat: bool
     done_with_tools: bool
 
+# -------------------------------
+# Structured outputs
+# -------------------------------
+
+class HiringRequest(BaseModel):
+    """Job roles and hiring details stated in a recruiter's request."""
+    roles: List[str] = Field(description="Job titles to hire for, one entry per role")
+    skills: Optional[str] = Field(None, description="Required skills, if the request states them")
+    level: Optional[str] = Field(None, description="Role level (junior, mid-level, senior, ...), if stated")
+    location: Optional[str] = Field(None, description="Job location (remote, hybrid or on-site with address), if stated")
+    budget: Optional[str] = Field(None, description="Budget or compensation range, if stated")
+
+    def is_complete(self) -> bool:
+        """True when the request answers the compulsory clarification topics."""
+        return all((getattr(self, field) or "").strip().strip(".").lower() not in PLACEHOLDERS for field in EXPRESS_FIELDS)
+
+
+class ClarifyingQuestions(BaseModel):
+    """Follow-up questions for one role."""
+    questions: List[str] = Field(description="One question per entry, compulsory topics first, at most 10")
+
+
+@functools.lru_cache(maxsize=None)
+def structured(schema):
+    """
+    `llm` constrained to answer with `schema` (a forced tool call). The raw
+    message is returned too, so a model that answers in text anyway can
+    still be parsed line by line.
+    """
+    return llm.with_structured_output(schema, include_raw=True)
+
 # -------------------------------
 # Node Functions
 # -------------------------------
 
+def role_extraction_prompt(request: str) -> str:
+    return (
+        f"Extract the job roles mentioned in this hiring request: '{request}'.\n"
+        f"Also fill in the skills, level, location and budget the request states; leave out any it does not mention."
+    )
+
+
+def parse_roles(response_text: str, request: str) -> List[str]:
+    roles = [line.strip("-•* ").strip() for line in response_text.strip().split("\n") if line.strip("-•* ").strip()]
+    return list(dict.fromkeys(roles)) or [request]
+
+
+def hiring_request(result: Dict[str, Any], request: str) -> HiringRequest:
+    """The parsed extraction, or the roles parsed from the raw text when the model did not call the schema."""
+    extracted = result["parsed"] or HiringRequest(roles=parse_roles(str(result["raw"].content), request))
+    roles = [role.strip() for role in extracted.roles if role.strip()]
+    return extracted.model_copy(update={"roles": list(dict.fromkeys(roles)) or [request]})
+
+
+def express_info(roles: List[str], request: str) -> Dict[str, Any]:
+    """recruiter_info of a request detailed enough to write the JDs from directly."""
+    return {
+        "clarifications": request,
+        "role": roles[0] if len(roles) == 1 else request,
+        "role_clarifications": {role: request for role in roles},
+        "express": True,
+    }
+
+
+def extraction_update(extracted: HiringRequest, request: str):
+    if EXPRESS_MODE and extracted.is_complete():
+        return {"roles": extracted.roles, "recruiter_info": express_info(extracted.roles, request)}
+    return {"roles": extracted.roles}
+
+
 def initial_node(state: RecruiterState):
     """
-    Extract job roles from the recruiter's query dynamically using the LLM,
-    then ask clarifying questions. If clarifications are already present, skip this step.
+    Extract the job roles, and any details already given, from the
+    recruiter's query with a schema-constrained LLM call. When the request
+    states skills, level, location and budget (express mode), the graph
+    goes straight to JD generation with the request as the clarifications.
+    A request that only names roles already in the question bank needs no
+    LLM call.
     """
-    # Skip role/question extraction if we're already resuming from clarification
-    if state["recruiter_info"].get("clarifications"):
-        return {"messages": []}
+    request = state["messages"][-1].content
+    known = get_question_bank().roles_in(request)
+    if known:
+        return {"roles": known}
+    result = structured(HiringRequest).invoke([HumanMessage(content=role_extraction_prompt(request))])
+    return extraction_update(hiring_request(result, request), request)
 
-    # Otherwise, extract roles and generate questions
-    prompt = (
+
+async def ainitial_node(state: RecruiterState):
+    """Async counterpart of initial_node; the question bank's SQLite calls run in a thread."""
+    request = state["messages"][-1].content
+    known = await asyncio.to_thread(lambda: get_question_bank().roles_in(request))
+    if known:
+        return {"roles": known}
+    result = await structured(HiringRequest).ainvoke([HumanMessage(content=role_extraction_prompt(request))])
+    return extraction_update(hiring_request(result, request), request)
+
+
+def is_express(state: Dict[str, Any]) -> bool:
+    """True when the run wrote the JDs straight from the request, without clarification questions."""
+    return bool(state.get("recruiter_info", {}).get("express"))
+
+
+def fan_out_questions(state: RecruiterState):
+    """Send every extracted role to its own question-generation branch."""
+    request = state["messages"][-1].content
+    return [Send("role_questions", {"role": role, "request": request}) for role in state.get("roles", [])]
+
+
+def route_after_initial(state: RecruiterState):
+    """Express requests skip the questions; the others get one question branch per role."""
+    if "clarifications" in state["recruiter_info"]:
+        return "clarification"
+    return fan_out_questions(state)
+
+
+def role_questions_prompt(role: str, request: str) -> str:
+    return (
         f"You are a Hiring Assistant tasked with generating comprehensive job descriptions.\n"
-        f"Extract job roles mentioned in this hiring request: '{state['messages'][-1].content}'. "
-        f"Then, for each role, generate important follow-up questions to help create a job description."
+        f"The recruiter's hiring request was: '{request}'. "
+        f"Generate important follow-up questions to help create a job description for the role of {role}."
         f"To ensure accuracy, please begin by asking questions about these compulsory topics and make sure to adapt them to be dynamic to the role:\n"
-        f"Only give a bullet list of questions and nothing else"
+        f"Give only the questions themselves, one per entry, with no preamble.\n"
         f"- Essential skills required for this role.\n"
         f"- Qualifications candidates need to have.\n"
         f"- Years of experience are required.\n"
@@ -63,33 +284,97 @@ def initial_node(state: RecruiterState):
         f"LIMIT the questions to maximum 10"
         f"- Any other details that would help tailor the job description more precisely\n"
         f"Make sure all compulsory questions are listed before moving on to the optional ones, and adjust follow-up questions based on the context of the role.\n"
-        f"Output ONLY the questions in a bullet list format."
+        f"Output ONLY the questions."
     )
-    response_text = llm.invoke([HumanMessage(content=prompt)]).content
-    questions = [line.strip("-• ").strip() for line in response_text.strip().split("\n") if line.strip()]
-    state["clarification_questions"] = questions
+
+
+def parse_questions(response_text: str) -> List[str]:
+    lines = [line.strip("-•* ").strip() for line in response_text.strip().split("\n") if line.strip("-•* ").strip()]
+    # Preamble lines ("Here are the questions:") are not questions.
+    questions = [line for line in lines if line.endswith("?")]
+    return questions or lines
+
+
+def question_list(result: Dict[str, Any]) -> List[str]:
+    """The parsed questions, or the questions parsed from the raw text when the model did not call the schema."""
+    if result["parsed"] is None:
+        return parse_questions(str(result["raw"].content))
+    return [q.strip("-•* ").strip() for q in result["parsed"].questions if q.strip("-•* ").strip()]
+
+
+def role_questions_node(state: Dict[str, str]):
+    """
+    Generate the clarifying questions for a single role, or reuse the
+    question bank's list for the same or a similar title.
+    """
+    role = state["role"]
+    questions = get_question_bank().lookup(role)
+    if questions is None:
+        result = structured(ClarifyingQuestions).invoke([HumanMessage(content=role_questions_prompt(role, state["request"]))])
+        questions = question_list(result)
+        get_question_bank().add(role, questions)
+    return {"role_questions": {role: questions}}
+
+
+async def arole_questions_node(state: Dict[str, str]):
+    """Async counterpart of role_questions_node."""
+    role = state["role"]
+    questions = await asyncio.to_thread(lambda: get_question_bank().lookup(role))
+    if questions is None:
+        result = await structured(ClarifyingQuestions).ainvoke([HumanMessage(content=role_questions_prompt(role, state["request"]))])
+        questions = question_list(result)
+        await asyncio.to_thread(lambda: get_question_bank().add(role, questions))
+    return {"role_questions": {role: questions}}
+
+
+def collect_questions_node(state: RecruiterState):
+    """
+    Merge the per-role questions into one clarification request.
+    """
+    roles = state.get("roles", [])
+    role_questions = {role: state["role_questions"].get(role, []) for role in roles}
+    questions = [q for role in roles for q in role_questions[role]]
+    if len(roles) == 1:
+        body = "\n".join(f"- {q}" for q in questions)
+    else:
+        body = "\n\n".join(
+            f"**{role}**\n" + "\n".join(f"- {q}" for q in role_questions[role]) for role in roles
+        )
     return {
-        "messages": [AIMessage(content="To create the best job descriptions, please answer:\n\n" + "\n".join(f"- {q}" for q in questions))],
+        "messages": [AIMessage(content="To create the best job descriptions, please answer:\n\n" + body)],
         "clarification_questions": questions,
     }
   
 
 def clarification_node(state: RecruiterState):
     """
-    Process the clarifying response and update recruiter_info.
+    Wait for the recruiter's answers to the clarifying questions: the run
+    pauses here and run_from_clarification resumes it from the checkpoint.
+    Answers already in recruiter_info (express mode, or a run started from
+    the answers) are used at once.
     """
-    user_response = state["messages"][-1].content.strip()
-    state["recruiter_info"]["clarifications"] = user_response
+    info = state["recruiter_info"]
+    messages = []
+    if "clarifications" not in info:
+        info = interrupt({"roles": state.get("roles", []), "questions": state.get("clarification_questions", [])})
+        messages.append(HumanMessage(content=info["clarifications"]))
     ack = SystemMessage(content="Thanks for the details. Generating job description draft now...")
-    return {"messages": [ack]}
+    return {"messages": messages + [ack], "recruiter_info": info}
 
-def jd_generation_node(state: RecruiterState):
-    """
-    Generate a job description draft based on recruiter_info.
-    """
-    info = state["recruiter_info"]
-    clarifications = info.get("clarifications", "")
-    role = info.get("role", "")
+def role_clarifications(info: Dict[str, Any]) -> Dict[str, str]:
+    """Clarification answers keyed by role; a single-role request has one entry."""
+    return info.get("role_clarifications") or {info.get("role", ""): info.get("clarifications", "")}
+
+
+def fan_out_jds(state: RecruiterState):
+    """Send every role to its own JD-generation branch."""
+    return [
+        Send("jd", {"recruiter_info": {"role": role, "clarifications": clarifications}})
+        for role, clarifications in role_clarifications(state["recruiter_info"]).items()
+    ]
+
+
+def jd_prompt(role: str, clarifications: str, examples: List[Dict[str, str]] = ()) -> str:
     prompt = (
         f"Generate a detailed job description for the role of {role} "
         f"based on the following clarifications:\n\n"
@@ -98,27 +383,90 @@ def jd_generation_node(state: RecruiterState):
         f"You can fill in other information based on the {clarifications}, {role} and general assumptions. Do not ask in the description to fill details."
         f"Avoid creating sections of which the user did not provide details."
     )
+    if examples:
+        outlines = "\n\n".join(f"{doc['role']}:\n{outline(doc['jd'], max_lines=8)}" for doc in examples)
+        prompt += f"\n\nOutlines of job descriptions written earlier for similar roles, for a consistent structure:\n{outlines}"
+    return prompt
+
+
+def similar_jds(role: str, clarifications: str):
+    """
+    (stored JD to reuse or None, close matches to use as examples). Only an
+    exact match of role and answers is reused; similar ones are examples.
+    """
+    index = get_jd_index()
+    if JD_REUSE and not cache_bypassed():
+        doc = index.exact(role, clarifications)
+        if doc is not None:
+            return doc["jd"], []
+    hits = index.search(role, clarifications, k=JD_EXAMPLES)
+    return None, [doc for score, doc in hits if score >= JD_EXAMPLE_SCORE]
+
+
+def jd_generation_node(state: RecruiterState):
+    """
+    Generate a job description draft for one role based on recruiter_info.
+    """
+    info = state["recruiter_info"]
+    clarifications = info.get("clarifications", "")
+    role = info.get("role", "")
+    reused, examples = similar_jds(role, clarifications)
+    if reused is not None:
+        return {"job_descriptions": {role: reused}}
+    prompt = jd_prompt(role, clarifications, examples)
 
     # LOG: Print what you're sending to Gemini
     # print("Prompt sent to LLM:\n", prompt)
     try:
         jd_text = llm.invoke([HumanMessage(content=prompt)]).content
         #print("LLM responded with:\n", jd_response.content)  # LOG: Show the JD
-        jd_msg = AIMessage(content=jd_text)
-        return {"messages": [jd_msg]}
-    except Exception as e:
-        #print(" LLM error during JD generation:", str(e))
-        return {"messages": [AIMessage(content="Something went wrong generating the job description.")]}
+        get_jd_index().add(role, clarifications, jd_text)
+        return {"job_descriptions": {role: jd_text}}
+    except Exception:
+        logger.exception("JD generation failed for %r", role)
+        return {"job_descriptions": {role: JD_ERROR}}
+
+
+async def ajd_generation_node(state: RecruiterState):
+    """Async counterpart of jd_generation_node; the JD index's file I/O runs in a thread."""
+    info = state["recruiter_info"]
+    clarifications = info.get("clarifications", "")
+    role = info.get("role", "")
+    reused, examples = await asyncio.to_thread(similar_jds, role, clarifications)
+    if reused is not None:
+        return {"job_descriptions": {role: reused}}
+    try:
+        response = await llm.ainvoke([HumanMessage(content=jd_prompt(role, clarifications, examples))])
+        await asyncio.to_thread(lambda: get_jd_index().add(role, clarifications, response.content))
+        return {"job_descriptions": {role: response.content}}
+    except Exception:
+        logger.exception("JD generation failed for %r", role)
+        return {"job_descriptions": {role: JD_ERROR}}
+
+
+def joined_jds(state: Dict[str, Any]) -> str:
+    """The job descriptions of this round's roles, in order, as one document."""
+    roles = role_clarifications(state.get("recruiter_info", {}))
+    jds = state.get("job_descriptions", {})
+    return "\n\n---\n\n".join(jds[role] for role in roles if role in jds)
+
+
+def jd_join_node(state: RecruiterState):
+    """
+    Combine the per-role job descriptions into a single message.
+    """
+    return {"messages": [AIMessage(content=joined_jds(state))]}
 
 def final_node(state: RecruiterState):
     """
     Compile all outputs into a final recruiting plan summary.
     """
-    summary = "Final Recruiting Plan:\n\n"
-    for msg in state["messages"]:
-        if isinstance(msg, AIMessage):
-            summary += msg.content + "\n\n"
-    return {"messages": [AIMessage(content=summary)]}
+    # Earlier plans are skipped so each plan does not embed all previous ones.
+    parts = [
+        f"{msg.content}\n\n" for msg in state["messages"]
+        if isinstance(msg, AIMessage) and msg.name != FINAL_PLAN
+    ]
+    return {"messages": [AIMessage(content="Final Recruiting Plan:\n\n" + "".join(parts), name=FINAL_PLAN)]}
 
 # agent.py  ──────────────────────────────────────────────
 def route_after_jd(state: RecruiterState) -> str:
@@ -136,98 +484,214 @@ def route_after_tool(state: RecruiterState) -> str:
     return "final" if state.get("done_with_tools", False) else "tool_node"
 
 
-tool_node = ToolNode(tools=[write_outreach_email, generate_checklist, google_web_search, generate_offer_letter, edit_content])
+@singleton
+def get_tool_node():
+    return ToolNode(tools=[write_outreach_email, generate_checklist, google_web_search, generate_offer_letter, edit_content])
+
+
+def route_start(state: RecruiterState) -> str:
+    """A run started from the clarification answers skips role extraction."""
+    return "clarification" if "clarifications" in state.get("recruiter_info", {}) else "initial"
 
 
 # -------------------------------
-# Build the Main Graph (Starts at 'initial')
+# Build the Main Graph
 # -------------------------------
-builder1 = StateGraph(RecruiterState)
-builder1.add_node("initial", initial_node)
+# One run per hiring round: roles and questions, then a pause (interrupt) at
+# "clarification" until run_from_clarification resumes the same checkpoint
+# with the answers; the JDs, tool loop and plan follow. Express requests
+# pass "clarification" without pausing.
+@singleton
+def get_graph():
+    builder1 = StateGraph(RecruiterState)
+    builder1.add_node("initial", RunnableLambda(initial_node, afunc=ainitial_node))
+    builder1.add_node("role_questions", RunnableLambda(role_questions_node, afunc=arole_questions_node))
+    builder1.add_node("collect_questions", collect_questions_node)
+    builder1.add_node("clarification", clarification_node)
+    builder1.add_node("jd", RunnableLambda(jd_generation_node, afunc=ajd_generation_node))
+    builder1.add_node("jd_join", jd_join_node)
+    builder1.add_node("tool_node", get_tool_node())
+    builder1.add_node("final", final_node)
 
-builder1.add_edge(START, "initial")
-builder1.set_finish_point("initial")  # 👈 This is key
-graph = builder1.compile(checkpointer=memory)
+    builder1.add_conditional_edges(START, route_start, ["initial", "clarification"])
+    builder1.add_conditional_edges("initial", route_after_initial, ["role_questions", "clarification"])
+    builder1.add_edge("role_questions", "collect_questions")
+    builder1.add_edge("collect_questions", "clarification")
+    builder1.add_conditional_edges("clarification", fan_out_jds, ["jd"])
+    builder1.add_edge("jd", "jd_join")
+    builder1.add_conditional_edges(
+        "jd_join",
+        route_after_jd,
+        path_map={"tool_node": "tool_node", "final": "final"},
+    )
+    builder1.add_conditional_edges(
+        "tool_node",
+        route_after_tool,
+        path_map={"tool_node": "tool_node", "final": "final"},
+    )
+    builder1.set_finish_point("final")
+    return builder1.compile(checkpointer=get_memory())
 
 
 # -------------------------------
-# Build the Clarification Graph (Starts at 'clarification')
+# Tool Graph (single ToolNode, used to stream follow-up tool calls)
 # -------------------------------
-builder2 = StateGraph(RecruiterState)
-# builder2.add_node("initial", initial_node)
-builder2.add_node("clarification", clarification_node)
-builder2.add_node("jd", jd_generation_node)
-builder2.add_node("tool_node", tool_node)
-builder2.add_node("final", final_node)
-
-builder2.add_edge(START, "clarification")  # Start here instead
-builder2.add_edge("clarification", "jd")
-builder2.add_conditional_edges(
-    "jd",
-    route_after_jd,
-    path_map={"tool_node": "tool_node", "final": "final"},
-)
-builder2.add_conditional_edges(
-    "tool_node",
-    route_after_tool,
-    path_map={"tool_node": "tool_node", "final": "final"},
-)
-builder2.set_finish_point("final")
-clarification_graph = builder2.compile(checkpointer=memory)
+@singleton
+def get_tool_graph():
+    builder3 = StateGraph(RecruiterState)
+    builder3.add_node("tool_node", get_tool_node())
+    builder3.add_edge(START, "tool_node")
+    builder3.set_finish_point("tool_node")
+    return builder3.compile()
 
 
-# Helper to start from beginning
-def run_role_to_questions(user_input: str, thread_id: str):
-    state = {
+_LAZY = {
+    "memory": get_memory,
+    "question_bank": get_question_bank,
+    "jd_index": get_jd_index,
+    "tool_node": get_tool_node,
+    "graph": get_graph,
+    "tool_graph": get_tool_graph,
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return _LAZY[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _config(thread_id: str):
+    return {"configurable": {"thread_id": thread_id}, "max_concurrency": MAX_ROLE_CONCURRENCY}
+
+
+def _questions_state(user_input: str):
+    return {
         "messages": [HumanMessage(content=user_input)],
         "recruiter_info": {},
         "clarification_questions": []
     }
-    config = {"configurable": {"thread_id": thread_id}}
-    return graph.invoke(state, config=config)
 
-def run_from_clarification(clarification_response: str, role: str, thread_id: str):
-    state = {
+
+# Helper to start from beginning
+def run_role_to_questions(user_input: str, thread_id: str):
+    """
+    Start a hiring round. The returned state is paused at the clarification
+    questions, or, for an express request (is_express), already holds the
+    job descriptions.
+    """
+    return get_graph().invoke(_questions_state(user_input), config=_config(thread_id))
+
+async def arun_role_to_questions(user_input: str, thread_id: str):
+    """Async counterpart of run_role_to_questions."""
+    return await get_graph().ainvoke(_questions_state(user_input), config=_config(thread_id))
+
+def _clarification_input(snapshot, clarification_response: str, role: str, role_clarifications: Dict[str, str] = None):
+    """
+    Resume the round paused at the clarification step of this thread, or,
+    when there is none (a new thread, or a JD being regenerated), start a
+    run from the answers.
+    """
+    info = {
+        "clarifications": clarification_response,
+        "role": role,
+        "role_clarifications": role_clarifications or {},
+    }
+    if "clarification" in snapshot.next:
+        return Command(resume=info)
+    return {
         "messages": [HumanMessage(content=clarification_response)],
-        "recruiter_info": {
-            "clarifications": clarification_response,
-            "role": role
-        },
+        "recruiter_info": info,
         "clarification_questions": []
     }
-    config = {"configurable": {"thread_id": thread_id}}
-    return clarification_graph.invoke(state, config=config)
+
+def run_from_clarification(clarification_response: str, role: str, thread_id: str, role_clarifications: Dict[str, str] = None):
+    """
+    Generate the job description(s). Pass `role_clarifications` ({role: answers})
+    to generate one JD per role concurrently.
+    """
+    config = _config(thread_id)
+    graph = get_graph()
+    state = _clarification_input(graph.get_state(config), clarification_response, role, role_clarifications)
+    return graph.invoke(state, config=config)
+
+async def arun_from_clarification(clarification_response: str, role: str, thread_id: str, role_clarifications: Dict[str, str] = None):
+    """Async counterpart of run_from_clarification."""
+    config = _config(thread_id)
+    graph = get_graph()
+    state = _clarification_input(await graph.aget_state(config), clarification_response, role, role_clarifications)
+    return await graph.ainvoke(state, config=config)
+
+
+def job_description_text(state: dict) -> str:
+    """
+    The JD shown to the recruiter, read from the per-role results rather than
+    the message history, which compaction may have trimmed.
+    """
+    return joined_jds(state)
+
+
+def stream_text(runnable, state, config=None, nodes=("jd", "jd_join"), result=None):
+    """
+    Yield LLM tokens produced inside `nodes` as they arrive.
+    Tokens of the first parallel branch are shown live; concurrent branches
+    are buffered and yielded once the stream ends. When nothing was streamed
+    (a cached response, or a tool that does not call the LangChain LLM) the
+    node's final message is yielded in one piece.
+    Once the stream is exhausted, `result` holds the final graph state, which
+    is exactly what `invoke` would have returned.
+    """
+    streamed = False
+    live = None
+    pending = {}
+    for mode, chunk in runnable.stream(state, config=config, stream_mode=["messages", "values"]):
+        if mode == "values":
+            if result is not None:
+                result.clear()
+                result.update(chunk)
+            continue
+        msg, metadata = chunk
+        if metadata.get("langgraph_node") not in nodes or not isinstance(msg.content, str):
+            continue
+        if isinstance(msg, AIMessageChunk):
+            if not msg.content:
+                continue
+            branch = metadata.get("langgraph_checkpoint_ns")
+            live = live or branch
+            if branch == live:
+                streamed = True
+                yield msg.content
+            else:
+                pending.setdefault(branch, []).append(msg.content)
+        elif not streamed and isinstance(msg, (AIMessage, ToolMessage)):
+            yield msg.content
+    for tokens in pending.values():
+        yield "\n\n---\n\n" + "".join(tokens)
+
+
+def stream_from_clarification(clarification_response: str, role: str, thread_id: str, result: dict, role_clarifications: Dict[str, str] = None):
+    """Streaming counterpart of run_from_clarification; yields JD tokens."""
+    config = _config(thread_id)
+    graph = get_graph()
+    state = _clarification_input(graph.get_state(config), clarification_response, role, role_clarifications)
+    yield from stream_text(graph, state, config=config, result=result)
+
+
+def stream_tool_call(input_state: dict, result: dict):
+    """Run the tool calls on the last AIMessage of `input_state`, yielding tool output tokens."""
+    yield from stream_text(get_tool_graph(), input_state, nodes=("tool_node",), result=result)
 
 
 
 if __name__ == "__main__":
-    from langchain_core.messages import HumanMessage
-    # Simulate instantaneous workflow:
-    # Recruiter enters a query dynamically.
-    initial_input = {
-        "messages": [HumanMessage(content="I need to hire a data scientist and a marketing manager.")],
-        "recruiter_info": {}
-    }
-    # Run the initial node to extract roles.
-    state_after_initial = graph.invoke(initial_input)
-    
-    # If clarifying questions were generated, simulate a clarifying response.
-    if any(isinstance(m, HumanMessage) and ("budget" in m.content.lower() or "timeline" in m.content.lower())
-           for m in state_after_initial["messages"]):
-        clar_response = HumanMessage(content="Budget: $100k-$120k, Timeline: 3 months")
-        state_after_clar = graph.invoke({
-            "messages": state_after_initial["messages"] + [clar_response],
-            "recruiter_info": state_after_initial.get("recruiter_info", {})
-        })
-    else:
-        state_after_clar = state_after_initial
-
-    # Continue execution until the final state.
-    final_state = graph.invoke({
-        "messages": state_after_clar["messages"],
-        "recruiter_info": state_after_clar.get("recruiter_info", {})
-    })
-    
-    # Print the final recruiting plan summary.
-    # for msg in final_state["messages"]:
-    #     print(msg.content)
+    import uuid
+
+    # One hiring round: questions first, then the JDs from the answers.
+    thread_id = str(uuid.uuid4())
+    state = run_role_to_questions("I need to hire a data scientist and a marketing manager.", thread_id)
+    if not is_express(state):
+        for question in state["clarification_questions"]:
+            print("-", question)
+        state = run_from_clarification("Budget: $100k-$120k, Timeline: 3 months", "", thread_id,
+                                       role_clarifications={role: "Budget: $100k-$120k, Timeline: 3 months" for role in state["roles"]})
+    print(job_description_text(state))
@@ -0,0 +1,59 @@
+# artifacts.py
+"""
+Handles for the generated artifacts (JD, email, checklist, offer letter).
+Prompts refer to an artifact by handle ([jd], [email], ...) and show only a
+short outline; tools resolve the handle to the full text locally, from the
+"artifacts" entry of the graph state.
+"""
+
+import re
+from typing import Dict, Optional
+
+HANDLES = {
+    "jd": "Job Description",
+    "email": "Outreach Email",
+    "checklist": "Hiring Checklist",
+    "offer_letter": "Offer Letter",
+}
+
+
+def normalize_handle(ref: str) -> Optional[str]:
+    """'[jd]', 'JD', 'offer letter' -> the canonical handle, or None."""
+    key = re.sub(r"[\s\-]+", "_", ref.strip().strip("[]").strip().lower())
+    if key in HANDLES:
+        return key
+    return next((h for h, title in HANDLES.items() if key == title.lower().replace(" ", "_")), None)
+
+
+def resolve(ref: str, artifacts: Dict[str, str]) -> str:
+    """Full text behind a handle; anything that is not a handle is returned as is."""
+    handle = normalize_handle(ref) if len(ref) < 40 else None
+    return artifacts.get(handle, "") if handle else ref
+
+
+def title(text: str) -> Optional[str]:
+    """Role named by a JD's first heading ("# Job Description: Backend Engineer" -> "Backend Engineer")."""
+    heading = next((line for line in text.splitlines() if line.strip().startswith("#")), "")
+    name = re.sub(r"^\s*#+\s*|\*", "", heading)
+    name = re.sub(r"^job\s+description\b\s*(?:for\b|[:\-–—|])?\s*", "", name, flags=re.I).strip()
+    return name or None
+
+
+def outline(text: str, max_lines: int = 12, width: int = 100) -> str:
+    """Markdown headings (or, failing that, the first lines) of an artifact."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    headings = [line for line in lines if line.startswith("#")]
+    picked = (headings or lines)[:max_lines]
+    return "\n".join(line if len(line) <= width else line[:width] + "…" for line in picked)
+
+
+def describe(artifacts: Dict[str, str]) -> str:
+    """Prompt section listing every artifact by handle with its outline."""
+    blocks = []
+    for handle, title in HANDLES.items():
+        text = artifacts.get(handle, "")
+        if text:
+            blocks.append(f"[{handle}] {title} ({len(text.split())} words). Outline:\n{outline(text)}")
+        else:
+            blocks.append(f"[{handle}] {title}: not generated yet")
+    return "\n\n".join(blocks)
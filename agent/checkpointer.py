@@ -0,0 +1,174 @@
+# checkpointer.py
+"""
+Persistent LangGraph checkpointer with retention.
+Checkpoints are stored in SQLite so they survive restarts and can be shared
+by several worker processes. Each thread keeps only its latest checkpoints,
+and threads that have been idle longer than a TTL are removed.
+
+Run `python -m agent.checkpointer` to compact the database by hand
+(e.g. from cron).
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import time
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+
+class RetentionSqliteSaver(SqliteSaver):
+    def __init__(self, conn, keep_last=20, idle_ttl=None, prune_every=1000, **kwargs):
+        """
+        Parameters
+        ----------
+        conn : sqlite3.Connection
+            Connection opened with check_same_thread=False.
+        keep_last : int
+            Checkpoints kept per thread (and namespace); older ones are deleted
+            whenever the thread writes a new checkpoint.
+        idle_ttl : float | None
+            Seconds after which an idle thread_id is deleted entirely.
+        prune_every : int
+            Run the idle-thread sweep once every this many checkpoint writes.
+        """
+        super().__init__(conn, **kwargs)
+        self.keep_last = keep_last
+        self.idle_ttl = idle_ttl
+        self.prune_every = prune_every
+        self._puts = 0
+
+    def setup(self):
+        if self.is_setup:
+            return
+        super().setup()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS thread_activity (thread_id TEXT PRIMARY KEY, last_seen REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS thread_activity_seen ON thread_activity (last_seen)")
+        self.conn.commit()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = str(config["configurable"]["thread_id"])
+        with self.cursor() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO thread_activity (thread_id, last_seen) VALUES (?, ?)",
+                (thread_id, time.time()),
+            )
+            self._trim(cur, thread_id, self.keep_last)
+        self._puts += 1
+        if self.idle_ttl is not None and self._puts % self.prune_every == 0:
+            self.prune_idle(self.idle_ttl)
+        return next_config
+
+    # ---- retention -------------------------------------------------
+
+    @staticmethod
+    def _trim(cur, thread_id, keep_last):
+        # checkpoint_ids are time-ordered, so the highest ids are the newest.
+        where, params = ("WHERE thread_id = ?", (thread_id,)) if thread_id is not None else ("", ())
+        cur.execute(
+            f"""
+            DELETE FROM checkpoints WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, ROW_NUMBER() OVER (
+                        PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+                    ) AS rn FROM checkpoints {where}
+                ) WHERE rn > ?
+            )
+            """,
+            (*params, keep_last),
+        )
+        cur.execute(
+            f"""
+            DELETE FROM writes {where or "WHERE 1"} AND NOT EXISTS (
+                SELECT 1 FROM checkpoints c
+                WHERE c.thread_id = writes.thread_id
+                  AND c.checkpoint_ns = writes.checkpoint_ns
+                  AND c.checkpoint_id = writes.checkpoint_id
+            )
+            """,
+            params,
+        )
+
+    def prune_idle(self, idle_ttl):
+        """Delete every thread that has not written a checkpoint for `idle_ttl` seconds."""
+        cutoff = time.time() - idle_ttl
+        with self.cursor() as cur:
+            stale = [row[0] for row in cur.execute(
+                "SELECT thread_id FROM thread_activity WHERE last_seen < ?", (cutoff,)
+            ).fetchall()]
+            for table in ("checkpoints", "writes", "thread_activity"):
+                cur.executemany(f"DELETE FROM {table} WHERE thread_id = ?", [(t,) for t in stale])
+        return len(stale)
+
+    def compact(self, keep_last=None, vacuum=True):
+        """Keep only the latest `keep_last` checkpoints of every thread, then reclaim disk space."""
+        with self.cursor() as cur:
+            self._trim(cur, None, keep_last or self.keep_last)
+        if vacuum:
+            with self.lock:
+                self.conn.execute("VACUUM")
+
+    def delete_thread(self, thread_id):
+        super().delete_thread(thread_id)
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM thread_activity WHERE thread_id = ?", (str(thread_id),))
+
+    # ---- async API -------------------------------------------------
+    # SqliteSaver is sync-only; run its methods in the default executor so
+    # graphs using this checkpointer also work through ainvoke/astream.
+
+    async def _in_executor(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def aget_tuple(self, config):
+        return await self._in_executor(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        items = await self._in_executor(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await self._in_executor(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await self._in_executor(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return await self._in_executor(self.delete_thread, thread_id)
+
+
+def build_checkpointer():
+    """
+    Checkpointer selected by the CHECKPOINTER env var:
+    "sqlite" (default) persists to CHECKPOINT_DB, "memory" keeps everything in process.
+    """
+    if os.getenv("CHECKPOINTER", "sqlite") == "memory":
+        return MemorySaver()
+    conn = sqlite3.connect(os.getenv("CHECKPOINT_DB", "checkpoints.sqlite"), check_same_thread=False)
+    idle_ttl = os.getenv("CHECKPOINT_IDLE_TTL", str(7 * 24 * 3600))
+    return RetentionSqliteSaver(
+        conn,
+        keep_last=int(os.getenv("CHECKPOINT_KEEP_LAST", "20")),
+        idle_ttl=float(idle_ttl) if idle_ttl else None,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prune and compact the checkpoint database.")
+    parser.add_argument("--db", default=os.getenv("CHECKPOINT_DB", "checkpoints.sqlite"))
+    parser.add_argument("--keep-last", type=int, default=int(os.getenv("CHECKPOINT_KEEP_LAST", "20")))
+    parser.add_argument("--idle-ttl", type=float, default=7 * 24 * 3600, help="seconds")
+    args = parser.parse_args()
+
+    saver = RetentionSqliteSaver(sqlite3.connect(args.db, check_same_thread=False), keep_last=args.keep_last)
+    removed = saver.prune_idle(args.idle_ttl)
+    saver.compact()
+    print(f"Removed {removed} idle threads; kept the latest {args.keep_last} checkpoints per thread.")
@@ -0,0 +1,114 @@
+# followup.py
+"""
+The follow-up step shared by the Streamlit app and the API server: pick the
+tool for a recruiter request (locally through agent/router.py when it is
+confident, otherwise by asking the LLM), run it through the tool graph, and
+store its output as the matching artifact.
+"""
+
+from typing import Dict, Optional
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from agent.agent import get_tool_graph
+from agent.artifacts import describe as describe_artifacts, normalize_handle
+from agent.router import route
+from agent.tools import write_outreach_email, generate_checklist, google_web_search, generate_offer_letter, edit_content
+from lazy import singleton
+from llm_config import llm
+
+# Artifact written by each generation tool; edit_content names its target in the call.
+TOOL_ARTIFACTS = {
+    "write_outreach_email": "email",
+    "generate_checklist": "checklist",
+    "generate_offer_letter": "offer_letter",
+}
+
+
+@singleton
+def get_tool_llm():
+    """The LLM with the follow-up tools bound; built once per process, on first use."""
+    return llm.bind_tools([write_outreach_email, generate_checklist, google_web_search, generate_offer_letter, edit_content])
+
+
+def system_prompt(artifacts: Dict[str, str]) -> str:
+    # give the LLM handles and outlines of the artifacts; tools resolve
+    # the full text locally, so documents are not pasted into the prompt
+    return (
+        "Here are the current artifacts you can reference or edit, by handle:\n\n"
+        f"{describe_artifacts(artifacts)}\n\n"
+        "• When the user wants to *change* one of these, call the tool **edit_content** with:\n"
+        "    - artifact: the handle of the item being edited (jd, email, checklist or offer_letter)\n"
+        "    - instruction: the user's request\n"
+        "• To build a checklist from the job description, call **generate_checklist** with context=\"jd\".\n"
+        "• Otherwise, call the appropriate generation tool."
+    )
+
+
+def select_tool(request: str, artifacts: Dict[str, str]) -> AIMessage:
+    """
+    Common requests are mapped to a tool call locally; the LLM only picks
+    the tool when the router is not confident.
+    """
+    return route(request, artifacts) or get_tool_llm().invoke(
+        [SystemMessage(content=system_prompt(artifacts)), HumanMessage(content=request)],
+        config={"run_name": "tool_selection"},
+    )
+
+
+async def aselect_tool(request: str, artifacts: Dict[str, str]) -> AIMessage:
+    """Async counterpart of select_tool."""
+    return route(request, artifacts) or await get_tool_llm().ainvoke(
+        [SystemMessage(content=system_prompt(artifacts)), HumanMessage(content=request)],
+        config={"run_name": "tool_selection"},
+    )
+
+
+def tool_input(ai_msg: AIMessage, artifacts: Dict[str, str]) -> dict:
+    return {
+        "messages": [ai_msg],
+        "recruiter_info": {"Job_Description": artifacts.get("jd", "")},
+        "artifacts": dict(artifacts),
+    }
+
+
+def tool_output(result: dict, ai_msg: AIMessage) -> str:
+    return next((msg.content for msg in result["messages"] if isinstance(msg, ToolMessage)), ai_msg.content)
+
+
+def target_artifact(tool_call: Optional[dict]) -> Optional[str]:
+    """Handle of the artifact a tool call produces or edits (None for web searches)."""
+    if not tool_call:
+        return None
+    if tool_call["name"] == "edit_content":
+        return normalize_handle(tool_call["args"].get("artifact", ""))
+    return TOOL_ARTIFACTS.get(tool_call["name"])
+
+
+def run_followup(request: str, artifacts: Dict[str, str]) -> dict:
+    """
+    Answer one follow-up. Returns the tool name (None when the LLM answered
+    without a tool), its output, and the handle of the artifact it replaces
+    in `artifacts` (updated in place), if any.
+    """
+    ai_msg = select_tool(request, artifacts)
+    tool_call = ai_msg.tool_calls[0] if ai_msg.tool_calls else None
+    output = tool_output(get_tool_graph().invoke(tool_input(ai_msg, artifacts)), ai_msg) if tool_call else ai_msg.content
+    return store_output(tool_call, output, artifacts)
+
+
+async def arun_followup(request: str, artifacts: Dict[str, str]) -> dict:
+    """Async counterpart of run_followup."""
+    ai_msg = await aselect_tool(request, artifacts)
+    tool_call = ai_msg.tool_calls[0] if ai_msg.tool_calls else None
+    output = tool_output(await get_tool_graph().ainvoke(tool_input(ai_msg, artifacts)), ai_msg) if tool_call else ai_msg.content
+    return store_output(tool_call, output, artifacts)
+
+
+def store_output(tool_call: Optional[dict], output: str, artifacts: Dict[str, str]) -> dict:
+    """Write `output` to the artifact `tool_call` targets, if any, and describe the result."""
+    handle = target_artifact(tool_call)
+    previous = artifacts.get(handle, "") if handle else ""
+    if handle:
+        artifacts[handle] = output
+    return {"tool": tool_call["name"] if tool_call else None, "artifact": handle, "output": output, "previous": previous}
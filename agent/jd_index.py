@@ -0,0 +1,178 @@
+# jd_index.py
+"""
+Local vector index of generated job descriptions.
+Each JD is stored with the role and clarifications it was written from; the
+inputs are embedded with feature hashing (no model download, no API call)
+into a NumPy matrix, so a top-k cosine search over 100k documents is a
+single matrix-vector product. On disk the index is an append-only float32
+file plus a JSONL file of documents, so adding a JD never rewrites the index,
+and every process sharing the directory picks up the others' appends before
+its next lookup.
+
+The similarity search only finds examples for the prompt: near-identical
+vectors can still differ in location, level or skills. A stored JD is
+reused verbatim only by exact(), for the same role and the same answers.
+"""
+
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single writer process is assumed
+    fcntl = None
+
+DIM = 256
+
+
+def _features(text: str) -> List[str]:
+    words = re.findall(r"[a-z0-9+#]+", text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def embed(text: str, dim: int = DIM) -> np.ndarray:
+    """Signed feature-hashing embedding of words and word pairs, L2-normalized."""
+    vec = np.zeros(dim, dtype=np.float32)
+    for feature in _features(text):
+        h = zlib.crc32(feature.encode("utf-8"))
+        vec[h % dim] += 1.0 if (h >> 16) & 1 else -1.0
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def jd_key(role: str, clarifications: str) -> str:
+    # The role is repeated so it outweighs long clarification answers.
+    return f"{role} {role} {clarifications}"
+
+
+def inputs_key(role: str, clarifications: str) -> str:
+    """Role and answers with case and whitespace normalized, for exact reuse."""
+    return " ".join(role.lower().split()) + "\x00" + " ".join(clarifications.lower().split())
+
+
+class JDIndex:
+    def __init__(self, path: str = None, dim: int = DIM):
+        """
+        Parameters
+        ----------
+        path : str | None
+            Directory holding vectors.f32 and docs.jsonl. None keeps the index
+            in memory only.
+        dim : int
+            Embedding size; changing it requires rebuilding the index.
+        """
+        self.dim = dim
+        self.path = path
+        self._lock = threading.Lock()
+        self._docs: List[Dict[str, str]] = []
+        self._exact: Dict[str, int] = {}
+        self._vectors = np.zeros((1024, dim), dtype=np.float32)
+        self._docs_size = 0  # bytes of docs.jsonl loaded so far
+        if path:
+            os.makedirs(path, exist_ok=True)
+            with self._lock:
+                self._refresh()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _files(self):
+        return os.path.join(self.path, "vectors.f32"), os.path.join(self.path, "docs.jsonl")
+
+    def _append(self, docs: List[Dict[str, str]], vectors: np.ndarray):
+        # Caller holds self._lock.
+        count = len(self._docs)
+        if count + len(docs) > len(self._vectors):
+            grown = np.zeros((max(2 * len(self._vectors), count + len(docs)), self.dim), dtype=np.float32)
+            grown[:count] = self._vectors[:count]
+            self._vectors = grown
+        self._vectors[count:count + len(docs)] = vectors
+        self._docs.extend(docs)
+        for i, doc in enumerate(docs, count):
+            self._exact[inputs_key(doc["role"], doc["clarifications"])] = i
+
+    def _sync(self, docs_in, vectors_in):
+        """Load the rows appended to the files since the last read; needs self._lock and a file lock."""
+        docs_in.seek(self._docs_size)
+        docs, sizes = [], []
+        for line in docs_in:
+            try:
+                docs.append(json.loads(line))
+            except json.JSONDecodeError:
+                break  # a line cut short by a crash
+            sizes.append(len(line))
+        vectors_in.seek(len(self._docs) * self.dim * 4)
+        vectors = np.frombuffer(vectors_in.read(len(docs) * self.dim * 4), dtype=np.float32)
+        count = min(len(docs), len(vectors) // self.dim)
+        if count:
+            self._docs_size += sum(sizes[:count])
+            self._append(docs[:count], vectors[: count * self.dim].reshape(count, self.dim))
+
+    def _refresh(self):
+        """Pick up documents other processes appended; caller holds self._lock."""
+        if not self.path:
+            return
+        vectors_file, docs_file = self._files()
+        if not os.path.exists(vectors_file) or not os.path.exists(docs_file) or os.path.getsize(docs_file) == self._docs_size:
+            return
+        with open(docs_file, "rb") as docs_in, open(vectors_file, "rb") as vectors_in:
+            if fcntl:
+                fcntl.flock(docs_in, fcntl.LOCK_SH)
+            self._sync(docs_in, vectors_in)
+
+    def add(self, role: str, clarifications: str, jd: str):
+        self.add_many([(role, clarifications, jd)])
+
+    def add_many(self, items: List[Tuple[str, str, str]]):
+        """Index (role, clarifications, jd) triples; used for bulk builds."""
+        if not items:
+            return
+        vectors = np.stack([embed(jd_key(role, clar), self.dim) for role, clar, _ in items])
+        docs = [{"role": role, "clarifications": clar, "jd": jd} for role, clar, jd in items]
+        with self._lock:
+            if self.path:
+                vectors_file, docs_file = self._files()
+                with open(docs_file, "a+b") as docs_out, open(vectors_file, "a+b") as vectors_out:
+                    # Several API workers may append at once; the file lock keeps
+                    # the n-th document and the n-th vector together. Rows the
+                    # others wrote are loaded first so positions match the files,
+                    # and a tail left by a crashed writer is cut off.
+                    if fcntl:
+                        fcntl.flock(docs_out, fcntl.LOCK_EX)
+                    self._sync(docs_out, vectors_out)
+                    docs_out.truncate(self._docs_size)
+                    vectors_out.truncate(len(self._docs) * self.dim * 4)
+                    data = b"".join(json.dumps(doc).encode("utf-8") + b"\n" for doc in docs)
+                    docs_out.write(data)
+                    vectors_out.write(vectors.tobytes())
+                    self._docs_size += len(data)
+            self._append(docs, vectors)
+
+    def exact(self, role: str, clarifications: str) -> Optional[Dict[str, str]]:
+        """The latest document written for the same role and answers, if any."""
+        with self._lock:
+            self._refresh()
+            i = self._exact.get(inputs_key(role, clarifications))
+            return self._docs[i] if i is not None else None
+
+    def search(self, role: str, clarifications: str, k: int = 3) -> List[Tuple[float, Dict[str, str]]]:
+        """Top-k stored documents by cosine similarity of their inputs, best first."""
+        query = embed(jd_key(role, clarifications), self.dim)
+        with self._lock:
+            self._refresh()
+            count = len(self._docs)
+            scores = self._vectors[:count] @ query
+            docs = self._docs
+        if not count:
+            return []
+        k = min(k, count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), docs[i]) for i in top]
+
@@ -0,0 +1,188 @@
+# question_bank.py
+"""
+Bank of clarifying questions keyed by normalized role title.
+Every question list the LLM generates is stored here (SQLite, loaded into
+memory at start-up; rows other processes add are picked up on the next
+lookup). Later requests for the same or a similar title
+("Sr. Backend Eng", "backend engineers") are answered from the bank without
+an LLM call; unseen roles still go to the LLM and are added afterwards.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+ABBREVIATIONS = {
+    "sr": "senior", "jr": "junior", "eng": "engineer", "engr": "engineer", "dev": "developer",
+    "swe": "software engineer", "sde": "software engineer", "mgr": "manager", "pm": "product manager",
+    "ae": "account executive", "sdr": "sales development representative", "ml": "machine learning",
+    "qa": "quality assurance", "ux": "user experience", "ui": "user interface", "hr": "human resources",
+}
+# Seniority does not change which questions are asked; the role level is one of them.
+SENIORITY = {"senior", "junior", "lead", "staff", "principal", "mid", "level", "entry", "i", "ii", "iii"}
+# Phrasing around the role title in a hiring request.
+REQUEST_FILLER = re.compile(
+    r"^\s*(?:(?:hi|hello|please)\b[,!]?\s*)?"
+    r"(?:(?:i|we)(?:'d|'m|'re| would| am| are)?\s+(?:like|want|need|looking|hiring)?\s*)?"
+    r"(?:to\s+)?(?:(?:hire|recruit|find)\b\s*)?(?:(?:us|me)\b\s*)?(?:for\b\s*)?",
+    re.I,
+)
+
+
+def _singular(word: str) -> str:
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def normalize_role(title: str) -> str:
+    """'Sr. Backend Engineers' -> 'backend engineer'."""
+    words = re.findall(r"[a-z0-9+#]+", title.lower().replace("-", ""))
+    expanded = " ".join(ABBREVIATIONS.get(w, w) for w in words).split()
+    return " ".join(_singular(w) for w in expanded if w not in SENIORITY and w not in {"a", "an", "the"})
+
+
+def _same_word(a: str, b: str) -> bool:
+    return a == b or (a[0] == b[0] and abs(len(a) - len(b)) <= 2 and SequenceMatcher(None, a, b).ratio() >= 0.85)
+
+
+def similarity(a: str, b: str) -> float:
+    """Share of words (typo-tolerant) two normalized titles have in common."""
+    left, right = a.split(), b.split()
+    if not left or not right:
+        return 0.0
+    if a.replace(" ", "") == b.replace(" ", ""):
+        return 1.0
+    matched = sum(any(_same_word(w, r) for r in right) for w in left)
+    return matched / max(len(left), len(right))
+
+
+def _leading_seniority(title: str) -> List[str]:
+    words = [ABBREVIATIONS.get(w, w) for w in re.findall(r"[a-z]+", title.lower())]
+    leading = []
+    for word in words:
+        if word not in SENIORITY or word in {"i", "ii", "iii"}:
+            break
+        leading.append(word)
+    return leading
+
+
+def _with_seniority(title: str, phrase: str) -> str:
+    """Stored `title` with the leading seniority words of `phrase` instead of its own."""
+    words = title.split()[len(_leading_seniority(title)):]
+    return " ".join([w.capitalize() for w in _leading_seniority(phrase)] + words)
+
+
+def role_phrases(request: str) -> List[str]:
+    """
+    Role titles of a request that is nothing but role names, e.g.
+    "I need to hire a backend engineer and a designer". Longer free-form
+    requests yield phrases that will simply not match the bank.
+    """
+    text = REQUEST_FILLER.sub("", request.strip().rstrip(".!"))
+    parts = re.split(r",|\band\b|&|/|\+", text)
+    return [re.sub(r"^\s*(?:a|an|one|two|\d+)\s+", "", p, flags=re.I).strip() for p in parts if p.strip()]
+
+
+class QuestionBank:
+    def __init__(self, path="question_bank.sqlite", min_score=0.8):
+        """
+        Parameters
+        ----------
+        path : str
+            SQLite file that holds the bank (":memory:" for a throwaway bank).
+        min_score : float
+            Similarity a stored title needs to be served for a new one.
+        """
+        self.min_score = min_score
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS question_bank ("
+            "role_key TEXT PRIMARY KEY, role TEXT NOT NULL, questions TEXT NOT NULL, "
+            "uses INTEGER NOT NULL DEFAULT 0, created REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._index: Dict[str, Tuple[str, List[str]]] = {}
+        self._last_rowid = 0
+        self._data_version = None
+        self._refresh()
+
+    def _refresh(self):
+        """Load rows other connections committed since the last look; caller holds self._lock."""
+        # data_version only changes when another connection commits, so this is one cheap query.
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        self._data_version = version
+        rows = self._conn.execute(
+            "SELECT rowid, role_key, role, questions FROM question_bank WHERE rowid > ? ORDER BY rowid", (self._last_rowid,)
+        )
+        for rowid, key, role, questions in rows:
+            self._index[key] = (role, json.loads(questions))
+            self._last_rowid = rowid
+
+    def match(self, role: str) -> Optional[Tuple[str, float]]:
+        """(stored key, score) of the closest stored title, if it is close enough."""
+        key = normalize_role(role)
+        if not key:
+            return None
+        with self._lock:
+            self._refresh()
+            if key in self._index:
+                return key, 1.0
+            keys = list(self._index)
+        scored = [(k, similarity(key, k)) for k in keys]
+        best = max(scored, key=lambda ks: ks[1], default=None)
+        return best if best and best[1] >= self.min_score else None
+
+    def lookup(self, role: str) -> Optional[List[str]]:
+        """Stored questions for `role` or a similar title; None when it is unseen."""
+        found = self.match(role)
+        with self._lock:
+            if found is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE question_bank SET uses = uses + 1 WHERE role_key = ?", (found[0],))
+            self._conn.commit()
+            return list(self._index[found[0]][1])
+
+    def roles_in(self, request: str) -> Optional[List[str]]:
+        """
+        The roles of a request made only of known role titles, as the bank
+        stores them but with the request's own seniority ("sr backend
+        enginer" -> "Senior Backend Engineer"); None when any part is unknown.
+        """
+        phrases = role_phrases(request)
+        found = [self.match(p) for p in phrases]
+        if not found or None in found:
+            return None
+        with self._lock:
+            titles = [self._index[key][0] for key, _ in found]
+        return [_with_seniority(title, phrase) for title, phrase in zip(titles, phrases)]
+
+    def add(self, role: str, questions: List[str]):
+        key = normalize_role(role)
+        if not key or not questions:
+            return
+        with self._lock:
+            self._index[key] = (role, list(questions))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO question_bank (role_key, role, questions, uses, created) VALUES (?, ?, ?, 0, ?)",
+                (key, role, json.dumps(questions), time.time()),
+            )
+            self._conn.commit()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "roles": len(self._index),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
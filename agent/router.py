@@ -0,0 +1,162 @@
+# router.py
+"""
+Local intent router for the follow-up chat.
+Maps common requests ("generate email", "edit checklist", ...) straight to a
+tool call without asking the LLM which tool to use. A request is routed only
+when the keyword rules and a small bag-of-words similarity classifier agree
+with enough confidence and every required argument could be extracted;
+otherwise route() returns None and the caller falls back to the LLM.
+"""
+
+import math
+import re
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage
+
+# Labelled prototypes for the similarity classifier.
+EXAMPLES = {
+    "write_outreach_email": [
+        "generate email", "write an outreach email to the candidate", "draft an email inviting them to interview",
+        "send a follow-up email", "email the candidate about next steps", "compose a recruiting email",
+    ],
+    "generate_checklist": [
+        "generate checklist", "create a hiring checklist", "make a checklist for this job",
+        "give me the hiring process steps", "checklist for sourcing screening interviewing onboarding",
+    ],
+    "google_web_search": [
+        "search the web for salary benchmarks", "look up the market salary", "google average pay for this role",
+        "what is the current market rate", "find the latest trends for this role online",
+    ],
+    "generate_offer_letter": [
+        "generate offer letter", "write an offer letter for the candidate with salary",
+        "draft an offer for the hire", "create the offer letter", "prepare a job offer",
+    ],
+    "edit_content": [
+        "edit the job description", "change the salary range in the jd", "make the email shorter",
+        "update the checklist", "rewrite the offer letter", "modify the email tone", "remove a section from the jd",
+        "add remote work to the job description",
+    ],
+}
+
+KEYWORDS = {
+    "write_outreach_email": re.compile(r"\b(e-?mail|outreach|reach out)\b", re.I),
+    "generate_checklist": re.compile(r"\bcheck-?list\b", re.I),
+    "google_web_search": re.compile(r"\b(search|google|look up|market rate|benchmark|latest|online|web)\b", re.I),
+    "generate_offer_letter": re.compile(r"\boffer\b", re.I),
+    "edit_content": re.compile(r"\b(edit|change|update|modify|rewrite|revise|shorten|shorter|longer|remove|add|replace|fix|tweak)\b", re.I),
+}
+
+# Which artifact an edit request targets.
+ARTIFACT_PATTERNS = [
+    ("jd", re.compile(r"\b(jd|job description|description)\b", re.I)),
+    ("email", re.compile(r"\be-?mail\b", re.I)),
+    ("checklist", re.compile(r"\bcheck-?list\b", re.I)),
+    ("offer_letter", re.compile(r"\boffer\b", re.I)),
+]
+
+PURPOSES = ["interview", "follow-up", "follow up", "rejection", "offer", "introduction", "reminder", "scheduling"]
+NAME = r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,2})"
+SALARY = re.compile(r"(\$\s?\d[\d,.]*\s*[kKmM]?(?:\s*(?:-|to)\s*\$?\s?\d[\d,.]*\s*[kKmM]?)?|\d[\d,.]*\s*(?:[kK]|USD|EUR|GBP|INR|LPA)\b)")
+
+MIN_SCORE = 0.45
+MIN_MARGIN = 0.15
+# Tool-call ids of locally routed calls start with this, so callers can tell them apart.
+ROUTER_ID_PREFIX = "router-"
+
+
+def _features(text: str) -> Counter:
+    words = re.findall(r"[a-z]+", text.lower())
+    return Counter(words + [f"{a} {b}" for a, b in zip(words, words[1:])])
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    dot = sum(v * b[k] for k, v in a.items() if k in b)
+    norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norm if norm else 0.0
+
+
+_PROTOTYPES = {tool: [_features(e) for e in examples] for tool, examples in EXAMPLES.items()}
+
+
+def classify(text: str) -> Tuple[str, float, float]:
+    """Return (tool, score, margin over the runner-up) for a follow-up request."""
+    feats = _features(text)
+    scores = {
+        tool: max(_cosine(feats, proto) for proto in protos) + (0.4 if KEYWORDS[tool].search(text) else 0.0)
+        for tool, protos in _PROTOTYPES.items()
+    }
+    # An edit verb plus an artifact name is an edit, not a new generation.
+    if KEYWORDS["edit_content"].search(text) and target_artifact(text):
+        scores["edit_content"] += 0.3
+    ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+    (tool, top), (_, second) = ranked[0], ranked[1]
+    return tool, top, top - second
+
+
+def named_artifacts(text: str) -> List[Tuple[int, str]]:
+    """(position, handle) of every artifact the text names, in order of appearance."""
+    found = ((pattern.search(text), name) for name, pattern in ARTIFACT_PATTERNS)
+    return sorted((match.start(), name) for match, name in found if match)
+
+
+def target_artifact(text: str) -> Optional[str]:
+    """
+    The artifact an edit request is about: the first one named after the
+    edit verb ("update the email to link to the job description" -> email).
+    """
+    named = named_artifacts(text)
+    verb = KEYWORDS["edit_content"].search(text)
+    after = [name for position, name in named if not verb or position > verb.start()]
+    return (after or [name for _, name in named] or [None])[0]
+
+
+def _candidate(text: str) -> Optional[str]:
+    match = re.search(rf"\b(?:to|for|candidate|named)\s+{NAME}", text)
+    return match.group(1) if match else None
+
+
+def extract_args(tool: str, text: str, artifacts: Dict[str, str]) -> Optional[Dict[str, str]]:
+    """Tool arguments for `text`, or None when a required one is missing."""
+    if tool == "write_outreach_email":
+        lower = text.lower()
+        purpose = next((p for p in PURPOSES if p in lower), "interview")
+        return {"purpose": purpose, "candidate": _candidate(text) or "the candidate"}
+    if tool == "generate_checklist":
+        return {"context": "jd"} if artifacts.get("jd") else None
+    if tool == "google_web_search":
+        query = re.sub(r"^\s*(please\s+)?(search( the web)?( for)?|google|look up|find)\s+", "", text, flags=re.I)
+        return {"query": query.strip() or text}
+    if tool == "generate_offer_letter":
+        name, salary = _candidate(text), SALARY.search(text)
+        return {"candidate_name": name, "salary": salary.group(1).strip()} if name and salary else None
+    if tool == "edit_content":
+        # With several artifacts named, which one to change is left to the LLM.
+        if len(named_artifacts(text)) > 1:
+            return None
+        artifact = target_artifact(text)
+        if not artifact or not artifacts.get(artifact):
+            return None
+        return {"artifact": artifact, "instruction": text}
+    return None
+
+
+def route(text: str, artifacts: Dict[str, str]) -> Optional[AIMessage]:
+    """
+    Build the tool call the LLM would have made for `text`, or return None
+    when the local router is not confident enough.
+    """
+    tool, score, margin = classify(text)
+    if score < MIN_SCORE or margin < MIN_MARGIN:
+        return None
+    args = extract_args(tool, text, artifacts)
+    if args is None:
+        return None
+    return AIMessage(content="", tool_calls=[{"name": tool, "args": args, "id": f"{ROUTER_ID_PREFIX}{uuid.uuid4()}"}])
+
+
+def routed_locally(message: AIMessage) -> bool:
+    """Whether a tool call came from `route` rather than from the LLM."""
+    return bool(message.tool_calls) and message.tool_calls[0]["id"].startswith(ROUTER_ID_PREFIX)
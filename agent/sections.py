@@ -0,0 +1,140 @@
+# sections.py
+"""
+Section-level editing of markdown artifacts.
+A document is split at its headings; only the sections an instruction
+touches are sent to the LLM, and the edited sections are spliced back in.
+Output tokens then scale with the size of the edit instead of the document.
+"""
+
+import asyncio
+import difflib
+import re
+from typing import Awaitable, Callable, Dict, List, Optional
+
+HEADING = re.compile(r"^\s{0,3}(#{1,6}\s+\S.*|\*\*[^*]+\*\*:?)\s*$")
+
+STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "into", "more", "less", "please", "make", "should",
+    "edit", "change", "update", "modify", "rewrite", "revise", "add", "remove", "replace", "fix", "tweak",
+    "section", "part", "job", "description", "email", "checklist", "offer", "letter", "it", "to", "of", "in",
+}
+# Words recruiters use for a topic vs. the headings LLM-written documents use.
+SYNONYMS = {
+    "salary": ["compensation", "pay", "benefits"],
+    "pay": ["compensation", "salary"],
+    "location": ["remote", "hybrid", "site", "office"],
+    "remote": ["location", "hybrid"],
+    "skills": ["requirements", "qualifications"],
+    "experience": ["requirements", "qualifications"],
+    "duties": ["responsibilities"],
+    "tasks": ["responsibilities"],
+}
+
+
+def split_sections(text: str) -> List[str]:
+    """Split at markdown headings; "".join(split_sections(t)) == t."""
+    sections, current = [], []
+    for line in text.splitlines(keepends=True):
+        if HEADING.match(line) and current:
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+    return sections
+
+
+def heading(section: str) -> str:
+    return section.strip().splitlines()[0].strip("#* ").strip() if section.strip() else ""
+
+
+def _terms(text: str) -> List[str]:
+    return [w[:6] for w in re.findall(r"[a-z]+", text.lower()) if len(w) > 2 and w not in STOPWORDS]
+
+
+def match_sections(sections: List[str], instruction: str) -> List[int]:
+    """Indices of the sections an instruction most likely refers to (lexical match)."""
+    words = re.findall(r"[a-z]+", instruction.lower())
+    terms = set(_terms(instruction)) | {s[:6] for w in words for s in SYNONYMS.get(w, [])}
+    if not terms:
+        return []
+    scores = []
+    for section in sections:
+        head, body = set(_terms(heading(section))), set(_terms(section))
+        scores.append(3 * len(terms & head) + len(terms & body))
+    best = max(scores)
+    return [i for i, score in enumerate(scores) if best and score >= best / 2]
+
+
+def selection_prompt(sections: List[str], instruction: str) -> str:
+    numbered = "\n".join(f"{i}. {heading(s)}" for i, s in enumerate(sections))
+    return (
+        f"A document has these numbered sections:\n{numbered}\n\n"
+        f"Which sections must change to apply this instruction: {instruction}\n"
+        f"Answer with the section numbers only, comma-separated."
+    )
+
+
+def parse_selection(response_text: str, count: int) -> List[int]:
+    return sorted({int(n) for n in re.findall(r"\d+", response_text) if int(n) < count})
+
+
+def _plan(sections: List[str], picked: List[int]) -> bool:
+    # Section edits only pay off when a minority of a multi-section document changes.
+    return len(sections) >= 3 and bool(picked) and len(picked) <= len(sections) // 2
+
+
+def _splice(sections: List[str], edits: Dict[int, str]) -> str:
+    # Keep each section's original trailing whitespace so headings stay separated.
+    for i, edited in edits.items():
+        original = sections[i]
+        sections[i] = edited.strip("\n") + original[len(original.rstrip()):]
+    return "".join(sections)
+
+
+def edit_sections(
+    text: str,
+    instruction: str,
+    edit: Callable[[str], str],
+    select: Optional[Callable[[List[str]], List[int]]] = None,
+) -> Optional[str]:
+    """
+    Apply `edit` (section text -> edited section text) to the sections that
+    `instruction` affects and splice them back into the document. `select`
+    is asked when the lexical match finds nothing; callers pass it only for
+    documents large enough that a selection call beats a full edit.
+    Returns None when a section edit would not save anything (too few
+    sections, or most of the document is affected), so the caller can edit
+    the whole document.
+    """
+    sections = split_sections(text)
+    if len(sections) < 3:
+        return None
+    picked = match_sections(sections, instruction) or (select(sections) if select else [])
+    if not _plan(sections, picked):
+        return None
+    return _splice(sections, {i: edit(sections[i]) for i in picked})
+
+
+async def aedit_sections(
+    text: str,
+    instruction: str,
+    edit: Callable[[str], Awaitable[str]],
+    select: Optional[Callable[[List[str]], Awaitable[List[int]]]] = None,
+) -> Optional[str]:
+    """Async counterpart of edit_sections; affected sections are edited concurrently."""
+    sections = split_sections(text)
+    if len(sections) < 3:
+        return None
+    picked = match_sections(sections, instruction) or (await select(sections) if select else [])
+    if not _plan(sections, picked):
+        return None
+    edited = await asyncio.gather(*(edit(sections[i]) for i in picked))
+    return _splice(sections, dict(zip(picked, edited)))
+
+
+def section_diff(old: str, new: str) -> str:
+    """Unified diff of two artifact versions, for display in the UI."""
+    return "".join(difflib.unified_diff(
+        old.splitlines(keepends=True), new.splitlines(keepends=True), "before", "after", n=1,
+    ))
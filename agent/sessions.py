@@ -0,0 +1,100 @@
+# sessions.py
+"""
+Per-thread workflow state shared by every API worker: the request, the
+extracted roles and their clarification questions, and the generated
+artifacts (JD, email, checklist, offer letter). Graph checkpoints live in
+the checkpointer; this store keeps what the UI needs between steps, in a
+SQLite file (WAL mode) that several processes can use at once, so any
+worker can serve any thread_id.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from agent.artifacts import HANDLES
+
+
+def empty_session() -> dict:
+    return {
+        "request": "",
+        "roles": [],
+        "role_questions": {},
+        "clarification_questions": [],
+        "artifacts": {handle: "" for handle in HANDLES},
+    }
+
+
+class SessionStore:
+    def __init__(self, path="sessions.sqlite", idle_ttl=None):
+        """
+        Parameters
+        ----------
+        path : str
+            SQLite file shared by the workers (":memory:" for a single process).
+        idle_ttl : float | None
+            Seconds after which a session that has not been written is
+            deleted by prune_idle().
+        """
+        self.idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (thread_id TEXT PRIMARY KEY, data TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, thread_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM sessions WHERE thread_id = ?", (thread_id,)).fetchone()
+        return {**empty_session(), **json.loads(row[0])} if row else None
+
+    def _modify(self, thread_id, change):
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so concurrent
+            # workers updating the same thread cannot lose each other's changes.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT data FROM sessions WHERE thread_id = ?", (thread_id,)).fetchone()
+                data = change({**empty_session(), **(json.loads(row[0]) if row else {})})
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions (thread_id, data, updated) VALUES (?, ?, ?)",
+                    (thread_id, json.dumps(data), time.time()),
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return data
+
+    def update(self, thread_id: str, **fields) -> dict:
+        """Merge `fields` into the session (created if missing) and return the result."""
+        return self._modify(thread_id, lambda data: {**data, **fields})
+
+    def put_artifact(self, thread_id: str, handle: str, text: str) -> dict:
+        """Replace one artifact, leaving the others as they are in the store."""
+        return self._modify(thread_id, lambda data: {**data, "artifacts": {**data["artifacts"], handle: text}})
+
+    def delete(self, thread_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE thread_id = ?", (thread_id,))
+            self._conn.commit()
+
+    def prune_idle(self, idle_ttl=None) -> int:
+        """Delete sessions not written for `idle_ttl` seconds (default: the store's)."""
+        idle_ttl = idle_ttl if idle_ttl is not None else self.idle_ttl
+        if idle_ttl is None:
+            return 0
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM sessions WHERE updated < ?", (time.time() - idle_ttl,)).rowcount
+            self._conn.commit()
+        return removed
+
+    def stats(self):
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()
+        return {"sessions": count}
@@ -0,0 +1,117 @@
+# speculative.py
+"""
+Opt-in speculative precomputation of likely follow-ups.
+While the recruiter answers the clarification questions, a salary web search
+for each role is started; once a JD is shown, its hiring checklist is
+generated. Each result is keyed by the input it was computed from, so a
+changed role or JD never serves a stale answer, and superseded tasks are
+cancelled (or, if already running, their result is dropped). Tasks run in
+the scheduler's bulk lane so they never delay interactive calls, and every
+session may start at most `max_tasks` of them.
+"""
+
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from agent.artifacts import resolve
+from scheduler import lane
+from search_cache import normalize_query
+
+# Shared by all sessions; speculation should never crowd out real work.
+_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="speculative")
+
+
+def fingerprint(text: str) -> str:
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()[:16]
+
+
+def salary_query(role: str) -> str:
+    return f"current market salary benchmarks for a {role}"
+
+
+class SpeculativeExecutor:
+    def __init__(self, max_tasks: int = 4, timeout: float = 60.0):
+        """
+        Parameters
+        ----------
+        max_tasks : int
+            Speculative tool calls one session may start in total (cost cap).
+        timeout : float
+            Longest a follow-up waits for a precomputation that is still running.
+        """
+        self.max_tasks = max_tasks
+        self.timeout = timeout
+        self.started = 0
+        self.hits = 0
+        self.wasted = 0
+        self._tasks: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+
+    def _run(self, fn: Callable[[], str]) -> str:
+        with lane("bulk"):
+            return fn()
+
+    def submit(self, kind: str, key: str, fn: Callable[[], str]) -> bool:
+        """Start fn() for (kind, key) unless it already runs or the session's budget is spent."""
+        with self._lock:
+            if (kind, key) in self._tasks or self.started >= self.max_tasks:
+                return False
+            self.started += 1
+            self._tasks[(kind, key)] = _pool.submit(self._run, fn)
+            return True
+
+    def discard(self, kind: str = None, keep: str = None):
+        """Cancel the tasks of `kind` (all kinds when None) except the one for `keep`."""
+        with self._lock:
+            for (k, key), future in list(self._tasks.items()):
+                if (kind is None or k == kind) and key != keep:
+                    del self._tasks[(k, key)]
+                    if future.cancel():
+                        self.started -= 1  # never ran, so it cost nothing
+                    else:
+                        self.wasted += 1
+
+    def take(self, kind: str, key: str) -> Optional[str]:
+        """The precomputed result for (kind, key), waiting if it is still running; None on a miss or failure."""
+        with self._lock:
+            future = self._tasks.pop((kind, key), None)
+        if future is None:
+            return None
+        try:
+            result = future.result(timeout=self.timeout)
+        except Exception:
+            return None
+        self.hits += 1
+        return result
+
+    # --- what the app speculates on -------------------------------------
+
+    def prewarm_searches(self, roles: List[str], search: Callable[[str], str]):
+        self.discard("salary_search")
+        for role in roles:
+            query = salary_query(role)
+            self.submit("salary_search", normalize_query(query), lambda query=query: search(query))
+
+    def precompute_checklist(self, jd: str, checklist: Callable[[str], str]):
+        key = fingerprint(jd)
+        self.discard("checklist", keep=key)
+        self.submit("checklist", key, lambda: checklist(jd))
+
+    def lookup(self, tool_call: dict, artifacts: Dict[str, str]) -> Optional[str]:
+        """Precomputed output for a follow-up tool call, if it asks for something speculated."""
+        name, args = tool_call["name"], tool_call.get("args", {})
+        if name == "generate_checklist" and artifacts.get("jd"):
+            if resolve(args.get("context", "jd"), artifacts) == artifacts["jd"]:
+                return self.take("checklist", fingerprint(artifacts["jd"]))
+        if name == "google_web_search":
+            # Only the same search, up to wording the search cache ignores; a
+            # salary question about another role must reach the real tool.
+            return self.take("salary_search", normalize_query(args.get("query", "")))
+        return None
+
+    def stats(self):
+        with self._lock:
+            pending = sum(not f.done() for f in self._tasks.values())
+        return {"started": self.started, "budget": self.max_tasks, "hits": self.hits, "wasted": self.wasted, "pending": pending}
@@ -0,0 +1,188 @@
+# templates.py
+"""
+Template-and-slot-fill generation for high-volume offer letters and
+outreach emails. The LLM writes one parameterized template per role and
+purpose; every candidate's document is then rendered locally by filling the
+slots. The LLM is only called again for an explicitly requested
+per-candidate custom touch.
+
+Render a cohort from the command line:
+    python -m agent.templates candidates.jsonl letters.jsonl --kind offer_letter --role "Backend Engineer"
+where each input line looks like
+    {"candidate_name": "Ana Costa", "salary": "$120,000", "start_date": "1 March", "custom_note": ""}
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from string import Template
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.messages import HumanMessage
+
+from llm_config import llm
+
+SLOTS = {
+    "offer_letter": ["candidate_name", "salary", "start_date", "role", "custom_touch"],
+    "email": ["candidate_name", "role", "custom_touch"],
+}
+
+# (kind, role, purpose) -> template text, shared by the sync and async paths;
+# the least recently used template is dropped beyond TEMPLATE_CACHE_SIZE.
+TEMPLATE_CACHE_SIZE = int(os.getenv("TEMPLATE_CACHE_SIZE", "256"))
+_templates: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+_templates_lock = threading.Lock()
+# LLM calls allowed to produce a template with exactly the expected slots.
+TEMPLATE_ATTEMPTS = 2
+
+
+def _cached(key: Tuple[str, str, str]) -> Optional[str]:
+    with _templates_lock:
+        template = _templates.get(key)
+        if template is not None:
+            _templates.move_to_end(key)
+        return template
+
+
+def _store(key: Tuple[str, str, str], template: str) -> str:
+    with _templates_lock:
+        _templates[key] = template
+        _templates.move_to_end(key)
+        while len(_templates) > TEMPLATE_CACHE_SIZE:
+            _templates.popitem(last=False)
+    return template
+
+
+def _template_prompt(kind: str, role: str, purpose: str) -> str:
+    slots = ", ".join(f"${{{slot}}}" for slot in SLOTS[kind])
+    document = (
+        "a formal offer letter. Include the start date, benefits, company culture, and a welcoming tone. Format it professionally."
+        if kind == "offer_letter"
+        else f"a friendly outreach email for the purpose of {purpose}. Keep it professional, clear, and concise. Use a warm tone."
+    )
+    return (
+        f"Write a reusable template for {document}\n"
+        f"The position is {role}.\n"
+        f"Use exactly these placeholders where the values go: {slots}. "
+        f"Put ${{custom_touch}} on a line of its own where an optional personal paragraph fits.\n"
+        f"Do not use any other placeholders or brackets. Return only the template."
+    )
+
+
+def _problem(kind: str, template: str) -> Optional[str]:
+    """Why `template` can't be rendered for `kind`, or None if it can."""
+    # Template.pattern consumes "$$" as an escape, so "$${salary}" is not a slot.
+    found = {m.group("named") or m.group("braced") for m in Template.pattern.finditer(template)} - {None}
+    missing = [f"${{{slot}}}" for slot in SLOTS[kind] if slot not in found]
+    unknown = [f"${{{slot}}}" for slot in sorted(found - set(SLOTS[kind]))]
+    if missing:
+        return f"is missing {', '.join(missing)}"
+    if unknown:
+        return f"uses unknown placeholders {', '.join(unknown)}"
+    return None
+
+
+def _retry_prompt(prompt: str, problem: str) -> str:
+    # A different prompt, so the LLM cache doesn't hand back the rejected template.
+    return f"{prompt}\nA previous attempt was rejected because it {problem}. Fix that."
+
+
+def get_template(kind: str, role: str, purpose: str = "offer") -> str:
+    """
+    One LLM call per (kind, role, purpose); later calls are served from
+    memory. A template with missing, escaped or unknown slots is asked for
+    again, up to TEMPLATE_ATTEMPTS times, and never cached.
+    """
+    if kind not in SLOTS:
+        raise ValueError(f"Unknown template kind '{kind}', expected one of {list(SLOTS)}")
+    key = (kind, role, purpose)
+    template = _cached(key)
+    if template is not None:
+        return template
+    prompt = _template_prompt(kind, role, purpose)
+    for _ in range(TEMPLATE_ATTEMPTS):
+        template = llm.invoke([HumanMessage(content=prompt)]).content
+        problem = _problem(kind, template)
+        if problem is None:
+            return _store(key, template)
+        prompt = _retry_prompt(_template_prompt(kind, role, purpose), problem)
+    raise ValueError(f"The generated {kind} template for {role} {problem}")
+
+
+async def aget_template(kind: str, role: str, purpose: str = "offer") -> str:
+    if kind not in SLOTS:
+        raise ValueError(f"Unknown template kind '{kind}', expected one of {list(SLOTS)}")
+    key = (kind, role, purpose)
+    template = _cached(key)
+    if template is not None:
+        return template
+    prompt = _template_prompt(kind, role, purpose)
+    for _ in range(TEMPLATE_ATTEMPTS):
+        template = (await llm.ainvoke([HumanMessage(content=prompt)])).content
+        problem = _problem(kind, template)
+        if problem is None:
+            return _store(key, template)
+        prompt = _retry_prompt(_template_prompt(kind, role, purpose), problem)
+    raise ValueError(f"The generated {kind} template for {role} {problem}")
+
+
+def custom_touch(candidate_name: str, note: str, kind: str) -> str:
+    """Per-candidate LLM paragraph; only called when a note is given."""
+    prompt = (
+        f"Write one or two warm sentences for {candidate_name}'s {kind.replace('_', ' ')} "
+        f"covering this: {note}. Return only the sentences."
+    )
+    return llm.invoke([HumanMessage(content=prompt)]).content.strip()
+
+
+def render(template: str, **slots: str) -> str:
+    """Fill the slots; an empty or missing custom touch leaves no blank paragraph behind."""
+    values = {"custom_touch": "", **{key: value or "" for key, value in slots.items()}}
+    text = Template(template).safe_substitute(values)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def bulk_documents(kind: str, role: str, candidates: List[Dict[str, str]], purpose: str = "offer") -> List[str]:
+    """
+    Render one document per candidate dict (candidate_name, salary,
+    start_date, optional custom_note) from a single cached template.
+    """
+    template = get_template(kind, role, purpose)
+    documents = []
+    for candidate in candidates:
+        note = candidate.get("custom_note")
+        documents.append(render(
+            template,
+            candidate_name=candidate["candidate_name"],
+            salary=candidate.get("salary", "to be discussed"),
+            start_date=candidate.get("start_date", "to be discussed"),
+            role=role,
+            custom_touch=custom_touch(candidate["candidate_name"], note, kind) if note else "",
+        ))
+    return documents
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render offer letters or emails for a cohort of candidates.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--kind", choices=list(SLOTS), default="offer_letter")
+    parser.add_argument("--role", required=True)
+    parser.add_argument("--purpose", default="offer", help="email purpose, e.g. interview")
+    args = parser.parse_args()
+
+    with open(args.input) as f:
+        candidates = [json.loads(line) for line in f if line.strip()]
+    get_template(args.kind, args.role, args.purpose)
+    started = time.perf_counter()
+    documents = bulk_documents(args.kind, args.role, candidates, args.purpose)
+    elapsed = time.perf_counter() - started
+    with open(args.output, "w") as out:
+        for candidate, document in zip(candidates, documents):
+            out.write(json.dumps({"candidate_name": candidate["candidate_name"], "document": document}) + "\n")
+    print(f"Rendered {len(documents)} documents in {elapsed * 1000:.1f} ms "
+          f"({elapsed * 1000 / max(len(documents), 1):.3f} ms per candidate, template excluded)")
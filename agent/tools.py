@@ -1,9 +1,11 @@
-from llm_config import llm
+from llm_config import llm, get_search_model, scheduler, search_cache
 from langchain_core.tools import tool
 from langchain_core.messages import HumanMessage
-import google.generativeai as genai
-from google.generativeai import types
-from langchain.tools import tool
+from langgraph.prebuilt import InjectedState
+from typing import Annotated
+from agent.artifacts import resolve, title
+from agent.sections import edit_sections, aedit_sections, selection_prompt, parse_selection
+from agent.templates import get_template, aget_template, render
 from dotenv import load_dotenv
 import os
 
@@ -13,60 +15,185 @@ load_dotenv()
 # Get the GEMINI_KEY environment variable
 GEMINI_KEY = os.getenv("GEMINI_KEY")
 
-@tool
-def write_outreach_email(purpose: str = "interview", candidate: str = "the candidate") -> str:
-    """Use LLM to write a friendly outreach email for a specified purpose (e.g., interview, follow-up)."""
-    prompt = (
+# "sections" edits only the affected sections of long documents; "full" regenerates the whole text.
+EDIT_MODE = os.getenv("EDIT_MODE", "sections")
+# When no section matches an instruction lexically, asking the LLM which
+# sections to edit only pays off for documents at least this long; shorter
+# ones (and global instructions like "make it more formal") get a full edit.
+EDIT_SELECT_MIN_CHARS = int(os.getenv("EDIT_SELECT_MIN_CHARS", "6000"))
+
+# "template" renders emails and offer letters from one cached LLM template per
+# purpose (see agent/templates.py); "generate" writes each one from scratch.
+DOCUMENT_MODE = os.getenv("DOCUMENT_MODE", "generate")
+# Used when neither the state nor the JD names a single role.
+OFFER_ROLE = "the offered position"
+
+# Every tool has a synchronous body (used by invoke) and an async body
+# (attached as the tool's coroutine, used by ainvoke / async graphs).
+# Both share the prompt builders below.
+
+def offered_role(state: dict = None) -> str:
+    """The role emails and offer letters are for: the state's only role, else the JD's title."""
+    state = state or {}
+    roles = state.get("roles") or []
+    if len(roles) == 1:
+        return roles[0]
+    jd = state.get("artifacts", {}).get("jd", "")
+    # Several roles, or one JD joined from several (see agent.joined_jds), name no single role.
+    if len(roles) > 1 or "\n---\n" in jd:
+        return OFFER_ROLE
+    return title(jd) or OFFER_ROLE
+
+def _outreach_email_prompt(purpose: str, candidate: str) -> str:
+    return (
         f"Write a friendly outreach email to {candidate} for the purpose of {purpose}. "
         "Keep it professional, clear, and concise. Use a warm tone."
     )
-    response = llm.invoke([HumanMessage(content=prompt)])
-    return response.content
 
-@tool
-def generate_checklist(context: str) -> str:
-    """Generate a hiring checklist based on the Job description."""
-    prompt = (
+def _checklist_prompt(context: str) -> str:
+    return (
         f"Based on this Job description: {context}\n"
         f"Create a startup hiring checklist. Break it down into stages like sourcing, screening, interviewing, onboarding."
     )
-    response = llm.invoke([HumanMessage(content=prompt)])
-    return response.content
-
-@tool
-def google_web_search(query: str) -> str:
-    """
-    Tool for LangGraph agent: performs a grounded web search using Gemini 1.5 model.
-    NOTE: Real-time search grounding is implicit — ensure your API key has access.
-    """
-    model = genai.GenerativeModel(model_name="gemini-1.5-flash")
 
+def _search_prompt(query: str) -> str:
     # Prompt phrasing encourages grounding
-    prompt = f"Search the web and give a real-time answer to: {query}"
+    return f"Search the web and give a real-time answer to: {query}"
 
-    response = model.generate_content(prompt)
+def _search(query: str) -> str:
+    prompt = _search_prompt(query)
+    response = scheduler.run(lambda: get_search_model().generate_content(prompt), est_tokens=len(prompt) // 4 + 512)
     return response.text.strip()
 
-@tool
-def generate_offer_letter(candidate_name: str, salary: str) -> str:
-    """Generate a professional offer letter given a candidate's name and salary."""
-    prompt = (
+async def _asearch(query: str) -> str:
+    prompt = _search_prompt(query)
+    response = await scheduler.arun(lambda: get_search_model().generate_content_async(prompt), est_tokens=len(prompt) // 4 + 512)
+    return response.text.strip()
+
+def _offer_letter_prompt(candidate_name: str, salary: str) -> str:
+    return (
         f"Create a formal offer letter for {candidate_name} for the offered position. "
         f"The annual salary is {salary}. Include details like joining date (to be discussed), "
         f"benefits, company culture, and a welcoming tone. Format it professionally."
     )
-    response = llm.invoke([HumanMessage(content=prompt)])
-    return response.content
 
-@tool
-def edit_content(existing: str, instruction: str) -> str:
-    """Edit a piece of content (JD, email, checklist, etc.) based on user instructions."""
-    prompt = (
+def _edit_prompt(existing: str, instruction: str) -> str:
+    return (
         f"You are a professional assistant. Your job is to edit content according to recruiter needs.\n\n"
         f"Here is the existing content:\n{existing}\n\n"
         f"Here is the instruction to modify it:\n{instruction}\n\n"
         f"Update the content accordingly. Return only the updated version."
     )
-    response = llm.invoke([HumanMessage(content=prompt)])
+
+def _section_edit_prompt(section: str, instruction: str) -> str:
+    return _edit_prompt(section, instruction) + (
+        "\nThis is one section of a longer document. Return only this section, keeping its heading."
+    )
+
+def edit_document(existing: str, instruction: str, mode: str = None) -> str:
+    """Edit `existing`, touching only the affected sections when possible."""
+    if (mode or EDIT_MODE) == "sections":
+        edited = edit_sections(
+            existing,
+            instruction,
+            edit=lambda section: llm.invoke([HumanMessage(content=_section_edit_prompt(section, instruction))]).content,
+            select=(lambda sections: parse_selection(
+                llm.invoke([HumanMessage(content=selection_prompt(sections, instruction))]).content, len(sections)
+            )) if len(existing) >= EDIT_SELECT_MIN_CHARS else None,
+        )
+        if edited is not None:
+            return edited
+    return llm.invoke([HumanMessage(content=_edit_prompt(existing, instruction))]).content
+
+async def aedit_document(existing: str, instruction: str, mode: str = None) -> str:
+    """Async counterpart of edit_document."""
+    if (mode or EDIT_MODE) == "sections":
+        async def edit(section):
+            return (await llm.ainvoke([HumanMessage(content=_section_edit_prompt(section, instruction))])).content
+
+        async def select(sections):
+            response = await llm.ainvoke([HumanMessage(content=selection_prompt(sections, instruction))])
+            return parse_selection(response.content, len(sections))
+
+        large = len(existing) >= EDIT_SELECT_MIN_CHARS
+        edited = await aedit_sections(existing, instruction, edit=edit, select=select if large else None)
+        if edited is not None:
+            return edited
+    return (await llm.ainvoke([HumanMessage(content=_edit_prompt(existing, instruction))])).content
+
+@tool
+def write_outreach_email(purpose: str = "interview", candidate: str = "the candidate", state: Annotated[dict, InjectedState] = None) -> str:
+    """Use LLM to write a friendly outreach email for a specified purpose (e.g., interview, follow-up)."""
+    if DOCUMENT_MODE == "template":
+        role = offered_role(state)
+        return render(get_template("email", role, purpose), candidate_name=candidate, role=role)
+    response = llm.invoke([HumanMessage(content=_outreach_email_prompt(purpose, candidate))])
+    return response.content
+
+@tool
+def generate_checklist(context: str = "jd", state: Annotated[dict, InjectedState] = None) -> str:
+    """Generate a hiring checklist based on the Job description. Pass context="jd" to use the stored JD."""
+    context = resolve(context, (state or {}).get("artifacts", {}))
+    response = llm.invoke([HumanMessage(content=_checklist_prompt(context))])
+    return response.content
+
+@tool
+def google_web_search(query: str) -> str:
+    """
+    Tool for LangGraph agent: performs a grounded web search using Gemini 1.5 model.
+    NOTE: Real-time search grounding is implicit — ensure your API key has access.
+    """
+    return search_cache.get(query, _search)
+
+@tool
+def generate_offer_letter(candidate_name: str, salary: str, state: Annotated[dict, InjectedState] = None) -> str:
+    """Generate a professional offer letter given a candidate's name and salary."""
+    if DOCUMENT_MODE == "template":
+        role = offered_role(state)
+        return render(get_template("offer_letter", role), candidate_name=candidate_name, salary=salary,
+                      start_date="to be discussed", role=role)
+    response = llm.invoke([HumanMessage(content=_offer_letter_prompt(candidate_name, salary))])
+    return response.content
+
+@tool
+def edit_content(artifact: str, instruction: str, state: Annotated[dict, InjectedState] = None) -> str:
+    """Edit a stored artifact based on user instructions. `artifact` is its handle: jd, email, checklist or offer_letter."""
+    existing = resolve(artifact, (state or {}).get("artifacts", {}))
+    return edit_document(existing, instruction)
+
+# -------------------------------
+# Async implementations
+# -------------------------------
+
+async def awrite_outreach_email(purpose: str = "interview", candidate: str = "the candidate", state: Annotated[dict, InjectedState] = None) -> str:
+    if DOCUMENT_MODE == "template":
+        role = offered_role(state)
+        return render(await aget_template("email", role, purpose), candidate_name=candidate, role=role)
+    response = await llm.ainvoke([HumanMessage(content=_outreach_email_prompt(purpose, candidate))])
+    return response.content
+
+async def agenerate_checklist(context: str = "jd", state: Annotated[dict, InjectedState] = None) -> str:
+    context = resolve(context, (state or {}).get("artifacts", {}))
+    response = await llm.ainvoke([HumanMessage(content=_checklist_prompt(context))])
     return response.content
 
+async def agoogle_web_search(query: str) -> str:
+    return await search_cache.aget(query, _asearch)
+
+async def agenerate_offer_letter(candidate_name: str, salary: str, state: Annotated[dict, InjectedState] = None) -> str:
+    if DOCUMENT_MODE == "template":
+        role = offered_role(state)
+        return render(await aget_template("offer_letter", role), candidate_name=candidate_name, salary=salary,
+                      start_date="to be discussed", role=role)
+    response = await llm.ainvoke([HumanMessage(content=_offer_letter_prompt(candidate_name, salary))])
+    return response.content
+
+async def aedit_content(artifact: str, instruction: str, state: Annotated[dict, InjectedState] = None) -> str:
+    existing = resolve(artifact, (state or {}).get("artifacts", {}))
+    return await aedit_document(existing, instruction)
+
+write_outreach_email.coroutine = awrite_outreach_email
+generate_checklist.coroutine = agenerate_checklist
+google_web_search.coroutine = agoogle_web_search
+generate_offer_letter.coroutine = agenerate_offer_letter
+edit_content.coroutine = aedit_content
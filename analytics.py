@@ -1,28 +1,367 @@
 # analytics.py
 """
 Analytics and usage‑tracking module.
-Logs events with timestamps.
+Logs events with timestamps, and aggregates latency, queue wait, token and
+error metrics for every graph node, LLM call and tool. The metrics are
+recorded by MetricsCallbackHandler; run code inside `collect_metrics(tracker)`
+to attach it to every LangChain/LangGraph run automatically.
+
+A tracker keeps only bounded state: a ring buffer of recent events,
+incremental counters and fixed-bucket histograms. Full events go to a
+durable sink (JSONL or SQLite) through a background flusher shared by all
+sessions, so logging never waits on disk.
 """
 
+import atexit
+import bisect
+import json
+import logging
+import math
+import os
+import queue
+import sqlite3
+import threading
 import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+from langgraph.errors import GraphBubbleUp
+
+from lazy import singleton
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95, 0.99)
+# Upper bounds (seconds) of the latency histogram buckets; the last one is +Inf.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _quantile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, math.ceil(q * len(sorted_values)) - 1)] if sorted_values else 0.0
+
+
+class JSONLSink:
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, batch):
+        with open(self.path, "a") as f:
+            f.writelines(json.dumps(record, default=str) + "\n" for record in batch)
+
+
+class SQLiteSink:
+    def __init__(self, path):
+        # Only the flusher thread writes, but the connection is created on the caller's thread.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analytics_events ("
+            "ts REAL NOT NULL, session TEXT, type TEXT NOT NULL, name TEXT NOT NULL, data TEXT)"
+        )
+        self._conn.commit()
+
+    def write(self, batch):
+        self._conn.executemany(
+            "INSERT INTO analytics_events (ts, session, type, name, data) VALUES (?, ?, ?, ?, ?)",
+            [(r["ts"], r.get("session"), r["type"], r["name"], json.dumps(r.get("data"), default=str)) for r in batch],
+        )
+        self._conn.commit()
+
+
+class BackgroundFlusher:
+    """
+    Hands records to a sink from one daemon thread, in batches. submit()
+    never blocks: when the queue is full the record is dropped and counted.
+    """
+
+    def __init__(self, sink, max_queue=10_000, batch_size=500, interval=1.0):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="analytics-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self, first):
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            self.sink.write(batch)
+            self.written += len(batch)
+        except Exception:
+            logger.exception("analytics sink failed; %d records lost", len(batch))
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.interval)
+            except queue.Empty:
+                continue
+            self._drain(first)
+
+    def flush(self):
+        """Block until every submitted record has been written."""
+        self._queue.join()
+
+
+@singleton
+def default_flusher() -> Optional[BackgroundFlusher]:
+    """Process-wide flusher for ANALYTICS_SINK (sqlite, jsonl or none), shared by all sessions."""
+    kind = os.getenv("ANALYTICS_SINK", "sqlite")
+    if kind == "sqlite":
+        return BackgroundFlusher(SQLiteSink(os.getenv("ANALYTICS_PATH", "analytics.sqlite")))
+    if kind == "jsonl":
+        return BackgroundFlusher(JSONLSink(os.getenv("ANALYTICS_PATH", "analytics.jsonl")))
+    return None
+
 
 class AnalyticsTracker:
-    def __init__(self, logs=None):
+    def __init__(self, session=None, flusher=None, capacity=200, window=1000):
         """
         Parameters
         ----------
-        logs : list | None
-            Pass an existing list (e.g. st.session_state.analytics_logs)
-            so the data survives Streamlit reruns.
+        session : str | None
+            Id written with every record (e.g. the Streamlit thread id).
+        flusher : BackgroundFlusher | None
+            Where full records go; None keeps them in memory only.
+        capacity : int
+            Recent events kept for display (ring buffer).
+        window : int
+            Latest durations kept per metric for the rolling percentiles.
         """
-        self.logs = logs if logs is not None else []
+        self.session = session
+        self.flusher = flusher
+        self.window = window
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=capacity)
+        self._events = Counter()
+        self._durations = defaultdict(lambda: deque(maxlen=window))
+        self._totals = defaultdict(lambda: defaultdict(float))
+        self._buckets = defaultdict(lambda: [0] * (len(BUCKETS) + 1))
+
+    def _submit(self, type_, name, data):
+        if self.flusher is not None:
+            self.flusher.submit({"ts": time.time(), "session": self.session, "type": type_, "name": name, "data": data})
 
     def log_event(self, event_name, details=None):
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-        entry = {"timestamp": timestamp, "event": event_name, "details": details}
-        self.logs.append(entry)
-        # still print to server log for debugging
-        print(f"[Analytics] {timestamp} – {event_name}: {details}")
+        now = time.time()
+        with self._lock:
+            self._recent.append((now, event_name, details))
+            self._events[event_name] += 1
+        if self.flusher is not None:
+            self.flusher.submit({"ts": now, "session": self.session, "type": "event", "name": event_name, "data": details})
+        logger.debug("%s: %s", event_name, details)
 
     def get_logs(self):
-        return self.logs
+        """The most recent events (at most `capacity`), oldest first."""
+        with self._lock:
+            recent = list(self._recent)
+        return [
+            {"timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts)), "event": name, "details": details}
+            for ts, name, details in recent
+        ]
+
+    def event_counts(self):
+        with self._lock:
+            return dict(self._events)
+
+    def record(self, kind, name, seconds, error=False, cache_hit=False, queue_wait=0.0, prompt_tokens=0, completion_tokens=0):
+        """Add one timed run of a node, LLM call or tool (`kind`) named `name`."""
+        key = (kind, name)
+        with self._lock:
+            self._durations[key].append(seconds)
+            self._buckets[key][bisect.bisect_left(BUCKETS, seconds)] += 1
+            totals = self._totals[key]
+            totals["count"] += 1
+            totals["seconds"] += seconds
+            totals["errors"] += bool(error)
+            totals["cache_hits"] += bool(cache_hit)
+            totals["queue_wait"] += queue_wait
+            totals["prompt_tokens"] += prompt_tokens
+            totals["completion_tokens"] += completion_tokens
+        self._submit(kind, name, {
+            "seconds": round(seconds, 6), "error": error, "cache_hit": cache_hit, "queue_wait": round(queue_wait, 6),
+            "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+        })
+
+    def _snapshot(self):
+        with self._lock:
+            return {
+                key: (sorted(values), dict(self._totals[key]), list(self._buckets[key]))
+                for key, values in self._durations.items()
+            }
+
+    def metrics(self):
+        """Per "kind:name" totals plus rolling p50/p95/p99 latency in seconds."""
+        result = {}
+        for (kind, name), (values, totals, _) in sorted(self._snapshot().items()):
+            entry = {"count": int(totals["count"]), "errors": int(totals["errors"]), "cache_hits": int(totals["cache_hits"])}
+            entry.update({f"p{int(q * 100)}": round(_quantile(values, q), 4) for q in QUANTILES})
+            entry["queue_wait_mean"] = round(totals["queue_wait"] / totals["count"], 4)
+            entry["prompt_tokens"] = int(totals["prompt_tokens"])
+            entry["completion_tokens"] = int(totals["completion_tokens"])
+            result[f"{kind}:{name}"] = entry
+        return result
+
+    def summary(self):
+        """Compact aggregates for display: event counts, run totals and the sink's state."""
+        runs = self.metrics()
+        return {
+            "events": self.event_counts(),
+            "runs": sum(m["count"] for m in runs.values()),
+            "errors": sum(m["errors"] for m in runs.values()),
+            "llm_cache_hits": sum(m["cache_hits"] for k, m in runs.items() if k.startswith("llm:")),
+            "tokens": sum(m["prompt_tokens"] + m["completion_tokens"] for m in runs.values()),
+            "sink": {"written": self.flusher.written, "dropped": self.flusher.dropped} if self.flusher else None,
+        }
+
+    def prometheus(self, prefix="hiring_assistant"):
+        """The metrics in the Prometheus text exposition format."""
+        snapshot = sorted(self._snapshot().items())
+        lines = [
+            f"# HELP {prefix}_latency_seconds Wall time of graph nodes, LLM calls and tools (rolling quantiles).",
+            f"# TYPE {prefix}_latency_seconds summary",
+        ]
+        counters = []
+        for (kind, name), (values, totals, _) in snapshot:
+            labels = f'kind="{kind}",name="{_escape(name)}"'
+            lines += [f'{prefix}_latency_seconds{{{labels},quantile="{q}"}} {_quantile(values, q):.6f}' for q in QUANTILES]
+            lines.append(f"{prefix}_latency_seconds_sum{{{labels}}} {totals['seconds']:.6f}")
+            lines.append(f"{prefix}_latency_seconds_count{{{labels}}} {int(totals['count'])}")
+            counters += [
+                (f"{prefix}_errors_total", labels, int(totals["errors"])),
+                (f"{prefix}_cache_hits_total", labels, int(totals["cache_hits"])),
+                (f"{prefix}_queue_wait_seconds_total", labels, round(totals["queue_wait"], 6)),
+                (f"{prefix}_tokens_total", labels + ',type="prompt"', int(totals["prompt_tokens"])),
+                (f"{prefix}_tokens_total", labels + ',type="completion"', int(totals["completion_tokens"])),
+            ]
+        lines.append(f"# TYPE {prefix}_run_duration_seconds histogram")
+        for (kind, name), (_, totals, buckets) in snapshot:
+            labels = f'kind="{kind}",name="{_escape(name)}"'
+            cumulative = 0
+            for bound, count in zip(list(BUCKETS) + ["+Inf"], buckets):
+                cumulative += count
+                lines.append(f'{prefix}_run_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{prefix}_run_duration_seconds_sum{{{labels}}} {totals['seconds']:.6f}")
+            lines.append(f"{prefix}_run_duration_seconds_count{{{labels}}} {int(totals['count'])}")
+        for metric in dict.fromkeys(m for m, _, _ in counters):
+            lines.append(f"# TYPE {metric} counter")
+            lines += [f"{m}{{{labels}}} {value}" for m, labels, value in counters if m == metric]
+        events = self.event_counts()
+        if events:
+            lines.append(f"# TYPE {prefix}_events_total counter")
+            lines += [f'{prefix}_events_total{{event="{_escape(e)}"}} {n}' for e, n in sorted(events.items())]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Times every graph node, chat-model call and tool run and records it in
+    an AnalyticsTracker, with token usage, cache hits, scheduler queue wait
+    and failures. LLM calls are labelled with the graph node (or run name)
+    they were made from, e.g. "llm:initial" or "llm:tool_selection".
+    """
+
+    def __init__(self, tracker: AnalyticsTracker):
+        self.tracker = tracker
+        self._runs = {}  # run_id -> (kind, name, started)
+
+    def _start(self, run_id, kind, name):
+        self._runs[run_id] = (kind, name, time.perf_counter())
+
+    def _end(self, run_id, error=False, **fields):
+        run = self._runs.pop(run_id, None)
+        if run is not None:
+            kind, name, started = run
+            self.tracker.record(kind, name, time.perf_counter() - started, error=error, **fields)
+
+    # graph nodes: LangGraph runs each node as a chain named after it
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, name=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if node and name == node:
+            self._start(run_id, "node", node)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        if isinstance(error, GraphBubbleUp):
+            # interrupt() pausing for the recruiter (or a Command to the parent graph) is not a failure.
+            self._runs.pop(run_id, None)
+            return
+        self._end(run_id, error=True)
+
+    # LLM calls
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, name=None, **kwargs):
+        self._start(run_id, "llm", (metadata or {}).get("langgraph_node") or name or "app")
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        generation = response.generations[0][0] if response.generations and response.generations[0] else None
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+        cache_hit = bool(generation and (generation.generation_info or {}).get("cache_hit"))
+        self._end(
+            run_id,
+            cache_hit=cache_hit,
+            queue_wait=(response.llm_output or {}).get("queue_wait", 0.0),
+            prompt_tokens=0 if cache_hit else usage.get("input_tokens", 0),
+            completion_tokens=0 if cache_hit else usage.get("output_tokens", 0),
+        )
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=True)
+
+    # tools
+    def on_tool_start(self, serialized, input_str, *, run_id, name=None, **kwargs):
+        self._start(run_id, "tool", name or (serialized or {}).get("name", "tool"))
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=True)
+
+
+_metrics_handler: ContextVar[Optional[MetricsCallbackHandler]] = ContextVar("metrics_handler", default=None)
+register_configure_hook(_metrics_handler, inheritable=True)
+
+
+def track_metrics(tracker: AnalyticsTracker):
+    """
+    Record metrics of every run started later in the current context into
+    `tracker`. Meant for scripts such as the Streamlit app, which set it
+    once at the top of each rerun; elsewhere prefer collect_metrics().
+    """
+    _metrics_handler.set(MetricsCallbackHandler(tracker))
+
+
+@contextmanager
+def collect_metrics(tracker: AnalyticsTracker):
+    """Record metrics of every LangChain/LangGraph run started inside this block into `tracker`."""
+    token = _metrics_handler.set(MetricsCallbackHandler(tracker))
+    try:
+        yield
+    finally:
+        _metrics_handler.reset(token)
@@ -0,0 +1,178 @@
+# api.py
+"""
+HTTP API for the recruiting workflow, so the graphs run in server workers
+instead of inside the Streamlit script. Every worker process shares the
+SQLite checkpointer, LLM cache and session store, so any worker can serve
+any thread_id and workers can be added to scale out; questions and JDs
+stored by one worker are found by the others on their next lookup.
+
+    python -m api --workers 4                # or: uvicorn api:app --workers 4
+    HIRING_API_URL=http://localhost:8000 streamlit run app.py
+
+Endpoints
+  POST /questions        {request, thread_id?}  roles and clarification questions, or
+                         the JD right away when the request is detailed enough ("express")
+  POST /job-description  {thread_id, clarifications?, role_clarifications?, role?, regenerate?}
+  POST /followup         {thread_id, message, regenerate?}  run one follow-up tool
+  GET  /sessions/{thread_id}, GET /stats, GET /metrics (Prometheus), GET /health
+"""
+
+import argparse
+import os
+import uuid
+from contextlib import asynccontextmanager, nullcontext
+from typing import Dict, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+
+from agent.agent import arun_from_clarification, arun_role_to_questions, get_question_bank, is_express, job_description_text
+from agent.followup import arun_followup
+from agent.sessions import SessionStore, empty_session
+from analytics import AnalyticsTracker, collect_metrics, default_flusher
+from llm_cache import bypass_cache
+from llm_config import llm, llm_cache, scheduler, search_cache
+from model_router import ModelRouter
+from scheduler import lane
+
+idle_ttl = os.getenv("SESSION_IDLE_TTL", str(7 * 24 * 3600))
+sessions = SessionStore(path=os.getenv("SESSION_DB", "sessions.sqlite"), idle_ttl=float(idle_ttl) if idle_ttl else None)
+
+# One tracker per worker process; its events go to the shared analytics sink.
+analytics = AnalyticsTracker(session=f"api-{os.getpid()}", flusher=default_flusher())
+
+
+
+# SessionStore calls block on SQLite, so the endpoints run them in the thread pool.
+@asynccontextmanager
+async def lifespan(app):
+    await run_in_threadpool(sessions.prune_idle)
+    yield
+
+
+app = FastAPI(title="Agentic AI Hiring Assistant", lifespan=lifespan)
+
+
+class QuestionsRequest(BaseModel):
+    request: str
+    thread_id: Optional[str] = None
+
+
+class JobDescriptionRequest(BaseModel):
+    thread_id: str
+    clarifications: str = ""
+    role_clarifications: Optional[Dict[str, str]] = None
+    role: Optional[str] = None
+    regenerate: bool = False
+
+
+class FollowupRequest(BaseModel):
+    thread_id: str
+    message: str
+    regenerate: bool = False
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "pid": os.getpid()}
+
+
+@app.post("/questions")
+async def questions(body: QuestionsRequest):
+    thread_id = body.thread_id or str(uuid.uuid4())
+    analytics.log_event("role_submitted", {"role": body.request})
+    with collect_metrics(analytics), lane("interactive"):
+        state = await arun_role_to_questions(body.request, thread_id=thread_id)
+    roles = state.get("roles", [])
+    express = is_express(state)
+    jd = job_description_text(state) if express else ""
+    if express:
+        analytics.log_event("jd_generated")
+    # A new request starts a new hiring round: earlier artifacts are dropped.
+    session = await run_in_threadpool(
+        sessions.update,
+        thread_id,
+        request=body.request,
+        roles=roles,
+        role_questions={} if express else {role: state.get("role_questions", {}).get(role, []) for role in roles},
+        clarification_questions=state.get("clarification_questions", []),
+        artifacts={**empty_session()["artifacts"], "jd": jd},
+    )
+    return {"thread_id": thread_id, "express": express, **session}
+
+
+@app.post("/job-description")
+async def job_description(body: JobDescriptionRequest):
+    session = await run_in_threadpool(sessions.get, body.thread_id)
+    role = body.role or (session or {}).get("request", "")
+    if not role and not body.role_clarifications:
+        raise HTTPException(404, f"Unknown thread_id {body.thread_id!r}; call /questions first or pass a role")
+    clarifications = body.clarifications or "\n".join((body.role_clarifications or {}).values())
+    with collect_metrics(analytics), lane("interactive"), bypass_cache() if body.regenerate else nullcontext():
+        state = await arun_from_clarification(clarifications, role, body.thread_id, role_clarifications=body.role_clarifications)
+    jd = job_description_text(state)
+    analytics.log_event("jd_generated")
+    # The new JD makes the documents derived from the old one stale.
+    await run_in_threadpool(sessions.update, body.thread_id, artifacts={**empty_session()["artifacts"], "jd": jd})
+    return {"thread_id": body.thread_id, "jd": jd, "job_descriptions": state.get("job_descriptions", {})}
+
+
+@app.post("/followup")
+async def followup(body: FollowupRequest):
+    session = await run_in_threadpool(sessions.get, body.thread_id)
+    if not session or not session["artifacts"].get("jd"):
+        raise HTTPException(409, "Generate a job description for this thread_id first")
+    analytics.log_event("followup_submitted", {"text": body.message})
+    artifacts = dict(session["artifacts"])
+    with collect_metrics(analytics), lane("interactive"), bypass_cache() if body.regenerate else nullcontext():
+        result = await arun_followup(body.message, artifacts)
+    if result["tool"]:
+        analytics.log_event("tool_called", {"tool": result["tool"]})
+    if result["artifact"]:
+        session = await run_in_threadpool(sessions.put_artifact, body.thread_id, result["artifact"], result["output"])
+        artifacts = session["artifacts"]
+    return {"thread_id": body.thread_id, **result, "artifacts": artifacts}
+
+
+@app.get("/sessions/{thread_id}")
+async def get_session(thread_id: str):
+    session = await run_in_threadpool(sessions.get, thread_id)
+    if session is None:
+        raise HTTPException(404, f"Unknown thread_id {thread_id!r}")
+    return {"thread_id": thread_id, **session}
+
+
+@app.get("/stats")
+async def stats():
+    """Stats of this worker (each worker keeps its own counters)."""
+    return {
+        "pid": os.getpid(),
+        "llm_cache": llm_cache.stats(),
+        "question_bank": get_question_bank().stats(),
+        "search_cache": search_cache.stats(),
+        "scheduler": scheduler.metrics(),
+        "sessions": await run_in_threadpool(sessions.stats),
+        "model_router": llm.model.stats() if isinstance(llm.model, ModelRouter) else None,
+        "latency": analytics.metrics(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return analytics.prometheus()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the hiring workflow over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.workers > 1 and os.getenv("CHECKPOINTER") == "memory":
+        parser.error("CHECKPOINTER=memory cannot be shared by several workers; use the SQLite checkpointer")
+    uvicorn.run("api:app", host=args.host, port=args.port, workers=args.workers)
@@ -0,0 +1,58 @@
+# api_client.py
+"""
+Minimal client for the HTTP API in api.py (standard library only), used by
+the Streamlit app when HIRING_API_URL is set.
+"""
+
+import json
+import urllib.error
+import urllib.request
+from typing import Dict, Optional
+
+
+class APIError(RuntimeError):
+    def __init__(self, status, detail):
+        super().__init__(f"API error {status}: {detail}")
+        self.status = status
+        self.detail = detail
+
+
+class HiringClient:
+    def __init__(self, base_url: str, timeout: float = 300.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _call(self, method, path, payload=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            self.base_url + path, data=data, method=method, headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            body = e.read().decode("utf-8", "replace")
+            try:
+                body = json.loads(body).get("detail", body)
+            except ValueError:
+                pass
+            raise APIError(e.code, body) from None
+
+    def questions(self, request: str, thread_id: Optional[str] = None) -> dict:
+        return self._call("POST", "/questions", {"request": request, "thread_id": thread_id})
+
+    def job_description(self, thread_id: str, clarifications: str = "", role_clarifications: Dict[str, str] = None,
+                        role: str = None, regenerate: bool = False) -> dict:
+        return self._call("POST", "/job-description", {
+            "thread_id": thread_id, "clarifications": clarifications, "role_clarifications": role_clarifications,
+            "role": role, "regenerate": regenerate,
+        })
+
+    def followup(self, thread_id: str, message: str, regenerate: bool = False) -> dict:
+        return self._call("POST", "/followup", {"thread_id": thread_id, "message": message, "regenerate": regenerate})
+
+    def session(self, thread_id: str) -> dict:
+        return self._call("GET", f"/sessions/{thread_id}")
+
+    def stats(self) -> dict:
+        return self._call("GET", "/stats")
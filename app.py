@@ -1,14 +1,28 @@
 # app.py
 import streamlit as st
-from llm_config import llm
-from agent.agent import run_role_to_questions, run_from_clarification
-from analytics import AnalyticsTracker
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, SystemMessage
-from agent.tools import write_outreach_email, generate_checklist, google_web_search, generate_offer_letter, edit_content
-from langgraph.prebuilt import ToolNode
-from agent.agent import memory
+from llm_config import llm, llm_cache, scheduler, search_cache
+from scheduler import lane
+from model_router import ModelRouter
+from llm_cache import bypass_cache
+from contextlib import nullcontext
+from agent.agent import run_role_to_questions, run_from_clarification, stream_from_clarification, stream_tool_call, job_description_text, is_express
+from analytics import AnalyticsTracker, default_flusher, track_metrics
+from agent.tools import generate_checklist, google_web_search
+from agent.agent import get_tool_graph, get_question_bank
+from agent.artifacts import HANDLES as ARTIFACT_TITLES
+from agent.followup import select_tool, store_output, tool_input, tool_output
+from agent.router import routed_locally
+from agent.sections import section_diff
+from agent.speculative import SpeculativeExecutor
+from api_client import HiringClient
+import os
 import uuid
 
+# With HIRING_API_URL set, the workflow runs on the API server (api.py) and
+# this script only renders it; otherwise the graphs run in this process.
+API_URL = os.getenv("HIRING_API_URL")
+api = HiringClient(API_URL) if API_URL else None
+
 if "thread_id" not in st.session_state:
     st.session_state.thread_id = str(uuid.uuid4())  # Unique ID for the session
 
@@ -17,12 +31,12 @@ if "thread_id" not in st.session_state:
 # -------------------------------
 if "conversation" not in st.session_state:
     st.session_state.conversation = []
-if "analytics_logs" not in st.session_state:
-    st.session_state.analytics_logs = []
 if "recruiter_info" not in st.session_state:
     st.session_state.recruiter_info = {}
 if "clarification_questions" not in st.session_state:
     st.session_state.clarification_questions = []
+if "role_questions" not in st.session_state:
+    st.session_state.role_questions = {}
 if "clarification_answers" not in st.session_state:
     st.session_state.clarification_answers = {}
 if "latest_tool_output" not in st.session_state:
@@ -36,34 +50,26 @@ if "generated" not in st.session_state:
         "offer_letter": "" # Offer letter
     }
 
-if "analytics_logs" not in st.session_state:
-    st.session_state.analytics_logs = []
+# Precomputed follow-ups (salary search, checklist) for this session
+if "speculator" not in st.session_state:
+    st.session_state.speculator = SpeculativeExecutor(max_tasks=int(os.getenv("SPECULATIVE_MAX_TASKS", "4")))
 
 if "analytics" not in st.session_state:
-    from analytics import AnalyticsTracker
-    st.session_state.analytics = AnalyticsTracker(st.session_state.analytics_logs)
+    # Bounded in-session state; full events are written to the shared sink in the background.
+    st.session_state.analytics = AnalyticsTracker(session=st.session_state.thread_id, flusher=default_flusher())
 
 analytics: AnalyticsTracker = st.session_state.analytics
+# Every graph node, LLM call and tool run of this rerun is timed into the tracker.
+track_metrics(analytics)
 
 # -------------------------------
 # Tool Setup
 # -------------------------------
 
-tool_enabled_llm = llm.bind_tools([
-    write_outreach_email,
-    generate_checklist,
-    google_web_search,
-    generate_offer_letter,
-    edit_content
-])
-
-tool_node = ToolNode(tools=[
-    write_outreach_email,
-    generate_checklist,
-    google_web_search,
-    generate_offer_letter,
-    edit_content
-])
+# Both run in this process, so they are off when the API server does the work.
+stream_responses = st.sidebar.toggle("Stream responses", value=not api, disabled=bool(api))
+speculate = st.sidebar.toggle("Precompute likely follow-ups", value=not api and os.getenv("SPECULATIVE", "0") == "1", disabled=bool(api))
+speculator: SpeculativeExecutor = st.session_state.speculator
 
 # -------------------------------
 # Header
@@ -87,14 +93,39 @@ with st.form("role_form"):
 
 if submit_role and role_input:
     analytics.log_event("role_submitted", {"role": role_input})
-    result_state = run_role_to_questions(role_input, thread_id=st.session_state.thread_id)
-    st.session_state.conversation.extend([msg.content for msg in result_state["messages"]])
+    if api:
+        result = api.questions(role_input, thread_id=st.session_state.thread_id)
+        jd_text = result["artifacts"]["jd"]
+    else:
+        result_state = run_role_to_questions(role_input, thread_id=st.session_state.thread_id)
+        st.session_state.conversation.extend([msg.content for msg in result_state["messages"]])
+        # A request that already states skills, level, location and budget
+        # gets its JD in the same pass, without clarification questions.
+        express = is_express(result_state)
+        jd_text = job_description_text(result_state) if express else ""
+        result = {
+            "clarification_questions": result_state.get("clarification_questions", []),
+            "role_questions": {} if express else {
+                role: result_state.get("role_questions", {}).get(role, []) for role in result_state.get("roles", [])
+            },
+        }
     st.session_state.recruiter_info = {"role": role_input}
-    st.session_state.clarification_questions = result_state.get("clarification_questions", [])
+    st.session_state.clarification_questions = result["clarification_questions"]
+    st.session_state.role_questions = result["role_questions"]
     st.session_state.clarification_answers = {}
-    st.session_state.generated["jd"] = ""
     # reset generated store except role specific JD which will be generated later
     st.session_state.generated = {k: "" for k in st.session_state.generated}
+    st.session_state.generated["jd"] = jd_text
+
+    # Results for the previous role are stale; search salaries for the new roles
+    # while the recruiter answers the questions.
+    speculator.discard()
+    if jd_text:
+        analytics.log_event("jd_generated")
+        if speculate:
+            speculator.precompute_checklist(jd_text, lambda jd: generate_checklist.invoke({"context": jd}))
+    elif speculate:
+        speculator.prewarm_searches(list(st.session_state.role_questions), lambda q: google_web_search.invoke({"query": q}))
 
 # -------------------------------
 # Step 2: Clarification
@@ -106,26 +137,43 @@ if st.session_state.clarification_questions:
     clarification_inputs = {}
 
     with st.form("clarification_form"):
-        for q in st.session_state.clarification_questions:
-            clarification_inputs[q] = st.text_input(label=q, key=f"input_{q}")
+        for role, questions in st.session_state.role_questions.items():
+            if len(st.session_state.role_questions) > 1:
+                st.markdown(f"**{role}**")
+            clarification_inputs[role] = {q: st.text_input(label=q, key=f"input_{role}_{i}") for i, q in enumerate(questions)}
+        regenerate_jd = st.checkbox("Regenerate (skip cached response)", key="regenerate_jd")
         generate_jd = st.form_submit_button("Generate Job Description")
 
     if generate_jd:
         st.session_state.clarification_answers = clarification_inputs
-        user_responses = "\n".join(f"{q}: {clarification_inputs[q]}" for q in st.session_state.clarification_questions)
+        role_responses = {
+            role: "\n".join(f"{q}: {a}" for q, a in answers.items()) for role, answers in clarification_inputs.items()
+        }
+        user_responses = "\n".join(role_responses.values())
 
         try:
-            result_state = run_from_clarification(user_responses, st.session_state.recruiter_info.get("role", ""), thread_id=st.session_state.thread_id)
-            ai_messages = [msg.content for msg in result_state["messages"] if isinstance(msg, AIMessage)]
-
-            if len(ai_messages) >= 2 and "Final Recruiting Plan" in ai_messages[-1]:
-                ai_messages = ai_messages[:-1]
-
-            jd_text = next((msg for msg in ai_messages if "Job Description" in msg or "##" in msg), ai_messages[0])
+            role = st.session_state.recruiter_info.get("role", "")
+            if api:
+                jd_text = api.job_description(
+                    st.session_state.thread_id, user_responses, role_responses, role=role, regenerate=regenerate_jd
+                )["jd"]
+            else:
+                with bypass_cache() if regenerate_jd else nullcontext():
+                    if stream_responses:
+                        # Tokens are shown live, then replaced by the stored JD below.
+                        result_state = {}
+                        live = st.empty()
+                        with live.container():
+                            st.write_stream(stream_from_clarification(user_responses, role, st.session_state.thread_id, result_state, role_responses))
+                        live.empty()
+                    else:
+                        result_state = run_from_clarification(user_responses, role, thread_id=st.session_state.thread_id, role_clarifications=role_responses)
+                jd_text = job_description_text(result_state)
 
             st.session_state.generated["jd"] = jd_text  # save JD for future edits
             analytics.log_event("jd_generated")
-
+            if speculate:
+                speculator.precompute_checklist(jd_text, lambda jd: generate_checklist.invoke({"context": jd}))
         except Exception as e:
             st.error(f"Something went wrong: {e}")
 
@@ -141,89 +189,59 @@ if st.session_state.generated["jd"]:
 
     with st.form("followup_form"):
         user_followup = st.text_input("Your request:", key="followup_input")
+        regenerate_followup = st.checkbox("Regenerate (skip cached response)", key="regenerate_followup")
         submit_followup = st.form_submit_button("Send")
 
     if submit_followup and user_followup:
         analytics.log_event("followup_submitted", {"text": user_followup})
         print("User follow-up:", user_followup)
 
-        # give the LLM the latest artifacts so it can choose what to edit
-        system_prompt = f"""
-            Here are the current artifacts you can reference or edit.
-
-            [jd] Job Description:
-            {st.session_state.generated['jd']}
-
-            [email] Outreach Email:
-            {st.session_state.generated['email']}
-
-            [checklist] Hiring Checklist:
-            {st.session_state.generated['checklist']}
-
-            [offer_letter] Offer Letter:
-            {st.session_state.generated['offer_letter']}
-
-            • When the user wants to *change* one of these, call the tool **edit_content** with:
-                - existing: the exact text of the item being edited
-                - instruction: the user's request
-            • Otherwise, call the appropriate generation tool.
-            """
-
-        ai_msg = tool_enabled_llm.invoke([
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_followup)
-        ])
-
-        # print("AIMessage content:", ai_msg)
-        # print("Tool Calls:", getattr(ai_msg, "tool_calls", None))
-        tool_calls = getattr(ai_msg, "tool_calls", None)
-        tool_name = None
-        if tool_calls:
-            tool_name = tool_calls[0]['name']
-            analytics.log_event("tool_called", {"tool": tool_name})
-
-
-        input_state = {
-            "messages": [ai_msg],
-            "recruiter_info": {"Job_Description": st.session_state.generated["jd"]},
-        }
-        # Attach chat history only if editing content
-        # if tool_name == "edit_content":
-        #     input_state["history"] = memory.get_history()
-
-
-        result = tool_node.invoke(input_state)
-        # print("ToolNode result:", result)
-
-        tool_response = next(
-            (msg.content for msg in result["messages"] if isinstance(msg, ToolMessage)),
-            ai_msg.content
-        )
-
-        # Update generated store based on which tool was invoked
-        if tool_name == "write_outreach_email":
-            st.session_state.generated["email"] = tool_response
-            st.subheader("Email")
-        elif tool_name == "generate_checklist":
-            st.session_state.generated["checklist"] = tool_response
-            st.subheader("Checklist")
-        elif tool_name == "generate_offer_letter":
-            st.session_state.generated["offer_letter"] = tool_response
-            st.subheader("Letter")
-        elif tool_name == "edit_content":
-            lower_req = user_followup.lower()
-            if "job description" in lower_req or "jd" in lower_req:
-                st.session_state.generated["jd"] = tool_response
-                st.subheader("Edited Job Description")
-            elif "email" in lower_req:
-                st.session_state.generated["email"] = tool_response
-                st.subheader("Edited Email")
-            elif "checklist" in lower_req:
-                st.session_state.generated["checklist"] = tool_response
-                st.subheader("Edited Checklist")
-            elif "offer" in lower_req:
-                st.session_state.generated["offer_letter"] = tool_response
-                st.subheader("Edited Offer Letter")
+        if api:
+            # The server picks and runs the tool, and stores the new artifact.
+            reply = api.followup(st.session_state.thread_id, user_followup, regenerate=regenerate_followup)
+            tool_name, handle, tool_response, previous = reply["tool"], reply["artifact"], reply["output"], reply["previous"]
+            st.session_state.generated = reply["artifacts"]
+        else:
+            with bypass_cache() if regenerate_followup else nullcontext(), lane("interactive"):
+                ai_msg = select_tool(user_followup, st.session_state.generated)
+            tool_calls = ai_msg.tool_calls
+            tool_name = tool_calls[0]["name"] if tool_calls else None
+            if tool_name:
+                if routed_locally(ai_msg):
+                    analytics.log_event("tool_routed_locally", {"tool": tool_name})
+                analytics.log_event("tool_called", {"tool": tool_name})
+
+            # A follow-up that was speculated on is answered from the precomputed result.
+            precomputed = speculator.lookup(tool_calls[0], st.session_state.generated) if tool_calls and not regenerate_followup else None
+            if precomputed is not None:
+                analytics.log_event("speculation_hit", {"tool": tool_name})
+                tool_response = precomputed
+            elif tool_calls:
+                input_state = tool_input(ai_msg, st.session_state.generated)
+                with bypass_cache() if regenerate_followup else nullcontext(), lane("interactive"):
+                    if stream_responses:
+                        result = {}
+                        live = st.empty()
+                        with live.container():
+                            st.write_stream(stream_tool_call(input_state, result))
+                        live.empty()
+                    else:
+                        result = get_tool_graph().invoke(input_state)
+                tool_response = tool_output(result, ai_msg)
+            else:
+                tool_response = ai_msg.content
+
+            # An edit names the artifact it changed, so exactly that one is overwritten.
+            stored = store_output(tool_calls[0] if tool_calls else None, tool_response, st.session_state.generated)
+            handle, previous = stored["artifact"], stored["previous"]
+
+        if handle:
+            if tool_name == "edit_content":
+                st.subheader(f"Edited {ARTIFACT_TITLES[handle]}")
+                with st.expander("Show changes"):
+                    st.code(section_diff(previous, tool_response) or "No changes.", language="diff")
+            else:
+                st.subheader(ARTIFACT_TITLES[handle])
 
         # Manually log tool result into memory so edit_content can access it later
         # memory.add_message(tool_response)
@@ -231,4 +249,23 @@ if st.session_state.generated["jd"]:
         st.markdown(tool_response)
 
 st.sidebar.header("Usage Analytics")
-st.sidebar.json(analytics.get_logs()) 
\ No newline at end of file
+st.sidebar.caption("LLM response cache")
+st.sidebar.json(llm_cache.stats())
+st.sidebar.caption("Clarification question bank")
+st.sidebar.json(get_question_bank().stats())
+st.sidebar.caption("Speculative precompute")
+st.sidebar.json(speculator.stats())
+st.sidebar.caption("Web search cache")
+st.sidebar.json(search_cache.stats())
+st.sidebar.caption("Gemini request scheduler")
+st.sidebar.json(scheduler.metrics())
+if isinstance(llm.model, ModelRouter):  # set once the first request has built the model
+    st.sidebar.caption("Model routing (hedges and fallbacks)")
+    st.sidebar.json(llm.model.stats(), expanded=False)
+st.sidebar.caption("Latency by node, LLM call and tool (seconds)")
+st.sidebar.json(analytics.metrics(), expanded=False)
+st.sidebar.download_button("Export metrics (Prometheus)", analytics.prometheus(), file_name="metrics.prom")
+st.sidebar.caption("Session summary")
+st.sidebar.json(analytics.summary())
+with st.sidebar.expander("Recent events"):
+    st.json(analytics.get_logs()[-20:]) 
\ No newline at end of file
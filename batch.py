@@ -0,0 +1,180 @@
+# batch.py
+"""
+Bulk processing of hiring requests from a JSONL file.
+
+Each input line is a JSON object such as
+    {"id": "acme-1", "request": "I need to hire a data scientist",
+     "clarifications": "Skills: Python, SQL\\nLocation: Remote"}
+"clarifications" may be text or a {question: answer} object. For a
+multi-role request use "role_clarifications": {role: answers} instead, to
+generate one JD per role. Rows with neither only get their clarification
+questions generated, unless the request itself states skills, level,
+location and budget: then its JDs are written directly. "role" optionally
+overrides the role passed to the JD prompt.
+
+Rows are processed concurrently by a bounded worker pool in the scheduler's
+bulk lane. Results are appended to the output JSONL as each row finishes;
+re-running the same command skips rows that already succeeded, so a crashed
+run resumes where it stopped.
+
+Usage:
+    python batch.py requests.jsonl results.jsonl --workers 8
+    python batch.py requests.jsonl results.jsonl --fake   # stub LLM, reproducible throughput
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+def load_rows(path):
+    with open(path) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    for i, row in enumerate(rows):
+        row.setdefault("id", str(i))
+    return rows
+
+
+def finished_ids(path):
+    """Ids already written successfully to the output file."""
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash
+            if not record.get("error"):
+                done.add(str(record["id"]))
+    return done
+
+
+def thread_namespace(input_path):
+    """
+    Prefix of the rows' thread ids. Checkpoints persist, and default row ids
+    ("0", "1", ...) repeat across files, so threads are scoped to the input.
+    """
+    return "batch-" + hashlib.sha256(os.path.abspath(input_path).encode("utf-8")).hexdigest()[:12]
+
+
+def process_row(row, namespace="batch"):
+    from agent.agent import JD_ERROR, is_express, job_description_text, run_from_clarification, run_role_to_questions
+    from scheduler import lane
+
+    thread_id = f"{namespace}-{row['id']}"
+    request = row.get("request") or row.get("role", "")
+    clarifications, per_role = row.get("clarifications"), row.get("role_clarifications")
+    with lane("bulk"):
+        if not clarifications and not per_role:
+            state = run_role_to_questions(request, thread_id=thread_id)
+            roles = state.get("roles", [])
+            if not is_express(state):
+                # role_questions is merged across runs of the thread; keep this run's roles.
+                return {"roles": roles, "questions": {role: state.get("role_questions", {}).get(role, []) for role in roles}}
+        else:
+            if per_role:
+                role_clarifications = {role: _answers(a) for role, a in per_role.items()}
+                text = "\n".join(role_clarifications.values())
+            else:
+                role_clarifications, text = None, _answers(clarifications)
+            state = run_from_clarification(text, row.get("role") or request, thread_id, role_clarifications=role_clarifications)
+            roles = list(role_clarifications or [row.get("role") or request])
+    job_descriptions = {role: state.get("job_descriptions", {}).get(role, "") for role in roles}
+    # A failed generation must be an error, so a resumed run retries the row.
+    failed = [role for role, jd in job_descriptions.items() if not jd or jd == JD_ERROR]
+    if failed:
+        raise RuntimeError(f"job description generation failed for {', '.join(failed)}")
+    return {"job_descriptions": job_descriptions, "jd": job_description_text(state)}
+
+
+def _answers(value):
+    """Answers may be given as text or as a {question: answer} object."""
+    return "\n".join(f"{q}: {a}" for q, a in value.items()) if isinstance(value, dict) else str(value)
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def use_fake_llm(latency):
+    """
+    Swap the Gemini model behind llm_config.llm and the web search for the
+    deterministic stubs, keep the question bank and JD index in memory and
+    checkpoint to a temporary database, so stub output never lands in the
+    real ones. Call before agent.agent is imported.
+    """
+    os.environ["QUESTION_BANK_PATH"] = ":memory:"
+    os.environ["JD_INDEX_PATH"] = ""
+    fd, os.environ["CHECKPOINT_DB"] = tempfile.mkstemp(prefix="batch-fake-", suffix=".sqlite")
+    os.close(fd)
+    import llm_config
+    import agent.tools as tools
+    from benchmarks.fake_llm import FakeSearchBackend, StubChatModel
+
+    llm_config.llm.model = StubChatModel(latency=latency)
+    search = FakeSearchBackend(latency=latency)
+    tools._search, tools._asearch = search, search.asearch
+    llm_config.llm.cache = None
+    llm_config.scheduler.set_limits(rpm=10 ** 9, tpm=10 ** 12)
+
+
+def run(input_path, output_path, workers):
+    rows = load_rows(input_path)
+    done = finished_ids(output_path)
+    todo = [row for row in rows if str(row["id"]) not in done]
+    print(f"{len(rows)} rows, {len(done)} already done, {len(todo)} to process with {workers} workers")
+
+    namespace = thread_namespace(input_path)
+    latencies, failures = [], 0
+    started = time.perf_counter()
+
+    def work(row):
+        t0 = time.perf_counter()
+        try:
+            record = {"id": row["id"], **process_row(row, namespace)}
+        except Exception as e:
+            record = {"id": row["id"], "error": f"{type(e).__name__}: {e}"}
+        record["elapsed_s"] = round(time.perf_counter() - t0, 4)
+        return record
+
+    with open(output_path, "a") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        if out.tell() and not _ends_with_newline(output_path):
+            out.write("\n")  # terminate a line cut short by a crash
+        for future in as_completed([pool.submit(work, row) for row in todo]):
+            record = future.result()
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            latencies.append(record["elapsed_s"])
+            failures += bool(record.get("error"))
+
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    if latencies:
+        print(
+            f"processed {len(latencies)} rows in {elapsed:.2f} s "
+            f"({len(latencies) / elapsed:.2f} rows/s), {failures} failed; "
+            f"row latency p50 {latencies[len(latencies) // 2]:.3f} s, "
+            f"p95 {latencies[int(0.95 * (len(latencies) - 1))]:.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process hiring requests from a JSONL file.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--fake", action="store_true", help="use the stub LLM instead of Gemini")
+    parser.add_argument("--fake-latency", type=float, default=0.05, help="seconds per stub LLM call")
+    args = parser.parse_args()
+
+    if args.fake:
+        use_fake_llm(args.fake_latency)
+    run(args.input, args.output, args.workers)
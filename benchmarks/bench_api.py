@@ -0,0 +1,123 @@
+# bench_api.py
+"""
+Load generator for the API server. For each worker count it starts
+`python -m benchmarks.fake_api --workers N` (the API on the stub LLM),
+then --clients threads run full recruiter sessions against it for
+--duration seconds: questions, a JD, then follow-ups (email, checklist,
+edit). Consecutive requests of one session are not pinned to a worker, so
+this also checks that any worker can serve any thread_id through the
+shared SQLite state.
+
+Reports requests per second and per-endpoint latency percentiles. Scaling
+with the worker count is bounded by the machine's cores.
+
+Run from the repo root:  python -m benchmarks.bench_api --workers 1 2 4
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from api_client import HiringClient
+
+FOLLOWUPS = ["generate email", "create a hiring checklist", "make the email shorter"]
+
+
+def wait_until_up(client, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        try:
+            return client._call("GET", "/health")
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("API server did not start")
+
+
+def session(client, timings, errors):
+    def timed(name, fn):
+        started = time.perf_counter()
+        try:
+            result = fn()
+        except Exception:
+            errors[name] += 1
+            raise
+        timings[name].append(time.perf_counter() - started)
+        return result
+
+    thread_id = timed("questions", lambda: client.questions("Hire a backend engineer and a data scientist"))["thread_id"]
+    timed("job-description", lambda: client.job_description(thread_id, "5 years, remote, $120k", role="Backend Engineer"))
+    for message in FOLLOWUPS:
+        timed("followup", lambda: client.followup(thread_id, message))
+
+
+def run(workers, args):
+    port = args.port
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "GEMINI_KEY": os.getenv("GEMINI_KEY", "bench"),
+            "CHECKPOINTER": "sqlite",
+            "CHECKPOINT_DB": os.path.join(tmp, "checkpoints.sqlite"),
+            "SESSION_DB": os.path.join(tmp, "sessions.sqlite"),
+            "LLM_CACHE_PATH": os.path.join(tmp, "llm_cache.sqlite"),
+            "ANALYTICS_SINK": "none",
+            "PYTHONWARNINGS": "ignore",
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.fake_api", "--workers", str(workers), "--port", str(port), "--latency", str(args.latency)],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            client = HiringClient(f"http://127.0.0.1:{port}")
+            wait_until_up(client, server)
+            timings, errors = defaultdict(list), defaultdict(int)
+            stop = time.monotonic() + args.duration
+
+            def loop():
+                while time.monotonic() < stop:
+                    try:
+                        session(client, timings, errors)
+                    except Exception:
+                        pass
+
+            threads = [threading.Thread(target=loop) for _ in range(args.clients)]
+            started = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    total = sum(len(v) for v in timings.values())
+    print(f"{workers} worker(s): {total / elapsed:7.1f} req/s, {total} requests, {sum(errors.values())} errors")
+    for name, values in timings.items():
+        values.sort()
+        pick = lambda q: values[min(len(values) - 1, int(q * len(values)))] * 1000
+        print(f"    {name:<16} p50 {pick(0.5):7.1f} ms  p95 {pick(0.95):7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=16, help="concurrent client sessions")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds of load per worker count")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per stub LLM call")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    print(f"{os.cpu_count()} CPU(s), {args.clients} clients, stub LLM {args.latency * 1000:.0f} ms per call")
+    for workers in args.workers:
+        run(workers, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# bench_edit.py
+"""
+Compare full-document and section-level edits of a long job description.
+The fake model's latency is proportional to the tokens it writes, so the
+section mode should win roughly by the ratio of document to section size.
+
+Run from the repo root:  python -m benchmarks.bench_edit
+"""
+
+import time
+
+import agent.tools as tools
+from agent.sections import section_diff
+from benchmarks.fake_llm import EditingChatModel
+
+SECTIONS = [
+    "Overview", "About Us", "Responsibilities", "Required Skills", "Preferred Skills", "Qualifications",
+    "Experience", "Tools & Stack", "Team", "Location", "Compensation", "Benefits", "Hiring Process", "Equal Opportunity",
+]
+
+
+def long_jd():
+    parts = ["# Senior Backend Engineer\n\n"]
+    for title in SECTIONS:
+        body = "\n".join(f"- {title} detail {i}: lorem ipsum dolor sit amet, consectetur adipiscing elit." for i in range(8))
+        if title == "Compensation":
+            body += "\n- Salary range: $120k-$140k per year."
+        parts.append(f"## {title}\n{body}\n\n")
+    return "".join(parts)
+
+
+def main():
+    jd = long_jd()
+    instruction = "change the salary range to $130k-$150k"
+    results = {}
+    for mode in ("full", "sections"):
+        tools.llm = EditingChatModel(old="$120k-$140k", new="$130k-$150k")
+        started = time.perf_counter()
+        edited = tools.edit_document(jd, instruction, mode=mode)
+        results[mode] = edited
+        print(f"{mode:>8}: {time.perf_counter() - started:.3f} s, {tools.llm.output_tokens} output tokens")
+    assert results["full"] == results["sections"], "both modes must produce the same document"
+    print("diff:\n" + section_diff(jd, results["sections"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# bench_hedging.py
+"""
+Tail latency of one model versus the ModelRouter. Two fake models answer
+after a lognormal latency, and a few percent of their calls are stragglers
+that take 20x longer. The router hedges after the adaptive p95 delay and
+falls back when the primary fails; the report shows latency percentiles
+and how many extra requests hedging cost. A model failing with 429s is
+not sent to the fallback: the scheduler backs off and retries it.
+
+Run from the repo root:  python -m benchmarks.bench_hedging
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import HumanMessage
+
+from benchmarks.fake_llm import FlakyChatModel, LatencyProfile, ReplayChatModel
+from model_router import ModelRouter
+from scheduler import RequestScheduler, ScheduledChatModel
+
+
+def fake(args, seed, mean=None):
+    profile = LatencyProfile(mean or args.latency, 0.3, "lognormal", args.stragglers, straggler_factor=20, seed=seed)
+    return ReplayChatModel(profile=profile)
+
+
+def measure(model, args):
+    message = [HumanMessage(content="Generate a detailed job description for the role of Engineer based on x")]
+
+    def call(_):
+        started = time.perf_counter()
+        try:
+            model.invoke(message)
+            return time.perf_counter() - started, False
+        except Exception:
+            return time.perf_counter() - started, True
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(call, range(args.requests)))
+    latencies = sorted(seconds for seconds, _ in results)
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return f"p50 {pick(0.5):7.1f} ms  p95 {pick(0.95):7.1f} ms  p99 {pick(0.99):7.1f} ms  max {latencies[-1] * 1000:7.1f} ms  errors {sum(e for _, e in results)}"
+
+
+def extra_requests(router, requests):
+    stats = router.stats().values()
+    return f"hedges sent {sum(s['hedges'] for s in stats)} ({sum(s['hedges'] for s in stats) / requests:.1%}), won {sum(s['hedge_wins'] for s in stats)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.05, help="median seconds per call")
+    parser.add_argument("--stragglers", type=float, default=0.03, help="share of calls that take 20x longer")
+    args = parser.parse_args()
+
+    print(f"single model         {measure(fake(args, 1), args)}")
+
+    router = ModelRouter(models=[fake(args, 1), fake(args, 2, args.latency * 1.5)], hedging=True, min_samples=50)
+    print(f"router, hedged       {measure(router, args)}")
+    print(f"                     {extra_requests(router, args.requests)}, hedge delay now {router.hedge_delay(0) * 1000:.1f} ms")
+
+    router = ModelRouter(models=[fake(args, 1), fake(args, 2, args.latency * 1.5)], hedging=False)
+    print(f"router, no hedging   {measure(router, args)}")
+
+    async def async_run():
+        router = ModelRouter(models=[fake(args, 1), fake(args, 2, args.latency * 1.5)], hedging=True, min_samples=50)
+        message = [HumanMessage(content="hello")]
+        limit = asyncio.Semaphore(args.concurrency)
+
+        async def call():
+            async with limit:
+                started = time.perf_counter()
+                await router.ainvoke(message)
+                return time.perf_counter() - started
+
+        latencies = sorted(await asyncio.gather(*(call() for _ in range(args.requests))))
+        return latencies[int(0.99 * len(latencies))], router
+
+    p99, async_router = asyncio.run(async_run())
+    print(f"async, hedged        p99 {p99 * 1000:7.1f} ms  {extra_requests(async_router, args.requests)}")
+
+    flaky = FlakyChatModel(failure_rate=0.3, latency=args.latency)
+    print(f"30% failing model    {measure(flaky, args)}")
+    scheduler = RequestScheduler(rpm=1_000_000, base_delay=args.latency, max_delay=args.latency * 4)
+    router = ModelRouter(models=[FlakyChatModel(failure_rate=0.3, latency=args.latency), fake(args, 2)], scheduler=scheduler)
+    print(f"  + router, backoff  {measure(ScheduledChatModel(model=router, scheduler=scheduler), args)}")
+    print(f"                     {({name: (s['wins'], s['errors']) for name, s in router.stats().items()})} (wins, errors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# bench_jd_index.py
+"""
+Build and query the JD vector index at 100k synthetic documents: bulk build
+time, reload time from disk, top-k query latency, and whether a repeated
+request is found as an exact match (reuse), a reworded one as a close match
+(few-shot example), and one with another location never as a reuse.
+
+Run from the repo root:  python -m benchmarks.bench_jd_index --docs 100000
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from agent.jd_index import JDIndex
+
+ROLES = [
+    "Backend Engineer", "Frontend Engineer", "Data Scientist", "Product Manager", "Account Executive",
+    "DevOps Engineer", "Product Designer", "Data Engineer", "Marketing Manager", "Sales Development Representative",
+    "Machine Learning Engineer", "QA Engineer", "Customer Success Manager", "Recruiter", "Financial Analyst",
+]
+SKILLS = ["Python", "Go", "Java", "SQL", "React", "Kubernetes", "AWS", "Salesforce", "Figma", "Excel", "Spark", "Terraform"]
+LOCATIONS = ["Remote", "Berlin (hybrid)", "London (on-site)", "New York (hybrid)", "Bangalore (on-site)", "Toronto (remote)"]
+LEVELS = ["junior", "mid-level", "senior", "lead"]
+
+
+def synthetic(rng):
+    role = rng.choice(ROLES)
+    clarifications = (
+        f"Skills: {', '.join(rng.sample(SKILLS, 3))}\nExperience: {rng.randint(1, 12)} years\n"
+        f"Level: {rng.choice(LEVELS)}\nLocation: {rng.choice(LOCATIONS)}\n"
+        f"Compensation: ${rng.randint(60, 220)}k"
+    )
+    return role, clarifications, f"# {role}\n## Responsibilities\n- ...\n## Requirements\n{clarifications}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    items = [synthetic(rng) for _ in range(args.docs)]
+
+    with tempfile.TemporaryDirectory() as path:
+        index = JDIndex(path=path)
+        started = time.perf_counter()
+        for i in range(0, len(items), 5000):
+            index.add_many(items[i:i + 5000])
+        build = time.perf_counter() - started
+        print(f"build:  {len(index)} docs in {build:.2f} s ({build * 1e6 / len(index):.1f} us per doc)")
+
+        started = time.perf_counter()
+        index = JDIndex(path=path)
+        print(f"reload: {len(index)} docs in {time.perf_counter() - started:.2f} s")
+
+    latencies, reused, related, wrong = [], 0, 0, 0
+    for _ in range(args.queries):
+        role, clarifications, _ = rng.choice(items)
+        started = time.perf_counter()
+        hits = index.search(role, clarifications, k=3)
+        latencies.append(time.perf_counter() - started)
+        reused += index.exact(role, clarifications) is not None
+        moved = clarifications.replace("Location:", "Location: not")
+        wrong += index.exact(role, moved) is not None
+        reworded = clarifications.replace("Skills:", "Must know").replace("years", "yrs")
+        related += index.search(role, reworded, k=1)[0][0] >= 0.6
+    latencies.sort()
+    print(
+        f"query:  p50 {statistics.median(latencies) * 1000:.2f} ms, "
+        f"p95 {latencies[int(0.95 * (len(latencies) - 1))] * 1000:.2f} ms (top-3 of {len(index)})"
+    )
+    print(f"repeated requests reusable: {reused}/{args.queries}; reworded requests with an example: {related}/{args.queries}; "
+          f"other-location requests reused: {wrong}/{args.queries}")
+    adding = JDIndex()
+    started = time.perf_counter()
+    for role, clarifications, jd in items[:1000]:
+        adding.add(role, clarifications, jd)
+    print(f"single adds (in memory): {(time.perf_counter() - started) * 1000:.3f} ms per 1000")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# bench_question_bank.py
+"""
+Time to the first screen (the clarifying questions) for recurring roles.
+The first request for a role goes to the stub LLM and fills the question
+bank; later requests for the same or a similar title are served from it.
+
+Run from the repo root:  python -m benchmarks.bench_question_bank
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("CHECKPOINTER", "memory")
+os.environ.setdefault("QUESTION_BANK_PATH", ":memory:")
+
+import agent.agent as agent_module
+from batch import use_fake_llm
+
+FIRST = ["I need to hire a backend engineer", "We are hiring an account executive", "hire a data scientist and a product designer"]
+REPEAT = [
+    "I need to hire a Sr. Backend Eng", "We are hiring account executives", "hire a data scientist",
+    "I need a product designer and a backend engineer", "We're looking for a Backend Enginer",
+]
+
+
+def timed(request, i):
+    started = time.perf_counter()
+    state = agent_module.run_role_to_questions(request, thread_id=f"bench-qb-{i}")
+    return time.perf_counter() - started, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per stub LLM call")
+    args = parser.parse_args()
+    use_fake_llm(args.latency)
+
+    for i, request in enumerate(FIRST):
+        elapsed, state = timed(request, i)
+        print(f"cold {elapsed * 1000:8.1f} ms  {request!r} -> {state['roles']}")
+    for i, request in enumerate(REPEAT):
+        elapsed, state = timed(request, 100 + i)
+        print(f"bank {elapsed * 1000:8.1f} ms  {request!r} -> {state['roles']}")
+        assert elapsed < args.latency, "recurring roles should not reach the LLM"
+    print(agent_module.question_bank.stats())
+
+
+if __name__ == "__main__":
+    main()
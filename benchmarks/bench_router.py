@@ -0,0 +1,84 @@
+# bench_router.py
+"""
+Offline accuracy/latency benchmark for the local follow-up router.
+Each labelled request names the tool the LLM should pick, or None when the
+request is ambiguous and must fall back to the LLM.
+
+Run from the repo root:  python -m benchmarks.bench_router
+"""
+
+import time
+
+from agent.router import route
+
+ARTIFACTS = {
+    "jd": "## Backend Engineer\n### Responsibilities\n- Build APIs\n### Compensation\n$120k-$140k",
+    "email": "Hi Alex, we'd love to chat about the backend role.",
+    "checklist": "## Sourcing\n- Post the JD",
+    "offer_letter": "Dear Alex, we are pleased to offer you...",
+}
+
+LABELLED = [
+    ("generate email", "write_outreach_email"),
+    ("Write an outreach email to Priya Shah for an interview", "write_outreach_email"),
+    ("draft a follow-up email for the candidate", "write_outreach_email"),
+    ("send a rejection email to Tom Lee", "write_outreach_email"),
+    ("please email Maria about scheduling", "write_outreach_email"),
+    ("compose an introduction email", "write_outreach_email"),
+    ("generate checklist", "generate_checklist"),
+    ("create a hiring checklist for this role", "generate_checklist"),
+    ("I need a checklist", "generate_checklist"),
+    ("make the hiring checklist", "generate_checklist"),
+    ("search the web for average backend engineer salary in Berlin", "google_web_search"),
+    ("look up market rate for data scientists", "google_web_search"),
+    ("google the latest hiring trends for AI engineers", "google_web_search"),
+    ("what is the salary benchmark for this role online", "google_web_search"),
+    ("generate offer letter for John Doe with salary $120,000", "generate_offer_letter"),
+    ("write an offer letter to Ana Costa, salary 95k", "generate_offer_letter"),
+    ("create the offer letter for Sam Park at $150k", "generate_offer_letter"),
+    ("prepare a job offer for Lee Min at 30 LPA", "generate_offer_letter"),
+    ("edit the job description to mention remote work", "edit_content"),
+    ("change the salary range in the jd to $130k-$150k", "edit_content"),
+    ("make the email shorter", "edit_content"),
+    ("update the checklist to add a reference check", "edit_content"),
+    ("rewrite the offer letter in a warmer tone", "edit_content"),
+    ("remove the certifications section from the job description", "edit_content"),
+    ("edit checklist", "edit_content"),
+    ("revise the email to sound more formal", "edit_content"),
+    # Ambiguous or under-specified: must fall back to the LLM.
+    ("generate offer letter", None),
+    ("what do you think?", None),
+    ("help me with the next step", None),
+    ("thanks!", None),
+    ("can you improve it", None),
+    ("tell me about the candidate pipeline", None),
+    # Two artifacts named: the LLM decides which one to change.
+    ("update the email to link to the job description", None),
+    ("change the checklist to match the job description", None),
+    ("edit the offer letter to reference the job description", None),
+]
+
+
+def main():
+    correct = routed = wrong = 0
+    timings = []
+    for text, label in LABELLED:
+        started = time.perf_counter()
+        msg = route(text, ARTIFACTS)
+        timings.append(time.perf_counter() - started)
+        tool = msg.tool_calls[0]["name"] if msg else None
+        routed += tool is not None
+        if tool == label:
+            correct += 1
+        elif tool is not None:
+            wrong += 1
+            print(f"MISROUTED: {text!r} -> {tool} (expected {label})")
+        else:
+            print(f"fallback:  {text!r} (expected {label})")
+    timings.sort()
+    print(f"accuracy: {correct}/{len(LABELLED)}  routed: {routed}  misrouted: {wrong}")
+    print(f"latency: p50 {timings[len(timings) // 2] * 1e6:.0f} us, max {timings[-1] * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
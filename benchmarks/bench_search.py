@@ -0,0 +1,82 @@
+# bench_search.py
+"""
+Many sessions asking a handful of market questions at once, phrased a little
+differently. With single-flight and the TTL cache, the backend should see one
+search per distinct question; without them it sees one per request.
+
+Run from the repo root:  python -m benchmarks.bench_search
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_llm import FakeSearchBackend
+from search_cache import SearchCache
+
+QUESTIONS = [
+    "average salary for a data scientist", "market rate for a senior backend engineer",
+    "latest skills in demand for ML engineers", "typical equity for a startup product manager",
+]
+PHRASINGS = ["{}", "What is the {}?", "{}", "Please search the web: {}", "  {}  "]
+
+
+def queries(n):
+    batch = []
+    for i in range(n):
+        query = PHRASINGS[i % len(PHRASINGS)].format(QUESTIONS[i % len(QUESTIONS)])
+        batch.append(query.upper() if i % 7 == 0 else query)
+    return batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, default=50)
+    args = parser.parse_args()
+    batch = queries(args.requests)
+
+    backend = FakeSearchBackend(latency=args.latency)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(backend, batch))
+    print(f"uncached:    {backend.calls:4d} backend calls, {time.perf_counter() - started:.2f} s")
+
+    backend, cache = FakeSearchBackend(latency=args.latency), SearchCache(ttl=60, max_entries=128)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(lambda q: cache.get(q, backend), batch))
+    print(f"threads:     {backend.calls:4d} backend calls, {time.perf_counter() - started:.2f} s, {cache.stats()}")
+    assert backend.calls == len(QUESTIONS) and all(results)
+
+    async def run_async():
+        return await asyncio.gather(*(cache.aget(q, backend.asearch) for q in batch))
+
+    backend, cache = FakeSearchBackend(latency=args.latency), SearchCache(ttl=60, max_entries=128)
+    started = time.perf_counter()
+    asyncio.run(run_async())
+    print(f"asyncio:     {backend.calls:4d} backend calls, {time.perf_counter() - started:.2f} s, {cache.stats()}")
+    assert backend.calls == len(QUESTIONS)
+
+    # Expired entries are searched again; failures reach every waiter and are not cached.
+    backend, cache = FakeSearchBackend(latency=0.01, failure_rate=1.0), SearchCache(ttl=0.05, max_entries=2)
+    for _ in range(2):
+        try:
+            cache.get(QUESTIONS[0], backend)
+        except Exception:
+            pass
+    assert backend.calls == 2 and cache.stats()["entries"] == 0
+    backend.failure_rate = 0.0
+    cache.get(QUESTIONS[0], backend)
+    time.sleep(0.06)
+    cache.get(QUESTIONS[0], backend)
+    for q in QUESTIONS:
+        cache.get(q, backend)
+    print(f"ttl/bounds:  {backend.calls:4d} backend calls, {cache.stats()}")
+    assert cache.stats()["expirations"] == 1 and cache.stats()["entries"] == 2
+
+
+if __name__ == "__main__":
+    main()
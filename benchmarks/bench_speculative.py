@@ -0,0 +1,71 @@
+# bench_speculative.py
+"""
+Follow-up latency with and without speculative precomputation. The stub LLM
+and the fake search backend are slow; the recruiter's "think time" between
+screens is simulated with a sleep. Also checks that a changed JD is never
+served a stale checklist and that the per-session budget holds.
+
+Run from the repo root:  python -m benchmarks.bench_speculative
+"""
+
+import argparse
+import time
+
+import agent.tools as tools
+from agent.speculative import SpeculativeExecutor, salary_query
+from benchmarks.fake_llm import FakeSearchBackend, StubChatModel
+
+JD = "## Backend Engineer\n### Responsibilities\n- Build APIs\n### Requirements\n- Go, SQL"
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per stub LLM call or search")
+    parser.add_argument("--think", type=float, default=1.0, help="seconds the recruiter spends between screens")
+    args = parser.parse_args()
+
+    tools.llm = StubChatModel(latency=args.latency)
+    backend = FakeSearchBackend(latency=args.latency)
+    tools._search = backend
+    search = lambda q: tools.google_web_search.invoke({"query": q})
+    checklist = lambda jd: tools.generate_checklist.invoke({"context": jd})
+    artifacts = {"jd": JD}
+    search_call = {"name": "google_web_search", "args": {"query": salary_query("Backend Engineer")}}
+    other_call = {"name": "google_web_search", "args": {"query": "average salary of a data scientist in London"}}
+    checklist_call = {"name": "generate_checklist", "args": {"context": "jd"}}
+
+    ms, _ = timed(lambda: checklist(JD))
+    print(f"checklist without speculation: {ms:7.1f} ms")
+    ms, _ = timed(lambda: backend("salary benchmarks"))
+    print(f"search without speculation:    {ms:7.1f} ms")
+
+    spec = SpeculativeExecutor(max_tasks=3)
+    spec.prewarm_searches(["Backend Engineer"], search)
+    time.sleep(args.think)
+    spec.precompute_checklist(JD, checklist)
+    time.sleep(args.think)
+    ms, result = timed(lambda: spec.lookup(checklist_call, artifacts))
+    print(f"checklist with speculation:    {ms:7.1f} ms ({'hit' if result else 'miss'})")
+    ms, result = timed(lambda: spec.lookup(search_call, artifacts))
+    print(f"search with speculation:       {ms:7.1f} ms ({'hit' if result else 'miss'})")
+
+    spec.precompute_checklist(JD, checklist)
+    spec.precompute_checklist(JD + "\n- Kubernetes", checklist)
+    assert spec.lookup(checklist_call, artifacts) is None, "a checklist for an older JD must not be served"
+    spec.precompute_checklist(JD + "\n- Terraform", checklist)
+    print(spec.stats())
+    assert spec.started <= spec.max_tasks
+
+    other = SpeculativeExecutor(max_tasks=1)
+    other.prewarm_searches(["Backend Engineer"], search)
+    assert other.lookup(other_call, artifacts) is None, "a search for another role must not be served"
+
+
+if __name__ == "__main__":
+    main()
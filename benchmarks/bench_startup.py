@@ -0,0 +1,94 @@
+# bench_startup.py
+"""
+Cold-start cost of the app. Each module is imported in a fresh interpreter
+(median of --runs), then the one-off work deferred to first use is timed:
+building the Gemini client and compiling the graphs. Finally the per-rerun
+cost of binding the tools to the LLM is compared with the cached binding
+app.py now reuses across reruns. No request is sent to Gemini.
+
+Run from the repo root:  python -m benchmarks.bench_startup
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = ["llm_config", "agent.tools", "agent.agent"]
+
+# What app.py imports before it renders anything (Streamlit itself excluded).
+APP_IMPORTS = (
+    "import llm_config, scheduler, llm_cache, analytics, agent.tools, agent.agent, "
+    "agent.artifacts, agent.router, agent.sections, agent.speculative"
+)
+
+FIRST_USE = """
+import time
+started = time.perf_counter()
+{imports}
+imported = time.perf_counter()
+from llm_config import llm
+llm.inner
+client = time.perf_counter()
+import agent.agent as a
+a.get_graph(); a.get_tool_graph()
+graphs = time.perf_counter()
+print(imported - started, client - imported, graphs - client)
+"""
+
+
+def env():
+    # Throwaway state, so the benchmark never touches the real databases.
+    return {
+        **os.environ,
+        "GEMINI_KEY": os.getenv("GEMINI_KEY", "bench"),
+        "LLM_CACHE_PATH": ":memory:",
+        "CHECKPOINTER": "memory",
+        "QUESTION_BANK_PATH": ":memory:",
+        "JD_INDEX_PATH": "",
+        "PYTHONWARNINGS": "ignore",
+    }
+
+
+def run(code):
+    out = subprocess.run([sys.executable, "-c", code], env=env(), capture_output=True, text=True, check=True)
+    return [float(x) for x in out.stdout.split()[-3:]]
+
+
+def import_seconds(statement, runs):
+    code = f"import time\nstarted = time.perf_counter()\n{statement}\nprint(time.perf_counter() - started)"
+    return statistics.median(run(code)[-1] for _ in range(runs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--reruns", type=int, default=200, help="simulated Streamlit reruns")
+    args = parser.parse_args()
+
+    for module in MODULES:
+        print(f"import {module:<14} {import_seconds(f'import {module}', args.runs) * 1000:7.0f} ms")
+    print(f"app.py imports        {import_seconds(APP_IMPORTS, args.runs) * 1000:7.0f} ms")
+
+    imported, client, graphs = (statistics.median(x) for x in zip(*(run(FIRST_USE.format(imports=APP_IMPORTS)) for _ in range(args.runs))))
+    print(f"first use: Gemini client {client * 1000:.0f} ms, compile graphs {graphs * 1000:.0f} ms")
+
+    os.environ.update(env())
+    from lazy import singleton
+    from agent.tools import edit_content, generate_checklist, generate_offer_letter, google_web_search, write_outreach_email
+    from llm_config import llm
+
+    tools = [write_outreach_email, generate_checklist, google_web_search, generate_offer_letter, edit_content]
+    cached = singleton(lambda: llm.bind_tools(tools))  # what get_tool_llm() does
+    for label, rerun in [("bind_tools every rerun", lambda: llm.bind_tools(tools)), ("cached binding", cached)]:
+        rerun()  # the first rerun pays for building the client either way
+        started = time.perf_counter()
+        for _ in range(args.reruns):
+            rerun()
+        print(f"{label:<22} {(time.perf_counter() - started) * 1000 / args.reruns:8.3f} ms/rerun")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+# bench_suite.py
+"""
+Offline end-to-end benchmark of the recruiting graphs. Gemini is replaced
+by ReplayChatModel (recorded responses, or the stub rules when none are
+recorded) and the web search by FakeSearchBackend, both with latencies drawn
+from a seeded distribution, so what is measured is the graphs, tools and
+local layers around the model. With --latency 0 only that overhead remains.
+
+Scenarios
+  graph          run_role_to_questions: role extraction + questions per role
+  clarification  run_from_clarification: one JD per role, then the plan
+  express        run_role_to_questions on requests that state skills, level,
+                 location and budget: roles and JD in one pass, no questions
+  tool_loop      follow-ups (email, checklist, search, offer, edit) through
+                 the local router and the tool graph, as app.py runs them
+  bulk           batch.process_row over full rows from --workers threads
+
+Each scenario reports throughput, latency percentiles and the peak traced
+memory of a few extra runs under tracemalloc. Results are compared with
+--baseline (if it exists); a slower or larger result beyond --tolerance is
+flagged and the exit status is 1. Save the current numbers as the baseline
+with --save-baseline. Baselines are machine specific.
+
+By default the question bank, JD index and search cache are turned off, so
+every run does the full work; --warm keeps them on.
+
+Record responses from Gemini once (needs GEMINI_KEY, spends quota):
+    python -m benchmarks.bench_suite --record benchmarks/recordings.jsonl --iterations 2
+and replay them:
+    python -m benchmarks.bench_suite --recordings benchmarks/recordings.jsonl
+
+Run from the repo root:  python -m benchmarks.bench_suite
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+SCENARIOS = ["graph", "clarification", "express", "tool_loop", "bulk"]
+
+# Lower is better for these; throughput must not drop by more than the tolerance either.
+CHECKED = ["p50_ms", "p95_ms", "peak_mb"]
+
+REQUESTS = [
+    "Hire a backend engineer",
+    "We are hiring a data scientist and a product designer",
+    "I need to hire a founding engineer, a growth marketer and a recruiter",
+]
+DETAILED_REQUESTS = [
+    "Hire a senior backend engineer with Python and Go, remote, $140k-$160k",
+    "We are hiring a junior data analyst with SQL and Tableau, hybrid in Berlin, $60k",
+]
+ANSWERS = "Python, Go and SQL\nBSc or equivalent\n5 years\nSenior\nRemote (EU)\n$120k-$150k"
+FOLLOWUPS = [
+    "generate email",
+    "create a hiring checklist",
+    "search the web for the current market salary",
+    "generate offer letter for Jane Doe with salary $130k",
+    "make the email shorter",
+]
+
+
+def configure(args):
+    """Point every model, store and cache at local fakes; must run before agent.agent is first imported."""
+    os.environ.setdefault("GEMINI_KEY", "bench")
+    os.environ["LLM_CACHE_PATH"] = ":memory:"
+    os.environ["CHECKPOINTER"] = "memory"
+    os.environ["EXPRESS_MODE"] = "1"
+    if not args.warm:
+        os.environ["JD_REUSE"] = "0"
+        os.environ["JD_EXAMPLE_SCORE"] = "2"  # similarities are at most 1
+        os.environ["SEARCH_CACHE_TTL"] = "0"
+
+    import batch
+    import llm_config
+    import agent.tools as tools
+    from benchmarks.fake_llm import FakeSearchBackend, LatencyProfile, RecordingChatModel, ReplayChatModel
+
+    batch.use_fake_llm(0)
+    if not args.warm:
+        import agent.agent
+        from agent.question_bank import QuestionBank
+
+        bank = QuestionBank(path=":memory:")
+        bank.add = lambda role, questions: None  # stays empty, so every role is generated
+        agent.agent.get_question_bank = lambda: bank
+    profile = LatencyProfile(args.latency, args.jitter, args.distribution, args.stragglers, seed=args.seed)
+    if args.record:
+        llm_config.llm.model = RecordingChatModel(model=llm_config._gemini(), path=args.record)
+        llm_config.scheduler.set_limits(rpm=int(os.getenv("GEMINI_RPM", "15")), tpm=int(os.getenv("GEMINI_TPM", "1000000")))
+        return None, None, "recording from Gemini"
+    model = ReplayChatModel.from_file(args.recordings, profile=profile)
+    backend = FakeSearchBackend(profile=LatencyProfile(args.latency, args.jitter, args.distribution, args.stragglers, seed=args.seed + 1))
+    tools._search, tools._asearch = backend, backend.asearch
+    llm_config.llm.model = model
+    return model, backend, profile.describe()
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+# --- scenarios: each returns a callable running one operation -------------
+
+def graph_op():
+    from agent.agent import run_role_to_questions
+
+    requests = iter(range(10 ** 9))
+    return lambda: run_role_to_questions(REQUESTS[next(requests) % len(REQUESTS)], thread_id=uuid.uuid4().hex)
+
+
+def clarification_op():
+    from agent.agent import run_from_clarification
+
+    roles = ["Backend Engineer", "Data Scientist", "Product Designer"]
+    return lambda: run_from_clarification(ANSWERS, "", uuid.uuid4().hex, role_clarifications={role: ANSWERS for role in roles})
+
+
+def express_op():
+    from agent.agent import run_role_to_questions
+
+    requests = iter(range(10 ** 9))
+    return lambda: run_role_to_questions(DETAILED_REQUESTS[next(requests) % len(DETAILED_REQUESTS)], thread_id=uuid.uuid4().hex)
+
+
+def tool_loop_op():
+    from langchain_core.messages import ToolMessage
+
+    from agent.agent import get_tool_graph, run_from_clarification
+    from agent.artifacts import normalize_handle
+    from agent.router import route
+
+    state = run_from_clarification(ANSWERS, "Backend Engineer", uuid.uuid4().hex)
+    artifacts = {"jd": state["job_descriptions"]["Backend Engineer"]}
+    followups = iter(range(10 ** 9))
+
+    def op():
+        ai_msg = route(FOLLOWUPS[next(followups) % len(FOLLOWUPS)], artifacts)
+        result = get_tool_graph().invoke({
+            "messages": [ai_msg], "recruiter_info": {"Job_Description": artifacts["jd"]}, "artifacts": dict(artifacts),
+        })
+        output = next(m.content for m in result["messages"] if isinstance(m, ToolMessage))
+        call = ai_msg.tool_calls[0]
+        handle = {"write_outreach_email": "email", "generate_checklist": "checklist", "generate_offer_letter": "offer_letter"}.get(call["name"])
+        if call["name"] == "edit_content":
+            handle = normalize_handle(call["args"].get("artifact", ""))
+        if handle:
+            artifacts[handle] = output
+    return op
+
+
+def bulk_op(workers):
+    from batch import process_row
+
+    rows = iter(range(10 ** 9))
+
+    def row():
+        i = next(rows)
+        if i % 2:
+            return {"id": i, "request": REQUESTS[i % len(REQUESTS)]}
+        return {"id": i, "role": "Backend Engineer", "clarifications": ANSWERS}
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    # One operation is a wave of `workers` rows processed concurrently.
+    return lambda: list(pool.map(lambda r: process_row(r), [row() for _ in range(workers)]))
+
+
+def run_scenario(name, args):
+    op = {"graph": graph_op, "clarification": clarification_op, "express": express_op, "tool_loop": tool_loop_op}.get(name)
+    op = op() if op else bulk_op(args.workers)
+    per_op = args.workers if name == "bulk" else 1
+    for _ in range(args.warmup):
+        op()
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        t0 = time.perf_counter()
+        op()
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    for _ in range(args.memory_iterations):
+        op()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "ops_per_s": round(args.iterations * per_op / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "peak_mb": round(peak / 2 ** 20, 2),
+    }
+
+
+def regressions(results, baseline, tolerance):
+    found = []
+    for name, result in results.items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        for metric in CHECKED:
+            if base.get(metric) and result[metric] > base[metric] * (1 + tolerance):
+                found.append(f"{name}.{metric}: {result[metric]} vs baseline {base[metric]}")
+        if base.get("ops_per_s") and result["ops_per_s"] < base["ops_per_s"] * (1 - tolerance):
+            found.append(f"{name}.ops_per_s: {result['ops_per_s']} vs baseline {base['ops_per_s']}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--iterations", type=int, default=30, help="timed operations per scenario")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed operations before timing")
+    parser.add_argument("--memory-iterations", type=int, default=3, help="extra operations traced for peak memory")
+    parser.add_argument("--workers", type=int, default=8, help="threads of the bulk scenario")
+    parser.add_argument("--latency", type=float, default=0.02, help="median seconds per fake LLM call or search")
+    parser.add_argument("--jitter", type=float, default=0.5, help="spread of the latency distribution")
+    parser.add_argument("--distribution", default="lognormal", choices=["constant", "uniform", "normal", "lognormal"])
+    parser.add_argument("--stragglers", type=float, default=0.0, help="share of calls that take 10x longer")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warm", action="store_true", help="keep the question bank, JD index and search cache on")
+    parser.add_argument("--recordings", help="JSONL of recorded responses to replay")
+    parser.add_argument("--record", help="call Gemini and append its responses to this JSONL file")
+    parser.add_argument("--baseline", default=os.path.join(os.path.dirname(__file__), "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown before flagging")
+    args = parser.parse_args()
+
+    model, backend, latency = configure(args)
+    print(f"latency: {latency}; {'warm' if args.warm else 'cold'} local stores")
+    results = {}
+    for name in args.scenarios:
+        results[name] = run_scenario(name, args)
+        r = results[name]
+        unit = "rows/s" if name == "bulk" else "ops/s"
+        print(
+            f"{name:<14} {r['ops_per_s']:8.2f} {unit:<7} p50 {r['p50_ms']:8.2f} ms  p95 {r['p95_ms']:8.2f} ms  "
+            f"p99 {r['p99_ms']:8.2f} ms  peak {r['peak_mb']:6.2f} MB"
+        )
+    if model is not None:
+        print(f"LLM calls replayed {model.replayed}, synthesized {model.synthesized}; searches {backend.calls}")
+    if args.record:
+        print(f"responses recorded to {args.record}")
+        return
+
+    config = {k: getattr(args, k) for k in ["iterations", "workers", "latency", "jitter", "distribution", "stragglers", "seed", "warm", "recordings"]}
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"config": config, "scenarios": results}, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print("no baseline yet; run with --save-baseline to store one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print(f"warning: baseline was taken with different settings {baseline.get('config')}")
+    found = regressions(results, baseline, args.tolerance)
+    for line in found:
+        print(f"REGRESSION {line}")
+    if found:
+        sys.exit(1)
+    print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# bench_templates.py
+"""
+Offer letters for a 300-hire cohort: one LLM generation per candidate versus
+one cached template rendered locally per candidate. Every tenth candidate
+asks for a custom touch, the only per-candidate LLM call in template mode.
+
+Run from the repo root:  python -m benchmarks.bench_templates
+"""
+
+import time
+
+import agent.templates as templates
+import agent.tools as tools
+from benchmarks.fake_llm import StubChatModel
+
+COHORT = 300
+LATENCY = 0.02
+
+
+def cohort():
+    return [
+        {
+            "candidate_name": f"Candidate {i}",
+            "salary": f"${90 + i % 40}k",
+            "start_date": f"{1 + i % 28} March",
+            "custom_note": "their open-source database work" if i % 10 == 0 else "",
+        }
+        for i in range(COHORT)
+    ]
+
+
+def main():
+    tools.llm = templates.llm = StubChatModel(latency=LATENCY)
+    candidates = cohort()
+
+    started = time.perf_counter()
+    for c in candidates:
+        tools.generate_offer_letter.invoke({"candidate_name": c["candidate_name"], "salary": c["salary"]})
+    per_candidate = time.perf_counter() - started
+    print(f"  generate: {per_candidate:.2f} s ({per_candidate * 1000 / COHORT:.2f} ms per candidate, {COHORT} LLM calls)")
+
+    started = time.perf_counter()
+    letters = templates.bulk_documents("offer_letter", "Backend Engineer", candidates)
+    rendered = time.perf_counter() - started
+    calls = 1 + sum(bool(c["custom_note"]) for c in candidates)
+    print(f"  template: {rendered:.2f} s ({rendered * 1000 / COHORT:.2f} ms per candidate, {calls} LLM calls)")
+
+    plain = [c for c in candidates if not c["custom_note"]]
+    started = time.perf_counter()
+    templates.bulk_documents("offer_letter", "Backend Engineer", plain)
+    cached = time.perf_counter() - started
+    print(f"  template, cached, no custom touches: {cached * 1000:.1f} ms ({cached * 1000 / len(plain):.4f} ms per candidate)")
+    assert "Candidate 1," in letters[1] and "${" not in letters[1]
+    print("sample:\n" + letters[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# fake_api.py
+"""
+Serves the API on the stub LLM for load tests, without an API key. The stub
+is swapped in before `api` is imported, in every worker process, so api.py
+itself has no offline mode.
+
+Run from the repo root:  python -m benchmarks.fake_api --workers 4 --latency 0.05
+"""
+
+import argparse
+import os
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the hiring workflow over HTTP on the stub LLM.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per stub LLM call or search")
+    args = parser.parse_args()
+
+    # Read by each worker when uvicorn imports this module below.
+    os.environ["FAKE_LLM_LATENCY"] = str(args.latency)
+    uvicorn.run("benchmarks.fake_api:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
+else:
+    import batch
+
+    batch.use_fake_llm(float(os.getenv("FAKE_LLM_LATENCY", "0.05")))
+    from api import app  # noqa: E402
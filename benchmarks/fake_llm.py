@@ -0,0 +1,386 @@
+# fake_llm.py
+"""
+Local stand-ins for Gemini used by the benchmarks.
+They implement the LangChain chat-model interface, so they can be wrapped
+by the same scheduler/cache layers as the real model. ReplayChatModel
+replays responses recorded from Gemini with RecordingChatModel, with
+latencies drawn from a LatencyProfile.
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+
+class QuotaExceeded(Exception):
+    """Mimics the 429 error raised by the Gemini API."""
+    code = 429
+
+
+class FlakyChatModel(BaseChatModel):
+    """Answers with a fixed response, failing `failure_rate` of requests with a 429."""
+
+    response: str = "ok"
+    failure_rate: float = 0.2
+    latency: float = 0.0
+    seed: int = 0
+    _rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, __context):
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self):
+        return "flaky-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        if self._rng.random() < self.failure_rate:
+            raise QuotaExceeded("429 Resource has been exhausted (e.g. check quota).")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+
+class EditingChatModel(BaseChatModel):
+    """
+    Applies an edit prompt locally: returns the content it was asked to edit
+    with `old` replaced by `new`. Latency grows with the output length, like
+    a real model's decode time.
+    """
+
+    old: str = ""
+    new: str = ""
+    seconds_per_token: float = 0.002
+    output_tokens: int = 0
+
+    @property
+    def _llm_type(self):
+        return "editing-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = messages[-1].content
+        start, end = "Here is the existing content:\n", "\n\nHere is the instruction"
+        text = prompt[prompt.find(start) + len(start):prompt.find(end)] if start in prompt else ""
+        text = text.replace(self.old, self.new)
+        tokens = len(text) // 4 + 1
+        self.output_tokens += tokens
+        time.sleep(tokens * self.seconds_per_token)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+
+# Hiring details the stub finds in a request, for the role-extraction schema.
+DETAIL_PATTERNS = {
+    "skills": r"\b(?:skills?:?|experience (?:in|with)|with)\s+([^,;.]+)",
+    "level": r"\b(junior|mid-level|senior|lead|staff|principal)\b",
+    "location": r"\b(remote|hybrid|on-?site)\b",
+    "budget": r"(\$\s?\d[\d,.]*k?(?:\s*-\s*\$?\d[\d,.]*k?)?)",
+}
+# Where the details start after the role titles of a request.
+DETAILS_START = re.compile(r"\s+with\b|[;:(]|,?\s+(?=remote|hybrid|on-?site|\$|budget|salary)", re.I)
+
+
+def _quoted(prompt):
+    match = re.search(r"'(.*)'", prompt, re.S)
+    return match.group(1) if match else prompt
+
+
+def bind_forced_tools(model, tools, tool_choice=None):
+    """
+    bind_tools of the fakes: free tool choice is left to agent/router.py, so
+    tools are only kept when a call is forced, as structured output does.
+    """
+    if tool_choice is None:
+        return model.bind()
+    return model.bind(tools=[convert_to_openai_tool(tool) for tool in tools], tool_choice=tool_choice)
+
+
+def forced_call_args(tool, prompt, content):
+    """
+    Arguments of a forced tool call: list fields get the lines of the text
+    answer, detail fields what the quoted request states.
+    """
+    lines = [line.strip("-•* ").strip() for line in content.splitlines() if line.strip("-•* ").strip()]
+    args = {}
+    for field, spec in tool["function"]["parameters"]["properties"].items():
+        if spec.get("type") == "array":
+            args[field] = lines
+        elif field in DETAIL_PATTERNS:
+            match = re.search(DETAIL_PATTERNS[field], _quoted(prompt), re.I)
+            if match:
+                args[field] = match.group(1).strip()
+    return args
+
+
+def forced_call(tool, args) -> AIMessage:
+    name = tool["function"]["name"]
+    return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": f"fake-{name}"}])
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Deterministic stand-in for the whole recruiting flow: recognises the
+    role-extraction, question, JD and document-template prompts and answers each plausibly
+    after `latency` seconds. Structured-output requests get a tool call.
+    """
+
+    latency: float = 0.05
+
+    @property
+    def _llm_type(self):
+        return "stub-fake"
+
+    def bind_tools(self, tools, tool_choice=None, **kwargs):
+        return bind_forced_tools(self, tools, tool_choice)
+
+    @staticmethod
+    def _respond(prompt):
+        if prompt.startswith("Extract the job roles"):
+            request = DETAILS_START.split(_quoted(prompt), 1)[0]
+            request = re.sub(r"^(i need to hire|we are hiring|hire)\s+", "", request.lower().strip(" ."))
+            parts = [re.sub(r"^(a|an)\s+", "", p.strip()) for p in re.split(r",| and ", request)]
+            return "\n".join(f"- {p.title()}" for p in parts if p) or "- Engineer"
+        if "follow-up questions" in prompt:
+            return "\n".join(f"- {q}" for q in [
+                "What essential skills are required?", "What qualifications are needed?",
+                "How many years of experience?", "What is the role level?",
+                "What is the job location?", "What is the compensation range?",
+            ])
+        if prompt.startswith("Generate a detailed job description"):
+            role = prompt.split("for the role of ", 1)[1].split(" based on", 1)[0]
+            return f"## {role}\n### Responsibilities\n- Own {role.lower()} work\n### Requirements\n- Relevant experience"
+        if prompt.startswith("Write a reusable template"):
+            salary = "Your annual salary will be ${salary}, starting on ${start_date}.\n\n" if "${salary}" in prompt else ""
+            return (
+                "Dear ${candidate_name},\n\nWe are delighted to offer you the position of ${role}.\n"
+                f"{salary}${{custom_touch}}\n\nWarm regards,\nThe Hiring Team"
+            )
+        if prompt.startswith("Write one or two warm sentences"):
+            return "We were especially impressed by your work and look forward to having you on the team."
+        return "ok"
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        time.sleep(self.latency)
+        prompt = str(messages[-1].content)
+        content = self._respond(prompt)
+        message = forced_call(tools[0], forced_call_args(tools[0], prompt, content)) if tools else AIMessage(content=content)
+        message.usage_metadata = _usage(prompt, content)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _usage(prompt, content):
+    usage = {"input_tokens": len(prompt) // 4 + 1, "output_tokens": len(content) // 4 + 1}
+    usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+    return usage
+
+
+def prompt_key(messages) -> str:
+    """Recording key of a request: hash of the whitespace-normalized message contents."""
+    text = "\x00".join(" ".join(str(m.content).split()) for m in messages)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:24]
+
+
+class LatencyProfile:
+    """
+    Seeded latency distribution for fake models and search backends.
+
+    distribution "constant" always returns `mean`; "uniform" draws from
+    mean ± jitter * mean; "normal" uses a standard deviation of jitter * mean;
+    "lognormal" has median `mean` and shape `jitter` (a long right tail, like
+    real API latency). On top of that, `straggler_rate` of the calls take
+    `straggler_factor` times longer.
+    """
+
+    DISTRIBUTIONS = ("constant", "uniform", "normal", "lognormal")
+
+    def __init__(self, mean=0.05, jitter=0.0, distribution="constant", straggler_rate=0.0, straggler_factor=10.0, seed=0):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution '{distribution}', expected one of {list(self.DISTRIBUTIONS)}")
+        self.mean = mean
+        self.jitter = jitter
+        self.distribution = distribution
+        self.straggler_rate = straggler_rate
+        self.straggler_factor = straggler_factor
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        with self._lock:
+            if self.distribution == "uniform":
+                seconds = self._rng.uniform(self.mean * (1 - self.jitter), self.mean * (1 + self.jitter))
+            elif self.distribution == "normal":
+                seconds = self._rng.gauss(self.mean, self.jitter * self.mean)
+            elif self.distribution == "lognormal":
+                seconds = self.mean * math.exp(self._rng.gauss(0.0, self.jitter)) if self.mean else 0.0
+            else:
+                seconds = self.mean
+            if self._rng.random() < self.straggler_rate:
+                seconds *= self.straggler_factor
+        return max(0.0, seconds)
+
+    def describe(self) -> str:
+        text = f"{self.distribution} {self.mean * 1000:.0f} ms"
+        if self.distribution != "constant":
+            text += f" (jitter {self.jitter})"
+        if self.straggler_rate:
+            text += f", {self.straggler_rate:.0%} stragglers x{self.straggler_factor:g}"
+        return text
+
+
+class ReplayChatModel(BaseChatModel):
+    """
+    Replays recorded responses (see RecordingChatModel) after a latency drawn
+    from `profile`. Requests without a recording are answered by the
+    StubChatModel rules, so every scenario runs without recordings too.
+    Supports streaming (word-sized chunks), bind_tools and structured output
+    (see bind_forced_tools).
+    """
+
+    recordings: Dict[str, str] = {}
+    profile: LatencyProfile = None
+    replayed: int = 0
+    synthesized: int = 0
+
+    def model_post_init(self, __context):
+        if self.profile is None:
+            self.profile = LatencyProfile()
+
+    @classmethod
+    def from_file(cls, path: Optional[str], **kwargs):
+        """Load a JSONL file written by RecordingChatModel (None or a missing file: no recordings)."""
+        recordings = {}
+        if path:
+            try:
+                with open(path) as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            recordings[entry["key"]] = entry["response"]
+            except FileNotFoundError:
+                pass
+        return cls(recordings=recordings, **kwargs)
+
+    @property
+    def _llm_type(self):
+        return "replay-fake"
+
+    def bind_tools(self, tools, tool_choice=None, **kwargs):
+        return bind_forced_tools(self, tools, tool_choice)
+
+    def _message(self, messages, tools):
+        prompt = str(messages[-1].content)
+        content = self._answer(messages)
+        if tools:
+            try:
+                # Recordings of forced tool calls hold the call's arguments.
+                args = json.loads(content)
+            except ValueError:
+                args = None
+            if not isinstance(args, dict):
+                args = forced_call_args(tools[0], prompt, content)
+            message = forced_call(tools[0], args)
+        else:
+            message = AIMessage(content=content)
+        message.usage_metadata = _usage(prompt, content)
+        return message
+
+    def _answer(self, messages):
+        recorded = self.recordings.get(prompt_key(messages))
+        if recorded is not None:
+            self.replayed += 1
+            return recorded
+        self.synthesized += 1
+        return StubChatModel._respond(str(messages[-1].content))
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        time.sleep(self.profile.sample())
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, tools))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        import asyncio
+
+        await asyncio.sleep(self.profile.sample())
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, tools))])
+
+    def _stream(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        # The sampled latency is the time to the first token; the rest streams at once.
+        time.sleep(self.profile.sample())
+        if tools:
+            call = self._message(messages, tools).tool_calls[0]
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content="", tool_call_chunks=[{"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": 0}]
+            ))
+            return
+        for word in re.findall(r"\S*\s*", self._answer(messages)):
+            if word:
+                chunk = ChatGenerationChunk(message=AIMessageChunk(content=word))
+                if run_manager:
+                    run_manager.on_llm_new_token(word, chunk=chunk)
+                yield chunk
+
+
+class RecordingChatModel(BaseChatModel):
+    """Passes every request to `model` and appends the response to the JSONL file at `path`."""
+
+    model: BaseChatModel
+    path: str
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self):
+        return self.model._llm_type
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(**self.model.bind_tools(tools, **kwargs).kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        result = self.model._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        message = result.generations[0].message
+        # A forced tool call (structured output) is recorded as its arguments.
+        response = json.dumps(message.tool_calls[0]["args"]) if message.tool_calls else message.content
+        entry = {"key": prompt_key(messages), "prompt": str(messages[-1].content), "response": response}
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        return result
+
+
+class FakeSearchBackend:
+    """
+    Stand-in for the Gemini web search: answers after `latency` seconds and
+    counts how many searches actually reached the backend.
+    """
+
+    def __init__(self, latency=0.2, failure_rate=0.0, seed=0, profile=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.profile = profile
+        self.calls = 0
+        self._rng = random.Random(seed)
+
+    def _delay(self):
+        return self.profile.sample() if self.profile else self.latency
+
+    def _answer(self, query):
+        self.calls += 1
+        if self._rng.random() < self.failure_rate:
+            raise QuotaExceeded("429 Resource has been exhausted")
+        return f"Search results for: {query}"
+
+    def __call__(self, query):
+        time.sleep(self._delay())
+        return self._answer(query)
+
+    async def asearch(self, query):
+        import asyncio
+
+        await asyncio.sleep(self._delay())
+        return self._answer(query)
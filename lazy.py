@@ -0,0 +1,23 @@
+# lazy.py
+"""
+Process-wide objects built on first use. Importing a module that declares
+one stays cheap, and concurrent first callers (API workers' threads,
+Streamlit reruns) still get a single instance.
+"""
+
+import functools
+import threading
+
+
+def singleton(build):
+    """Build the object on first call (once, even under concurrent callers), then reuse it."""
+    lock, built = threading.Lock(), []
+
+    @functools.wraps(build)
+    def get():
+        if not built:
+            with lock:
+                if not built:
+                    built.append(build())
+        return built[0]
+    return get
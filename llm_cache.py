@@ -0,0 +1,160 @@
+# llm_cache.py
+"""
+Persistent, content-addressed cache for LLM responses.
+Entries live in a local SQLite file and are keyed by a hash of the model
+configuration (model name + generation params) and the normalized messages.
+The cache is size-bounded (least-recently-used entries are evicted first)
+and entries can optionally expire after a TTL.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import messages_from_dict, messages_to_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+_bypass = ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_cache():
+    """
+    Skip cache lookups for every LLM call made inside this block
+    (e.g. when the recruiter clicks "regenerate"). The fresh response
+    still replaces the stored entry.
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def cache_bypassed():
+    """True inside a bypass_cache() block; other local reuse layers honour it too."""
+    return _bypass.get()
+
+
+def cache_key(prompt, llm_string):
+    """Hash the model configuration and the whitespace-normalized prompt."""
+    normalized = " ".join(prompt.split())
+    return hashlib.sha256(f"{llm_string}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+class SQLiteLRUCache(BaseCache):
+    def __init__(self, path="llm_cache.sqlite", max_bytes=100 * 1024 * 1024, ttl=None):
+        """
+        Parameters
+        ----------
+        path : str
+            SQLite file that holds the entries (":memory:" for a throwaway cache).
+        max_bytes : int
+            Upper bound on the total size of stored responses. The least
+            recently used entries are evicted once it is exceeded.
+        ttl : float | None
+            Seconds after which an entry is considered stale. None keeps
+            entries until they are evicted.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_lru ON llm_cache (last_access)")
+        self._conn.commit()
+
+    def lookup(self, prompt, llm_string):
+        if _bypass.get():
+            return None
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return _loads(row[0])
+
+    def update(self, prompt, llm_string, return_val):
+        key = cache_key(prompt, llm_string)
+        value = _dumps(return_val)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def clear(self, **kwargs):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def _evict(self):
+        # A write only pays for an eviction scan when it pushed the cache over budget.
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access ASC"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", stale)
+        self.evictions += len(stale)
+
+def _dumps(generations):
+    return json.dumps([
+        {"message": messages_to_dict([g.message])[0]} if isinstance(g, ChatGeneration) else {"text": g.text}
+        for g in generations
+    ])
+
+
+def _loads(value):
+    # generation_info marks the result as served from the cache, for the metrics callbacks.
+    return [
+        ChatGeneration(message=messages_from_dict([g["message"]])[0], generation_info={"cache_hit": True})
+        if "message" in g else Generation(text=g["text"], generation_info={"cache_hit": True})
+        for g in json.loads(value)
+    ]
@@ -1,5 +1,8 @@
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from llm_cache import SQLiteLRUCache
+from search_cache import SearchCache
+from scheduler import RequestScheduler, ScheduledChatModel
+from lazy import singleton
 import os
 
 # Load environment variables from .env file
@@ -8,4 +11,69 @@ load_dotenv()
 # Get the GEMINI_KEY environment variable
 GEMINI_KEY = os.getenv("GEMINI_KEY")
 
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", google_api_key=GEMINI_KEY)
\ No newline at end of file
+# Identical prompts are answered from a local response cache.
+# Wrap a call in llm_cache.bypass_cache() to force a fresh generation.
+llm_cache = SQLiteLRUCache(
+    path=os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite"),
+    max_bytes=int(os.getenv("LLM_CACHE_MAX_MB", "100")) * 1024 * 1024,
+    ttl=float(os.getenv("LLM_CACHE_TTL")) if os.getenv("LLM_CACHE_TTL") else None,
+)
+
+# Every Gemini request (chat and web search) goes through one scheduler that
+# enforces the quota and retries 429/5xx errors, so the client's own retries are off.
+scheduler = RequestScheduler(
+    rpm=int(os.getenv("GEMINI_RPM", "15")),
+    tpm=int(os.getenv("GEMINI_TPM", "1000000")),
+    max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "5")),
+)
+
+
+
+# Ordered list of models: the first serves requests, slow requests are hedged
+# on the second, and failures fall back down the list (see model_router.py).
+GEMINI_MODELS = [m.strip() for m in os.getenv("GEMINI_MODELS", "gemini-1.5-flash").split(",") if m.strip()]
+
+
+def _gemini():
+    # Imported here: the Google SDK takes about a second to import, which
+    # would otherwise be paid by every process before it needs the model.
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from model_router import ModelRouter
+
+    models = [ChatGoogleGenerativeAI(model=name, google_api_key=GEMINI_KEY, max_retries=1) for name in GEMINI_MODELS]
+    if len(models) == 1:
+        return models[0]
+    return ModelRouter(
+        models=models,
+        scheduler=scheduler,
+        hedging=os.getenv("HEDGE_REQUESTS", "0") == "1",
+        hedge_quantile=float(os.getenv("HEDGE_QUANTILE", "0.95")),
+        initial_hedge_delay=float(os.getenv("HEDGE_INITIAL_DELAY", "2.0")),
+    )
+
+
+llm = ScheduledChatModel(
+    model_factory=_gemini,
+    scheduler=scheduler,
+    cache=llm_cache,
+)
+
+# Web-search results are shared across sessions for SEARCH_CACHE_TTL seconds,
+# and identical concurrent searches are sent only once.
+search_cache = SearchCache(
+    ttl=float(os.getenv("SEARCH_CACHE_TTL", "900")),
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "512")),
+)
+
+
+@singleton
+def get_search_model():
+    """
+    Process-wide Gemini model used for web search. Built once so every
+    search (sync or async) reuses the same configured client connections.
+    """
+    import google.generativeai as genai
+
+    if GEMINI_KEY:
+        genai.configure(api_key=GEMINI_KEY)
+    return genai.GenerativeModel(model_name="gemini-1.5-flash")
@@ -0,0 +1,309 @@
+# model_router.py
+"""
+Chat model that spreads requests over an ordered list of models.
+The first model serves every request. If it has not answered after its
+hedge delay, the same request is also sent to the next model and whichever
+answers first is used (a hedged request). If a model fails, the request
+falls back to the next model in the list. The hedge delay adapts: it is
+the `hedge_quantile` of the model's recent latencies, so only the slowest
+few percent of requests are duplicated.
+To hedge against a second endpoint of the same model, list it twice.
+
+Every hedge or fallback attempt is admitted by `scheduler` like any other
+request, so it counts against the RPM/TPM budgets. A rate-limit (429)
+error never falls back: it is raised so the scheduler backs off and
+retries.
+"""
+
+import asyncio
+import bisect
+import contextvars
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from pydantic import PrivateAttr
+
+from scheduler import astreams, estimate_tokens, is_rate_limited, single_chunk, streams
+
+# Upper bounds (seconds) of the per-model latency histogram; the last bucket is +Inf.
+BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+
+# Requests run on a shared pool so the caller can wait on the first and the
+# hedge at once. It must be large enough that requests never queue here, or
+# the queueing itself would trigger hedges.
+_pool = ThreadPoolExecutor(max_workers=int(os.getenv("MODEL_ROUTER_THREADS", "64")), thread_name_prefix="model-router")
+
+
+def model_name(model: BaseChatModel, index: int) -> str:
+    name = getattr(model, "model", None) or getattr(model, "model_name", None)
+    return f"{index}:{name if isinstance(name, str) else model._llm_type}"
+
+
+class LatencyStats:
+    """Latency histogram plus a window of recent samples for quantiles."""
+
+    def __init__(self, window=500):
+        self.recent = deque(maxlen=window)
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.calls = 0
+        self.errors = 0
+        self.wins = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record(self, seconds):
+        self.recent.append(seconds)
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def quantile(self, q):
+        values = sorted(self.recent)
+        return values[min(len(values) - 1, math.ceil(q * len(values)) - 1)] if values else 0.0
+
+
+class ModelRouter(BaseChatModel):
+    """
+    Hedged requests and ordered fallback over `models`. Behaves like a single
+    chat model (invoke, async, stream, bind_tools); wrap it in
+    ScheduledChatModel for rate limiting, retries and caching, and pass the
+    same `scheduler` here so the extra attempts are admitted too.
+    """
+
+    models: List[BaseChatModel]
+    scheduler: Any = None
+    hedging: bool = False
+    hedge_quantile: float = 0.95
+    # Used until a model has `min_samples` latencies, then clamped to [min, max].
+    initial_hedge_delay: float = 2.0
+    min_hedge_delay: float = 0.05
+    max_hedge_delay: float = 30.0
+    min_samples: int = 20
+    window: int = 500
+
+    _stats: List[LatencyStats] = PrivateAttr(default_factory=list)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context):
+        if not self.models:
+            raise ValueError("ModelRouter needs at least one model")
+        self._stats = [LatencyStats(self.window) for _ in self.models]
+
+    @property
+    def _llm_type(self):
+        return self.models[0]._llm_type
+
+    @property
+    def _identifying_params(self):
+        # The primary model's parameters, so cached responses stay valid when fallbacks change.
+        return self.models[0]._identifying_params
+
+    def bind_tools(self, tools, **kwargs):
+        # Tools are formatted for the primary model; the fallbacks should accept the same format.
+        return self.bind(**self.models[0].bind_tools(tools, **kwargs).kwargs)
+
+    def hedge_delay(self, index: int) -> float:
+        """Seconds to wait for model `index` before hedging on the next one."""
+        with self._lock:
+            stats = self._stats[index]
+            if len(stats.recent) < self.min_samples:
+                return self.initial_hedge_delay
+            return min(self.max_hedge_delay, max(self.min_hedge_delay, stats.quantile(self.hedge_quantile)))
+
+    def _done(self, index, started, error=None):
+        with self._lock:
+            stats = self._stats[index]
+            stats.calls += 1
+            if error is None:
+                stats.record(time.perf_counter() - started)
+            else:
+                stats.errors += 1
+
+    def _won(self, index, hedge, result):
+        with self._lock:
+            self._stats[index].wins += 1
+            self._stats[index].hedge_wins += hedge
+        result.llm_output = {**(result.llm_output or {}), "model": model_name(self.models[index], index), "hedged": hedge}
+        return result
+
+    def _timed(self, index, messages, stop, kwargs, extra):
+        # The first attempt was admitted by the caller; hedges and fallbacks are charged here.
+        if extra and self.scheduler is not None:
+            self.scheduler.acquire(estimate_tokens(messages))
+        started = time.perf_counter()
+        try:
+            result = self.models[index]._generate(messages, stop=stop, **kwargs)
+        except Exception as e:
+            self._done(index, started, e)
+            raise
+        self._done(index, started)
+        return result
+
+    async def _atimed(self, index, messages, stop, kwargs, extra):
+        if extra and self.scheduler is not None:
+            await self.scheduler.aacquire(estimate_tokens(messages))
+        started = time.perf_counter()
+        try:
+            result = await self.models[index]._agenerate(messages, stop=stop, **kwargs)
+        except asyncio.CancelledError:
+            raise  # a hedge that lost; its latency is unknown
+        except Exception as e:
+            self._done(index, started, e)
+            raise
+        self._done(index, started)
+        return result
+
+    def _submit(self, index, messages, stop, kwargs, extra):
+        # The copied context carries the caller's scheduler lane into the pool thread.
+        return _pool.submit(contextvars.copy_context().run, self._timed, index, messages, stop, kwargs, extra)
+
+    @staticmethod
+    def _raise(errors):
+        raise next((e for e in errors if is_rate_limited(e)), errors[-1])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        # Inner calls get no run_manager: callbacks fire once, for this model.
+        waiting, errors = list(range(len(self.models))), []
+        while waiting:
+            first = waiting.pop(0)
+            running = {self._submit(first, messages, stop, kwargs, bool(errors)): (first, False)}
+            hedged = False
+            while running:
+                timeout = self.hedge_delay(first) if self.hedging and waiting and not hedged else None
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    backup = waiting.pop(0)
+                    with self._lock:
+                        self._stats[backup].hedges += 1
+                    running[self._submit(backup, messages, stop, kwargs, True)] = (backup, True)
+                    hedged = True
+                    continue
+                for future in done:
+                    index, hedge = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        errors.append(e)
+                        if is_rate_limited(e):
+                            waiting.clear()
+                        continue
+                    for other in running:
+                        other.cancel()
+                    return self._won(index, hedge, result)
+        self._raise(errors)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        waiting, errors = list(range(len(self.models))), []
+        while waiting:
+            first = waiting.pop(0)
+            running = {asyncio.ensure_future(self._atimed(first, messages, stop, kwargs, bool(errors))): (first, False)}
+            hedged = False
+            try:
+                while running:
+                    timeout = self.hedge_delay(first) if self.hedging and waiting and not hedged else None
+                    done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                    if not done:
+                        backup = waiting.pop(0)
+                        with self._lock:
+                            self._stats[backup].hedges += 1
+                        running[asyncio.ensure_future(self._atimed(backup, messages, stop, kwargs, True))] = (backup, True)
+                        hedged = True
+                        continue
+                    for task in done:
+                        index, hedge = running.pop(task)
+                        if task.exception() is not None:
+                            errors.append(task.exception())
+                            if is_rate_limited(task.exception()):
+                                waiting.clear()
+                            continue
+                        return self._won(index, hedge, task.result())
+            finally:
+                for task in running:
+                    task.cancel()
+        self._raise(errors)
+
+    @staticmethod
+    def _chunks(model, messages, stop, run_manager, kwargs):
+        # A model without a streaming API answers in one chunk.
+        if streams(model):
+            yield from model._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+        else:
+            yield single_chunk(model._generate(messages, stop=stop, **kwargs), run_manager)
+
+    @staticmethod
+    async def _achunks(model, messages, stop, run_manager, kwargs):
+        if astreams(model):
+            async for chunk in model._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+        else:
+            yield single_chunk(await model._agenerate(messages, stop=stop, **kwargs), run_manager)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        # Streams are not hedged; a model that fails before its first chunk falls back to the next.
+        errors = []
+        for index, model in enumerate(self.models):
+            if errors and self.scheduler is not None:
+                self.scheduler.acquire(estimate_tokens(messages))
+            started, streamed = time.perf_counter(), False
+            try:
+                for chunk in self._chunks(model, messages, stop, run_manager, kwargs):
+                    streamed = True
+                    yield chunk
+            except Exception as e:
+                self._done(index, started, e)
+                if streamed or is_rate_limited(e):
+                    raise
+                errors.append(e)
+                continue
+            self._done(index, started)
+            with self._lock:
+                self._stats[index].wins += 1
+            return
+        raise errors[-1]
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        errors = []
+        for index, model in enumerate(self.models):
+            if errors and self.scheduler is not None:
+                await self.scheduler.aacquire(estimate_tokens(messages))
+            started, streamed = time.perf_counter(), False
+            try:
+                async for chunk in self._achunks(model, messages, stop, run_manager, kwargs):
+                    streamed = True
+                    yield chunk
+            except Exception as e:
+                self._done(index, started, e)
+                if streamed or is_rate_limited(e):
+                    raise
+                errors.append(e)
+                continue
+            self._done(index, started)
+            with self._lock:
+                self._stats[index].wins += 1
+            return
+        raise errors[-1]
+
+    def stats(self):
+        """Per-model calls, errors, wins, hedges, latency quantiles and histogram, plus the current hedge delay."""
+        report = {}
+        for index, model in enumerate(self.models):
+            delay = self.hedge_delay(index)
+            with self._lock:
+                s = self._stats[index]
+                report[model_name(model, index)] = {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "wins": s.wins,
+                    "hedges": s.hedges,
+                    "hedge_wins": s.hedge_wins,
+                    "p50": round(s.quantile(0.5), 4),
+                    "p95": round(s.quantile(0.95), 4),
+                    "p99": round(s.quantile(0.99), 4),
+                    "hedge_delay": round(delay, 4),
+                    "histogram": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], s.buckets)),
+                }
+        return report
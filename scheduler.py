@@ -0,0 +1,452 @@
+# scheduler.py
+"""
+Central request scheduler for Gemini calls.
+Every LLM and web-search request passes through one RequestScheduler that
+enforces requests-per-minute and tokens-per-minute budgets (token buckets),
+lets interactive work jump ahead of bulk work (priority lanes), and retries
+429/5xx failures with jittered exponential backoff.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from pydantic import PrivateAttr
+
+# Lower value = served first.
+LANES = {"interactive": 0, "default": 1, "bulk": 2}
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+_lane = ContextVar("scheduler_lane", default="default")
+_last_wait = ContextVar("scheduler_last_wait", default=0.0)
+
+
+@contextmanager
+def lane(name):
+    """Run every scheduled call inside this block in the given priority lane."""
+    if name not in LANES:
+        raise ValueError(f"Unknown lane '{name}', expected one of {list(LANES)}")
+    token = _lane.set(name)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def last_wait():
+    """Seconds the most recent call in this context spent queued."""
+    return _last_wait.get()
+
+
+RATE_LIMIT_MARKERS = ("429", "RESOURCE_EXHAUSTED", "Resource has been exhausted")
+
+
+def _error_matches(exc, statuses, markers):
+    """True when `exc`, or an exception it wraps, has one of `statuses` or mentions one of `markers`."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        for attr in ("code", "status_code", "status"):
+            value = getattr(exc, attr, None)
+            if callable(value):
+                try:
+                    value = value()
+                except Exception:
+                    value = None
+            value = getattr(value, "value", value)  # grpc StatusCode enums
+            if isinstance(value, tuple):
+                value = value[0]
+            if isinstance(value, int) and value in statuses:
+                return True
+        text = str(exc)
+        if any(marker in text for marker in markers):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def is_retryable(exc):
+    """True for quota (429) and server-side (5xx) errors, including wrapped ones."""
+    return _error_matches(exc, RETRYABLE_STATUS, RATE_LIMIT_MARKERS)
+
+
+def is_rate_limited(exc):
+    """True for quota (429) errors only: waiting helps, another model of the same quota does not."""
+    return _error_matches(exc, {429}, RATE_LIMIT_MARKERS)
+
+
+def streams(model) -> bool:
+    """True when `model` streams tokens; BaseChatModel's own _stream only raises NotImplementedError."""
+    return type(model)._stream is not BaseChatModel._stream
+
+
+def astreams(model) -> bool:
+    """Async counterpart of streams(); the default _astream runs _stream in a thread."""
+    return type(model)._astream is not BaseChatModel._astream or streams(model)
+
+
+def single_chunk(result, run_manager=None) -> ChatGenerationChunk:
+    """The whole answer of a model that cannot stream, as one chunk."""
+    generation = result.generations[0]
+    message = generation.message
+    chunk = AIMessageChunk(
+        content=message.content,
+        additional_kwargs=message.additional_kwargs,
+        response_metadata=message.response_metadata,
+        usage_metadata=getattr(message, "usage_metadata", None),
+        tool_call_chunks=[
+            {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+            for i, call in enumerate(getattr(message, "tool_calls", []))
+        ],
+        id=message.id,
+    )
+    if run_manager and message.content:
+        run_manager.on_llm_new_token(str(message.content), chunk=chunk)
+    return ChatGenerationChunk(message=chunk, generation_info=generation.generation_info)
+
+
+def estimate_tokens(messages, completion_tokens=512):
+    """Rough prompt size (~4 characters per token) plus a completion allowance."""
+    return sum(len(str(m.content)) for m in messages) // 4 + completion_tokens
+
+
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+
+class RequestScheduler:
+    def __init__(self, rpm=15, tpm=1_000_000, max_retries=5, base_delay=1.0, max_delay=30.0):
+        """
+        Parameters
+        ----------
+        rpm, tpm : int
+            Requests and tokens allowed per minute.
+        max_retries : int
+            Retries for 429/5xx failures before the error is raised.
+        base_delay, max_delay : float
+            Backoff bounds in seconds; the n-th retry waits a random time in
+            [0, min(max_delay, base_delay * 2**n)].
+        """
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._queue = []
+        self._waiters = {}
+        self._seq = itertools.count()
+        self._waits = {name: deque(maxlen=1000) for name in LANES}
+        self.retries = 0
+        self.failures = 0
+        self.completed = 0
+
+    def set_limits(self, rpm=None, tpm=None):
+        """Replace the per-minute budgets (e.g. for a batch run with its own quota)."""
+        with self._lock:
+            if rpm is not None:
+                self.requests = TokenBucket(rpm)
+            if tpm is not None:
+                self.tokens = TokenBucket(tpm)
+            self._wake()
+
+    # ---- admission -------------------------------------------------
+    #
+    # Only the ticket at the head of the queue ever sleeps on the buckets;
+    # everyone behind it blocks until the head changes (pop or abandon) or
+    # the budgets change, and is woken by `_wake`.
+
+    def _enqueue(self, waiter=None):
+        ticket = (LANES[_lane.get()], next(self._seq), _lane.get())
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+            if waiter is not None:
+                self._waiters[ticket] = waiter
+        return ticket
+
+    def _wake(self):
+        # Caller holds the lock. Threads re-check under the condition; an
+        # async waiter only needs a nudge once it reaches the head.
+        self._changed.notify_all()
+        if self._queue and (waiter := self._waiters.get(self._queue[0])):
+            loop, event = waiter
+            loop.call_soon_threadsafe(event.set)
+
+    def _try_admit(self, ticket, est_tokens):
+        """Admit `ticket` if it heads the queue and both buckets allow.
+
+        Returns None once admitted, `math.inf` while another ticket is ahead
+        and otherwise the bucket delay. The caller holds the lock.
+        """
+        if self._queue[0] != ticket:
+            return math.inf
+        now = time.monotonic()
+        delay = max(self.requests.wait_time(1, now), self.tokens.wait_time(est_tokens, now))
+        if delay > 0:
+            return delay
+        heapq.heappop(self._queue)
+        self._waiters.pop(ticket, None)
+        self.requests.take(1)
+        self.tokens.take(est_tokens)
+        self._wake()
+        return None
+
+    def _abandon(self, ticket):
+        # A caller interrupted while queued must not block everyone behind it.
+        with self._lock:
+            self._waiters.pop(ticket, None)
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._wake()
+
+    def _record_wait(self, ticket, started):
+        waited = time.monotonic() - started
+        self._waits[ticket[2]].append(waited)
+        _last_wait.set(waited)
+
+    def acquire(self, est_tokens=0):
+        ticket, started = self._enqueue(), time.monotonic()
+        try:
+            with self._changed:
+                while (delay := self._try_admit(ticket, est_tokens)) is not None:
+                    self._changed.wait(None if delay == math.inf else delay)
+        except BaseException:
+            self._abandon(ticket)
+            raise
+        self._record_wait(ticket, started)
+
+    async def aacquire(self, est_tokens=0):
+        event = asyncio.Event()
+        ticket, started = self._enqueue((asyncio.get_running_loop(), event)), time.monotonic()
+        try:
+            while True:
+                with self._lock:
+                    event.clear()
+                    delay = self._try_admit(ticket, est_tokens)
+                if delay is None:
+                    break
+                try:
+                    await asyncio.wait_for(event.wait(), None if delay == math.inf else delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._abandon(ticket)
+            raise
+        self._record_wait(ticket, started)
+
+    def record_usage(self, est_tokens, actual_tokens):
+        """Correct the token bucket once the real usage of a call is known."""
+        if actual_tokens:
+            with self._lock:
+                self.tokens.take(actual_tokens - est_tokens)
+                self._wake()
+
+    # ---- execution -------------------------------------------------
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _should_retry(self, exc, attempt):
+        if attempt >= self.max_retries or not is_retryable(exc):
+            self.failures += 1
+            return False
+        self.retries += 1
+        return True
+
+    def run(self, fn, est_tokens=0):
+        """Call `fn()` once admitted, retrying 429/5xx errors."""
+        for attempt in itertools.count():
+            self.acquire(est_tokens)
+            try:
+                result = fn()
+            except Exception as exc:
+                if not self._should_retry(exc, attempt):
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            self.completed += 1
+            return result
+
+    async def arun(self, coro_fn, est_tokens=0):
+        """Async counterpart of run; `coro_fn()` must return an awaitable."""
+        for attempt in itertools.count():
+            await self.aacquire(est_tokens)
+            try:
+                result = await coro_fn()
+            except Exception as exc:
+                if not self._should_retry(exc, attempt):
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            self.completed += 1
+            return result
+
+    def run_stream(self, gen_fn, est_tokens=0):
+        """Stream from `gen_fn()`; retries only happen before the first chunk."""
+        for attempt in itertools.count():
+            self.acquire(est_tokens)
+            stream = gen_fn()
+            try:
+                first = next(stream)
+            except StopIteration:
+                self.completed += 1
+                return
+            except Exception as exc:
+                if not self._should_retry(exc, attempt):
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            yield first
+            yield from stream
+            self.completed += 1
+            return
+
+    async def arun_stream(self, gen_fn, est_tokens=0):
+        """Async counterpart of run_stream."""
+        for attempt in itertools.count():
+            await self.aacquire(est_tokens)
+            stream = gen_fn()
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                self.completed += 1
+                return
+            except Exception as exc:
+                if not self._should_retry(exc, attempt):
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            yield first
+            async for chunk in stream:
+                yield chunk
+            self.completed += 1
+            return
+
+    # ---- metrics ---------------------------------------------------
+
+    def metrics(self):
+        with self._lock:
+            depth = {name: sum(1 for ticket in self._queue if ticket[2] == name) for name in LANES}
+        waits = {}
+        for name, samples in self._waits.items():
+            ordered = sorted(samples)
+            waits[name] = {
+                "count": len(ordered),
+                "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+                "p95": ordered[int(0.95 * (len(ordered) - 1))] if ordered else 0.0,
+                "max": ordered[-1] if ordered else 0.0,
+            }
+        return {
+            "queue_depth": depth,
+            "wait_seconds": waits,
+            "completed": self.completed,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+class ScheduledChatModel(BaseChatModel):
+    """
+    Chat model wrapper that sends every request of `model` through `scheduler`.
+    It behaves like the wrapped model (invoke, stream, bind_tools, async).
+    Pass `model_factory` instead of `model` to defer building the client (and
+    importing its SDK) until the first request.
+    """
+
+    model: Optional[BaseChatModel] = None
+    model_factory: Optional[Callable[[], BaseChatModel]] = None
+    scheduler: Any
+
+    _build_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def inner(self) -> BaseChatModel:
+        """The wrapped model, built by `model_factory` on first use."""
+        if self.model is None:
+            with self._build_lock:
+                if self.model is None:
+                    if self.model_factory is None:
+                        raise ValueError("ScheduledChatModel needs a model or a model_factory")
+                    self.model = self.model_factory()
+        return self.model
+
+    @property
+    def _llm_type(self):
+        return self.inner._llm_type
+
+    @property
+    def _identifying_params(self):
+        return self.inner._identifying_params
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(**self.inner.bind_tools(tools, **kwargs).kwargs)
+
+    def _record(self, est_tokens, result):
+        usage = getattr(result.generations[0].message, "usage_metadata", None) if result.generations else None
+        self.scheduler.record_usage(est_tokens, (usage or {}).get("total_tokens"))
+        # Exposed to callbacks (on_llm_end) as response.llm_output["queue_wait"].
+        result.llm_output = {**(result.llm_output or {}), "queue_wait": last_wait()}
+        return result
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        est = estimate_tokens(messages)
+        result = self.scheduler.run(
+            lambda: self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs), est
+        )
+        return self._record(est, result)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        est = estimate_tokens(messages)
+        result = await self.scheduler.arun(
+            lambda: self.inner._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs), est
+        )
+        return self._record(est, result)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        if not streams(self.inner):
+            yield single_chunk(self._generate(messages, stop=stop, run_manager=run_manager, **kwargs), run_manager)
+            return
+        yield from self.scheduler.run_stream(
+            lambda: self.inner._stream(messages, stop=stop, run_manager=run_manager, **kwargs),
+            estimate_tokens(messages),
+        )
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        if not astreams(self.inner):
+            yield single_chunk(await self._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs), run_manager)
+            return
+        async for chunk in self.scheduler.arun_stream(
+            lambda: self.inner._astream(messages, stop=stop, run_manager=run_manager, **kwargs),
+            estimate_tokens(messages),
+        ):
+            yield chunk
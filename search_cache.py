@@ -0,0 +1,124 @@
+# search_cache.py
+"""
+In-process cache for web-search results.
+Queries are normalized (case, punctuation, filler words) so equivalent
+phrasings share an entry. Concurrent identical queries are single-flighted:
+the first caller runs the search and every other caller waits for its
+result instead of issuing a second request. Results expire after a TTL,
+since search answers go stale, and the cache holds at most `max_entries`
+(least-recently-used entries are evicted first).
+"""
+
+import asyncio
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+FILLER = {"a", "an", "the", "please", "what", "whats", "is", "are", "for", "of", "in", "me", "tell", "find", "search", "web"}
+
+
+def normalize_query(query):
+    """'What is the average salary for a Data Scientist?' -> 'average salary data scientist'."""
+    words = re.findall(r"[a-z0-9$]+", query.lower())
+    return " ".join(w for w in words if w not in FILLER) or " ".join(words)
+
+
+class SearchCache:
+    def __init__(self, ttl=900.0, max_entries=512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, result)
+        self._inflight = {}  # key -> Future shared by every waiter
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, key):
+        """(result, None, False) on a hit, else (None, future, True if this caller must run the search)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1], None, False
+                del self._entries[key]
+                self.expirations += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.shared += 1
+                return None, future, False
+            self.misses += 1
+            future = self._inflight[key] = Future()
+            return None, future, True
+
+    def _finish(self, key, future, result=None, error=None):
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is None:
+                self._entries[key] = (time.monotonic() + self.ttl, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        # Failures are handed to the waiters but never cached.
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def get(self, query, fetch):
+        """Result for `query`, calling fetch(query) only on a miss nobody else is already serving."""
+        key = normalize_query(query)
+        result, future, leader = self._lookup(key)
+        if future is None:
+            return result
+        if not leader:
+            return future.result()
+        try:
+            result = fetch(query)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def aget(self, query, afetch):
+        """Async counterpart of get(); waits on in-flight searches without blocking the loop."""
+        key = normalize_query(query)
+        result, future, leader = self._lookup(key)
+        if future is None:
+            return result
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await afetch(query)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            entries, inflight = len(self._entries), len(self._inflight)
+        lookups = self.hits + self.misses + self.shared
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_inflight": self.shared,
+            "hit_rate": (self.hits + self.shared) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": entries,
+            "inflight": inflight,
+        }
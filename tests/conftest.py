@@ -0,0 +1,36 @@
+# conftest.py
+"""
+Every test runs offline: the Gemini model and the web search are replaced by
+the stubs in benchmarks/fake_llm.py (through batch.use_fake_llm), and the
+checkpointer, caches and stores live in memory. The environment has to be
+set before agent.agent is first imported.
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("GEMINI_KEY", "test")
+os.environ["LLM_CACHE_PATH"] = ":memory:"
+os.environ["CHECKPOINTER"] = "memory"
+os.environ["ANALYTICS_SINK"] = "none"
+os.environ["SEARCH_CACHE_TTL"] = "0"
+
+import batch  # noqa: E402
+
+batch.use_fake_llm(0)
+
+
+@pytest.fixture
+def broken_jd(monkeypatch):
+    """The stub model, except that every JD generation fails."""
+    import llm_config
+    from benchmarks.fake_llm import StubChatModel
+
+    class BrokenJD(StubChatModel):
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            if str(messages[-1].content).startswith("Generate a detailed job description"):
+                raise ValueError("model unavailable")
+            return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    monkeypatch.setattr(llm_config.llm, "model", BrokenJD(latency=0))
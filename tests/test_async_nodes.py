@@ -0,0 +1,20 @@
+import asyncio
+import logging
+
+import agent.agent as agent
+
+
+def test_async_flow_matches_the_sync_one():
+    async def flow():
+        state = await agent.arun_role_to_questions("I need to hire a data engineer", "test-async")
+        assert state["clarification_questions"]
+        return await agent.arun_from_clarification("Skills: SQL", "Data Engineer", "test-async")
+
+    assert agent.job_description_text(asyncio.run(flow())).startswith("## Data Engineer")
+
+
+def test_failed_jd_is_logged(broken_jd, caplog):
+    with caplog.at_level(logging.ERROR, logger="agent.agent"):
+        state = agent.run_from_clarification("Skills: SQL", "Data Analyst", "test-failed-jd")
+    assert state["job_descriptions"]["Data Analyst"] == agent.JD_ERROR
+    assert "model unavailable" in caplog.text
@@ -0,0 +1,33 @@
+import os
+import tempfile
+
+import pytest
+
+import batch
+
+
+def test_thread_namespace_depends_on_the_input_file(tmp_path):
+    first, second = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    assert batch.thread_namespace(str(first)) == batch.thread_namespace(str(first))
+    assert batch.thread_namespace(str(first)) != batch.thread_namespace(str(second))
+
+
+def test_questions_are_limited_to_the_rows_own_roles():
+    namespace = batch.thread_namespace("questions.jsonl")
+    batch.process_row({"id": 1, "request": "I need to hire a data engineer and a designer"}, namespace)
+    result = batch.process_row({"id": 1, "request": "I need to hire a product manager"}, namespace)
+    assert list(result["questions"]) == result["roles"] == ["Product Manager"]
+
+
+def test_row_with_a_failed_jd_is_an_error(broken_jd):
+    with pytest.raises(RuntimeError, match="Data Analyst"):
+        batch.process_row({"id": 2, "role": "Data Analyst", "clarifications": "Skills: SQL"}, "test-failed")
+
+
+def test_row_with_clarifications_gets_its_jd():
+    result = batch.process_row({"id": 3, "role": "Data Analyst", "clarifications": "Skills: SQL"}, "test-jd")
+    assert result["jd"].startswith("## Data Analyst")
+
+
+def test_fake_runs_do_not_touch_the_real_checkpoints():
+    assert os.path.dirname(os.environ["CHECKPOINT_DB"]) == tempfile.gettempdir()
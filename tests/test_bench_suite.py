@@ -0,0 +1,20 @@
+from benchmarks.bench_suite import regressions
+
+BASELINE = {"scenarios": {"graph": {"p50_ms": 100.0, "p95_ms": 200.0, "peak_mb": 1.0, "ops_per_s": 10.0}}}
+
+
+def result(**changes):
+    return {"graph": {"p50_ms": 100.0, "p95_ms": 200.0, "peak_mb": 1.0, "ops_per_s": 10.0, **changes}}
+
+
+def test_results_within_the_tolerance_pass():
+    assert regressions(result(p95_ms=240.0, ops_per_s=8.0), BASELINE, 0.25) == []
+
+
+def test_slower_larger_or_lower_throughput_results_are_flagged():
+    found = regressions(result(p50_ms=130.0, peak_mb=2.0, ops_per_s=7.0), BASELINE, 0.25)
+    assert [line.split(":")[0] for line in found] == ["graph.p50_ms", "graph.peak_mb", "graph.ops_per_s"]
+
+
+def test_scenarios_missing_from_the_baseline_are_skipped():
+    assert regressions({"bulk": result()["graph"]}, BASELINE, 0.25) == []
@@ -0,0 +1,41 @@
+import operator
+import sqlite3
+from typing import Annotated, List, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from agent.checkpointer import RetentionSqliteSaver
+
+
+class Counter(TypedDict):
+    steps: Annotated[List[int], operator.add]
+
+
+def graph(saver):
+    builder = StateGraph(Counter)
+    builder.add_node("step", lambda state: {"steps": [len(state["steps"])]})
+    builder.add_edge(START, "step")
+    builder.add_edge("step", END)
+    return builder.compile(checkpointer=saver)
+
+
+def checkpoints(saver, thread_id):
+    return saver.conn.execute("SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", (thread_id,)).fetchone()[0]
+
+
+def test_each_thread_keeps_only_its_latest_checkpoints():
+    saver = RetentionSqliteSaver(sqlite3.connect(":memory:", check_same_thread=False), keep_last=3)
+    app = graph(saver)
+    for thread_id in ("a", "b"):
+        for _ in range(5):
+            app.invoke({"steps": []}, {"configurable": {"thread_id": thread_id}})
+    assert checkpoints(saver, "a") == checkpoints(saver, "b") == 3
+    # The newest state is intact after trimming.
+    assert app.get_state({"configurable": {"thread_id": "a"}}).values["steps"] == [0, 1, 2, 3, 4]
+
+
+def test_idle_threads_are_pruned():
+    saver = RetentionSqliteSaver(sqlite3.connect(":memory:", check_same_thread=False))
+    graph(saver).invoke({"steps": []}, {"configurable": {"thread_id": "idle"}})
+    assert saver.prune_idle(idle_ttl=-1) == 1
+    assert checkpoints(saver, "idle") == 0
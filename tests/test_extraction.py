@@ -0,0 +1,25 @@
+import pytest
+
+import agent.agent as agent
+from analytics import AnalyticsTracker, collect_metrics
+
+
+@pytest.mark.parametrize("placeholder", ["Not specified", "N/A", "unknown", "none", "TBD", "not mentioned."])
+def test_placeholders_do_not_complete_a_request(placeholder):
+    details = {"skills": "Python", "level": "Senior", "location": "Remote", "budget": "$150k"}
+    assert agent.HiringRequest(roles=["Engineer"], **details).is_complete()
+    assert not agent.HiringRequest(roles=["Engineer"], **{**details, "location": placeholder}).is_complete()
+
+
+def test_express_mode_is_opt_in():
+    state = agent.run_role_to_questions("Hire a senior backend engineer with Python and Go, remote, $150k", "test-express")
+    assert not agent.is_express(state)
+    assert state["clarification_questions"]
+
+
+def test_clarification_pause_is_not_a_node_error():
+    tracker = AnalyticsTracker()
+    with collect_metrics(tracker):
+        agent.run_role_to_questions("I need to hire a data engineer", "test-interrupt")
+    assert tracker.summary()["errors"] == 0
+
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from benchmarks.fake_llm import LatencyProfile, RecordingChatModel, ReplayChatModel, StubChatModel, prompt_key
+
+JD_PROMPT = "Generate a detailed job description for the role of Data Engineer based on the following clarifications"
+
+
+def test_latency_profile_is_seeded():
+    first, second = LatencyProfile(0.05, 0.5, "lognormal", 0.1, seed=7), LatencyProfile(0.05, 0.5, "lognormal", 0.1, seed=7)
+    assert [first.sample() for _ in range(20)] == [second.sample() for _ in range(20)]
+    assert LatencyProfile(0.05).sample() == 0.05
+    with pytest.raises(ValueError):
+        LatencyProfile(distribution="pareto")
+
+
+def test_stub_answers_the_flow_prompts():
+    jd = StubChatModel(latency=0).invoke([HumanMessage(content=JD_PROMPT)]).content
+    assert jd.startswith("## Data Engineer")
+
+
+def test_recorded_responses_are_replayed(tmp_path):
+    path = str(tmp_path / "recordings.jsonl")
+    messages = [HumanMessage(content=JD_PROMPT)]
+    RecordingChatModel(model=StubChatModel(latency=0), path=path).invoke(messages)
+    with open(path) as f:
+        assert json.loads(f.readline())["key"] == prompt_key(messages)
+
+    replay = ReplayChatModel.from_file(path, profile=LatencyProfile(0))
+    assert replay.invoke(messages).content.startswith("## Data Engineer")
+    replay.invoke([HumanMessage(content="Write one or two warm sentences for Ana")])
+    assert (replay.replayed, replay.synthesized) == (1, 1)
+
+
+def test_replay_streams_word_chunks():
+    replay = ReplayChatModel(profile=LatencyProfile(0))
+    chunks = [chunk.content for chunk in replay.stream([HumanMessage(content=JD_PROMPT)])]
+    assert len(chunks) > 1 and "".join(chunks).startswith("## Data Engineer")
@@ -0,0 +1,14 @@
+from agent.followup import run_followup, select_tool
+from agent.router import routed_locally
+
+
+def test_followup_replaces_only_the_artifact_it_targets():
+    artifacts = {"jd": "## Data Engineer\n- SQL", "email": "", "checklist": "", "offer_letter": ""}
+    reply = run_followup("Write an interview email to Ana Costa", artifacts)
+    assert reply["tool"] == "write_outreach_email" and reply["artifact"] == "email"
+    assert artifacts["email"] == reply["output"] and reply["previous"] == ""
+    assert artifacts["jd"] == "## Data Engineer\n- SQL"
+
+
+def test_local_routing_is_recognized():
+    assert routed_locally(select_tool("Write an interview email to Ana Costa", {"jd": "## Data Engineer"}))
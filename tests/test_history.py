@@ -0,0 +1,25 @@
+from langchain_core.messages import AIMessage, HumanMessage
+
+import agent.agent as agent
+
+
+def test_compaction_keeps_the_current_step(monkeypatch):
+    monkeypatch.setattr(agent, "MAX_HISTORY_TOKENS", 100)
+    left = [HumanMessage(content=f"turn {i} " * 20) for i in range(10)]
+    right = [AIMessage(content="## Backend Engineer\n" + "detail " * 200)]  # alone over the budget
+    compacted = agent.compact_messages(left, right)
+    assert compacted[0].name == agent.HISTORY_SUMMARY
+    assert compacted[-1] is right[0]
+    assert len(compacted) < len(left) + len(right)
+
+
+def test_history_under_the_budget_is_kept_as_is():
+    left, right = [HumanMessage(content="hi")], [AIMessage(content="hello")]
+    assert agent.compact_messages(left, right) == left + right
+
+
+def test_jd_survives_a_small_history_budget(monkeypatch):
+    monkeypatch.setattr(agent, "MAX_HISTORY_TOKENS", 60)
+    for _ in range(3):
+        state = agent.run_from_clarification("Skills: Go " * 50, "Backend Engineer", "test-compaction")
+    assert agent.job_description_text(state).startswith("## Backend Engineer")
@@ -0,0 +1,10 @@
+from agent.jd_index import JDIndex
+
+
+def test_jd_is_reused_only_for_the_same_role_and_answers():
+    index = JDIndex()
+    index.add("Backend Engineer", "Location: Berlin\nLevel: Senior", "berlin jd")
+    assert index.exact("backend engineer", "location: berlin  level: senior")["jd"] == "berlin jd"
+    assert index.exact("Backend Engineer", "Location: Munich\nLevel: Senior") is None
+    # Similar requests still find it as an example.
+    assert index.search("Backend Engineer", "Location: Munich\nLevel: Senior", k=1)[0][1]["jd"] == "berlin jd"
@@ -0,0 +1,59 @@
+import itertools
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from llm_cache import SQLiteLRUCache, bypass_cache
+
+
+def generations(text):
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def test_lookup_ignores_whitespace_and_marks_cache_hits():
+    cache = SQLiteLRUCache(":memory:")
+    cache.update("hello  world", "model", generations("hi"))
+    hit = cache.lookup("hello world", "model")
+    assert hit[0].message.content == "hi" and hit[0].generation_info["cache_hit"]
+    assert cache.lookup("hello world", "other model") is None
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr("llm_cache.time.time", lambda: next(clock))
+    cache = SQLiteLRUCache(":memory:")
+    cache.update("a", "m", generations("x" * 100))
+    size = cache.stats()["bytes"]
+    cache.max_bytes = 2 * size
+    cache.update("b", "m", generations("x" * 100))
+    cache.lookup("a", "m")  # "b" is now the least recently used
+    cache.update("c", "m", generations("x" * 100))
+    assert cache.lookup("b", "m") is None
+    assert cache.lookup("a", "m") is not None and cache.lookup("c", "m") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_misses():
+    cache = SQLiteLRUCache(":memory:", ttl=-1)
+    cache.update("a", "m", generations("x"))
+    assert cache.lookup("a", "m") is None
+
+
+def test_bypass_skips_lookups():
+    cache = SQLiteLRUCache(":memory:")
+    cache.update("a", "m", generations("x"))
+    with bypass_cache():
+        assert cache.lookup("a", "m") is None
+
+
+def test_eviction_drops_only_enough_old_entries_to_fit(monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr("llm_cache.time.time", lambda: next(clock))
+    cache = SQLiteLRUCache(":memory:")
+    for key in "abcd":
+        cache.update(key, "m", generations("x" * 100))
+    size = cache.stats()["bytes"] // 4
+    cache.max_bytes = 3 * size
+    cache.update("e", "m", generations("x" * 100))
+    assert [cache.lookup(key, "m") is not None for key in "abcde"] == [False, False, True, True, True]
+    assert cache.stats()["bytes"] <= cache.max_bytes
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from benchmarks.fake_llm import FlakyChatModel, QuotaExceeded
+from model_router import ModelRouter
+from scheduler import is_rate_limited, is_retryable
+
+MESSAGES = [HumanMessage(content="hello")]
+
+
+class ServerError(Exception):
+    code = 503
+
+
+class BadRequest(Exception):
+    code = 400
+
+
+class Down(FlakyChatModel):
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise ServerError("503 unavailable")
+
+
+class CountingScheduler:
+    def __init__(self):
+        self.admitted = 0
+
+    def acquire(self, est_tokens=0):
+        self.admitted += 1
+
+    async def aacquire(self, est_tokens=0):
+        self.admitted += 1
+
+
+def test_hedging_is_opt_in():
+    assert not ModelRouter(models=[FlakyChatModel(failure_rate=0)]).hedging
+
+
+def test_server_error_falls_back_and_the_fallback_is_admitted():
+    scheduler = CountingScheduler()
+    router = ModelRouter(models=[Down(), FlakyChatModel(failure_rate=0, response="backup")], scheduler=scheduler)
+    assert router.invoke(MESSAGES).content == "backup"
+    assert asyncio.run(router.ainvoke(MESSAGES)).content == "backup"
+    # The first attempt is admitted by the caller; each fallback is charged here.
+    assert scheduler.admitted == 2
+
+
+def test_rate_limit_is_raised_for_backoff_instead_of_falling_back():
+    scheduler = CountingScheduler()
+    backup = FlakyChatModel(failure_rate=0)
+    router = ModelRouter(models=[FlakyChatModel(failure_rate=1), backup], scheduler=scheduler)
+    with pytest.raises(QuotaExceeded) as raised:
+        router.invoke(MESSAGES)
+    assert is_rate_limited(raised.value)
+    assert router.stats()["1:flaky-fake"]["calls"] == 0 and scheduler.admitted == 0
+
+
+def test_rate_limits_are_retryable_but_only_429_is_rate_limited():
+    assert is_retryable(QuotaExceeded("429 Resource has been exhausted")) and is_rate_limited(QuotaExceeded("quota"))
+    assert is_retryable(ServerError("unavailable")) and not is_rate_limited(ServerError("unavailable"))
+    assert not is_retryable(BadRequest("bad")) and not is_rate_limited(BadRequest("bad"))
+
+
+def test_wrapped_rate_limit_is_found_through_the_cause():
+    try:
+        try:
+            raise QuotaExceeded("quota")
+        except QuotaExceeded as inner:
+            raise RuntimeError("call failed") from inner
+    except RuntimeError as outer:
+        assert is_rate_limited(outer)
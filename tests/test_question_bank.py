@@ -0,0 +1,25 @@
+from agent.question_bank import QuestionBank, normalize_role, similarity
+
+
+def bank(*roles):
+    questions = QuestionBank(":memory:")
+    for role in roles:
+        questions.add(role, [f"What does a {role} need?"])
+    return questions
+
+
+def test_similar_titles_share_questions():
+    assert normalize_role("Sr. Backend Engineers") == "backend engineer"
+    assert similarity("backend enginer", "backend engineer") >= 0.8
+    questions = bank("Backend Engineer")
+    assert questions.lookup("Senior backend eng") == ["What does a Backend Engineer need?"]
+    assert questions.lookup("Product Designer") is None
+
+
+def test_roles_in_returns_the_stored_titles():
+    questions = bank("Backend Engineer", "Data Scientist")
+    assert questions.roles_in("I need to hire a Backend Enginer") == ["Backend Engineer"]
+    assert questions.roles_in("we need a sr backend engineers and a data scientist") == [
+        "Senior Backend Engineer", "Data Scientist",
+    ]
+    assert questions.roles_in("I need to hire a backend engineer and a designer") is None
@@ -0,0 +1,35 @@
+import pytest
+
+from agent.router import classify, route, target_artifact
+
+ARTIFACTS = {"jd": "## Backend Engineer", "email": "Dear Ana", "checklist": "- screen", "offer_letter": "Dear Ana"}
+
+
+@pytest.mark.parametrize("text, tool", [
+    ("write an interview email to Ana Costa", "write_outreach_email"),
+    ("create a hiring checklist", "generate_checklist"),
+    ("search the web for average backend engineer salary in Berlin", "google_web_search"),
+    ("generate offer letter for John Doe with salary $120,000", "generate_offer_letter"),
+    ("make the email shorter", "edit_content"),
+])
+def test_confident_requests_are_routed_locally(text, tool):
+    call = route(text, ARTIFACTS)
+    assert call is not None and call.tool_calls[0]["name"] == tool
+
+
+def test_edit_verb_with_an_artifact_outscores_generation():
+    tool, score, margin = classify("update the checklist to add a reference check")
+    assert tool == "edit_content" and margin > 0
+
+
+def test_target_is_the_artifact_named_after_the_edit_verb():
+    assert target_artifact("update the email to link to the job description") == "email"
+    assert target_artifact("make the job description shorter") == "jd"
+
+
+def test_edit_naming_several_artifacts_is_left_to_the_llm():
+    assert route("update the email to link to the job description", ARTIFACTS) is None
+
+
+def test_offer_letter_without_a_salary_is_left_to_the_llm():
+    assert route("generate offer letter for John Doe", ARTIFACTS) is None
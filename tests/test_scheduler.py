@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from benchmarks.fake_llm import QuotaExceeded
+from scheduler import RequestScheduler, TokenBucket, _lane, lane
+
+
+class ServerError(Exception):
+    code = 503
+
+
+class BadRequest(Exception):
+    code = 400
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(60)  # one token per second
+    assert bucket.wait_time(60, bucket.updated) == 0.0
+    bucket.take(60)
+    assert bucket.wait_time(1, bucket.updated) == pytest.approx(1.0)
+
+
+def test_run_retries_retryable_errors():
+    scheduler = RequestScheduler(rpm=10 ** 6, base_delay=0.001, max_delay=0.001)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise QuotaExceeded("429")
+        return "ok"
+
+    assert scheduler.run(flaky) == "ok"
+    assert len(calls) == 3 and scheduler.retries == 2
+
+
+def test_run_raises_other_errors_at_once():
+    scheduler = RequestScheduler(rpm=10 ** 6, base_delay=0.001)
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise BadRequest("bad")
+
+    with pytest.raises(BadRequest):
+        scheduler.run(broken)
+    assert len(calls) == 1 and scheduler.failures == 1
+
+
+def test_queued_callers_are_served_in_lane_order():
+    scheduler = RequestScheduler(rpm=60)  # one admission per second once the burst is spent
+    scheduler.requests.take(60)
+    order = []
+
+    class Recording(TokenBucket):
+        def take(self, amount):
+            order.append(_lane.get())  # admissions run under the scheduler lock
+            super().take(amount)
+
+    def call(name):
+        with lane(name):
+            scheduler.acquire()
+
+    threads = [threading.Thread(target=call, args=(name,)) for name in ["bulk", "default", "interactive"]]
+    for thread in threads:
+        thread.start()
+    while len(scheduler._queue) < 3:
+        time.sleep(0.001)
+    with scheduler._lock:
+        scheduler.requests = Recording(10 ** 6)
+        scheduler._wake()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert order == ["interactive", "default", "bulk"]
+
+
+def test_many_queued_callers_are_all_admitted():
+    scheduler = RequestScheduler(rpm=10 ** 6)
+    threads = [threading.Thread(target=scheduler.acquire) for _ in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    async def many():
+        await asyncio.gather(*(scheduler.aacquire() for _ in range(50)))
+
+    asyncio.run(asyncio.wait_for(many(), 5))
+    assert not scheduler._queue and not scheduler._waiters
+
+
+def test_cancelled_waiter_does_not_block_the_queue():
+    scheduler = RequestScheduler(rpm=60)
+    scheduler.requests.take(60)
+
+    async def scenario():
+        head = asyncio.create_task(scheduler.aacquire())
+        await asyncio.sleep(0.01)
+        behind = asyncio.create_task(scheduler.aacquire())
+        await asyncio.sleep(0.01)
+        head.cancel()
+        scheduler.set_limits(rpm=10 ** 6)
+        await asyncio.wait_for(behind, 1)
+
+    asyncio.run(scenario())
+    assert not scheduler._queue
@@ -0,0 +1,54 @@
+import asyncio
+
+from agent.sections import _plan, edit_sections, match_sections, split_sections
+
+JD = (
+    "## Backend Engineer\nIntro.\n\n"
+    "### Responsibilities\n- Build APIs\n\n"
+    "### Requirements\n- Go, SQL\n\n"
+    "### Compensation\n- $150k\n\n"
+    "### Location\n- Remote\n"
+)
+
+
+def test_split_sections_round_trips():
+    sections = split_sections(JD)
+    assert len(sections) == 5 and "".join(sections) == JD
+    assert split_sections("no headings\nat all\n") == ["no headings\nat all\n"]
+
+
+def test_plan_only_pays_off_for_a_minority_of_sections():
+    assert _plan(["a", "b", "c", "d"], [1])
+    assert _plan(["a", "b", "c", "d"], [1, 2])
+    assert not _plan(["a", "b", "c", "d"], [0, 1, 2])
+    assert not _plan(["a", "b"], [0])
+    assert not _plan(["a", "b", "c"], [])
+
+
+def test_only_the_matched_section_is_edited():
+    assert match_sections(split_sections(JD), "raise the salary") == [3]
+    edited = edit_sections(JD, "raise the salary", edit=lambda s: s.replace("$150k", "$170k"))
+    assert edited == JD.replace("$150k", "$170k")
+
+
+def test_short_documents_are_left_to_a_full_edit():
+    assert edit_sections("## Title\nBody\n", "change the body", edit=lambda s: s) is None
+
+
+def test_global_instruction_costs_a_single_llm_call(monkeypatch):
+    import llm_config
+    from agent import tools
+    from benchmarks.fake_llm import StubChatModel
+
+    prompts = []
+
+    class Counting(StubChatModel):
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            prompts.append(str(messages[-1].content))
+            return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    monkeypatch.setattr(llm_config.llm, "model", Counting(latency=0))
+    monkeypatch.setattr(tools, "EDIT_MODE", "sections")
+    tools.edit_document(JD, "make it more formal")
+    asyncio.run(tools.aedit_document(JD, "make it more formal, please"))
+    assert len(prompts) == 2 and all(JD in prompt for prompt in prompts)
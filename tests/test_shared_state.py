@@ -0,0 +1,19 @@
+from agent.jd_index import JDIndex
+from agent.question_bank import QuestionBank
+
+
+def test_jd_index_picks_up_other_processes_appends(tmp_path):
+    first, second = JDIndex(str(tmp_path)), JDIndex(str(tmp_path))
+    first.add("Data Engineer", "SQL", "jd 1")
+    assert second.exact("Data Engineer", "SQL")["jd"] == "jd 1"
+    second.add("Designer", "Figma", "jd 2")
+    first.add("Product Manager", "Roadmaps", "jd 3")
+    assert [doc["jd"] for doc in JDIndex(str(tmp_path))._docs] == ["jd 1", "jd 2", "jd 3"]
+    assert second.exact("Product Manager", "Roadmaps")["jd"] == "jd 3"
+
+
+def test_question_bank_picks_up_other_connections_rows(tmp_path):
+    path = str(tmp_path / "bank.sqlite")
+    first, second = QuestionBank(path), QuestionBank(path)
+    first.add("Data Engineer", ["Which warehouse?"])
+    assert second.lookup("data engineer") == ["Which warehouse?"]
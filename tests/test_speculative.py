@@ -0,0 +1,23 @@
+from agent.speculative import SpeculativeExecutor, salary_query
+
+JD = "## Backend Engineer\n### Responsibilities\n- Build APIs"
+
+
+def search_call(query):
+    return {"name": "google_web_search", "args": {"query": query}}
+
+
+def test_prewarmed_search_is_served_only_for_the_same_query():
+    spec = SpeculativeExecutor(max_tasks=2)
+    spec.prewarm_searches(["Backend Engineer"], lambda query: f"results for {query}")
+    assert spec.lookup(search_call("average salary of a data scientist in London"), {"jd": JD}) is None
+    assert spec.lookup(search_call(salary_query("Backend Engineer")), {"jd": JD}).startswith("results for")
+
+
+def test_checklist_of_an_older_jd_is_not_served():
+    spec = SpeculativeExecutor(max_tasks=2)
+    spec.precompute_checklist(JD, lambda jd: "checklist")
+    call = {"name": "generate_checklist", "args": {"context": "jd"}}
+    assert spec.lookup(call, {"jd": JD + "\n- Kubernetes"}) is None
+    spec.precompute_checklist(JD, lambda jd: "checklist")
+    assert spec.lookup(call, {"jd": JD}) == "checklist"
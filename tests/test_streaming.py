@@ -0,0 +1,33 @@
+import asyncio
+
+from langchain_core.messages import HumanMessage
+
+import agent.agent as agent
+from benchmarks.fake_llm import StubChatModel
+from model_router import ModelRouter
+from scheduler import RequestScheduler, ScheduledChatModel
+
+JD_PROMPT = [HumanMessage(content="Generate a detailed job description for the role of Data Engineer based on x")]
+
+
+def scheduled(model):
+    return ScheduledChatModel(model=model, scheduler=RequestScheduler(rpm=10 ** 6))
+
+
+async def collect(model):
+    return [chunk async for chunk in model.astream(JD_PROMPT)]
+
+
+def test_model_without_streaming_answers_in_one_chunk():
+    for model in (scheduled(StubChatModel(latency=0)), scheduled(ModelRouter(models=[StubChatModel(latency=0)] * 2))):
+        chunks = [chunk.content for chunk in model.stream(JD_PROMPT) if chunk.content]
+        assert len(chunks) == 1 and chunks[0].startswith("## Data Engineer")
+        assert "".join(c.content for c in asyncio.run(collect(model))).startswith("## Data Engineer")
+
+
+def test_streamed_graph_run_writes_the_jd():
+    agent.run_role_to_questions("I need to hire a product manager", "test-stream")
+    result = {}
+    text = "".join(agent.stream_from_clarification("Skills: roadmaps", "Product Manager", "test-stream", result))
+    assert text.startswith("## Product Manager")
+    assert agent.job_description_text(result).startswith("## Product Manager")
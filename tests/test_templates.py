@@ -0,0 +1,56 @@
+import pytest
+
+import agent.templates as templates
+import agent.tools as tools
+import llm_config
+from benchmarks.fake_llm import StubChatModel
+
+
+def test_offered_role_comes_from_the_state_or_the_jd():
+    assert tools.offered_role({"roles": ["Data Engineer"]}) == "Data Engineer"
+    assert tools.offered_role({"artifacts": {"jd": "# Job Description: Product Manager\n..."}}) == "Product Manager"
+    assert tools.offered_role({"roles": ["A", "B"]}) == tools.OFFER_ROLE
+    assert tools.offered_role(None) == tools.OFFER_ROLE
+
+
+def test_template_offer_letter_names_the_role(monkeypatch):
+    monkeypatch.setattr(tools, "DOCUMENT_MODE", "template")
+    letter = tools.generate_offer_letter.func("Ana Costa", "$120,000", state={"roles": ["Data Engineer"]})
+    assert "position of Data Engineer" in letter and "Ana Costa" in letter
+
+
+def test_template_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(templates, "_templates", type(templates._templates)())
+    monkeypatch.setattr(templates, "TEMPLATE_CACHE_SIZE", 2)
+    for role in ("a", "b", "c"):
+        templates.get_template("email", role, "interview")
+    assert [key[1] for key in templates._templates] == ["b", "c"]
+
+
+def template_model(*responses):
+    """A stub model that answers template prompts with `responses` in turn."""
+    prompts = []
+
+    class Scripted(StubChatModel):
+        def _respond(self, prompt):
+            prompts.append(prompt)
+            return responses[min(len(prompts), len(responses)) - 1]
+
+    return Scripted(latency=0), prompts
+
+
+def test_template_with_an_escaped_slot_is_asked_for_again(monkeypatch):
+    good = "Dear ${candidate_name}, you are our ${role}.\n${custom_touch}"
+    model, prompts = template_model("Dear ${candidate_name}, you are our $${role}.", good)
+    monkeypatch.setattr(llm_config.llm, "model", model)
+    assert templates.get_template("email", "Escaped Role", "interview") == good
+    assert len(prompts) == 2 and "missing ${role}" in prompts[1]
+
+
+def test_broken_template_is_never_cached(monkeypatch):
+    model, prompts = template_model("Dear ${candidate_name}, welcome aboard as ${title}.")
+    monkeypatch.setattr(llm_config.llm, "model", model)
+    with pytest.raises(ValueError, match="missing"):
+        templates.get_template("email", "Broken Role", "interview")
+    assert len(prompts) == templates.TEMPLATE_ATTEMPTS
+    assert ("email", "Broken Role", "interview") not in templates._templates